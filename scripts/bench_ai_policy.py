@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Policy-table AI benchmark: per-frame cost and strength vs the heuristic frog.
+
+Plays the built-in frog (`ai_update` rules) and the table frog against the
+tournament's scripted Player 1 policies on the same seeds and reports results
+together with the average cost of one `Fighter.ai_update` call.
+
+Usage:
+    python3 src/ai_policy.py --matches 256          # build assets/frog_policy.npz first
+    python3 scripts/bench_ai_policy.py --seeds 8
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from ai_policy import DEFAULT_PATH, PolicyTable, attach  # noqa: E402
+from fighter import Fighter  # noqa: E402
+from headless import HeadlessRunner, init_headless  # noqa: E402
+from match import Match  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+class AITimer:
+    """Wraps Fighter.ai_update to accumulate its call count and time"""
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.original = Fighter.ai_update
+
+    def __enter__(self):
+        original = self.original
+
+        def timed(fighter, other, dt, projectiles=()):
+            start = time.perf_counter()
+            original(fighter, other, dt, projectiles)
+            self.seconds += time.perf_counter() - start
+            self.calls += 1
+
+        Fighter.ai_update = timed
+        return self
+
+    def __exit__(self, *exc):
+        Fighter.ai_update = self.original
+
+
+def play(opponent, seed, table=None):
+    match = Match(input_provider=SCRIPTED_OPPONENTS[opponent](seed))
+    if table is not None:
+        attach(match.ai, table)
+    return HeadlessRunner(match=match).run()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--table', default=str(DEFAULT_PATH))
+    parser.add_argument('--seeds', type=int, default=8)
+    args = parser.parse_args()
+
+    init_headless()
+    table = PolicyTable.load(args.table)
+    print(f'{args.table}: {table.actions.size} cells, {table.coverage:.1%} learned '
+          f'({table.actions.nbytes} bytes in memory)')
+    print('%-10s %-10s %5s %5s %5s %8s %8s %12s' % (
+        'frog', 'vs', 'win', 'loss', 'draw', 'dealt', 'taken', 'us/ai_update'))
+    for label, policy in (('heuristic', None), ('table', table)):
+        total = {'ai': 0, 'p1': 0, 'draw': 0}
+        with AITimer() as timer:
+            for opponent in SCRIPTED_OPPONENTS:
+                record = {'ai': 0, 'p1': 0, 'draw': 0}
+                dealt = taken = 0
+                calls, seconds = timer.calls, timer.seconds
+                for seed in range(args.seeds):
+                    result = play(opponent, seed, policy)
+                    record[result['winner']] += 1
+                    total[result['winner']] += 1
+                    dealt += result['score_ai']
+                    taken += result['score_p1']
+                cost = (timer.seconds - seconds) / max(1, timer.calls - calls) * 1e6
+                print('%-10s %-10s %5d %5d %5d %8.1f %8.1f %12.2f' % (
+                    label, opponent, record['ai'], record['p1'], record['draw'],
+                    dealt / args.seeds, taken / args.seeds, cost))
+        played = sum(total.values())
+        print(f'  {label}: win rate {(total["ai"] + 0.5 * total["draw"]) / played:.1%} over {played} matches')
+
+
+if __name__ == '__main__':
+    main()
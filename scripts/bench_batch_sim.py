@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Parity check and throughput benchmark for the NumPy batch simulator.
+
+The parity check runs the same random input masks through scalar `Match`
+objects and through `BatchSim`, comparing fighter state every few frames.
+Exits non-zero on any mismatch.
+
+Usage:
+    python3 scripts/bench_batch_sim.py --matches 4096 --frames 600
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from batch_sim import BatchSim, FIGHTER_FLOAT_FIELDS, FIGHTER_INT_FIELDS, FIGHTER_BOOL_FIELDS  # noqa: E402
+from headless import HeadlessRunner, init_headless, mask_inputs  # noqa: E402
+from match import Match, CONTROL_BITS  # noqa: E402
+
+
+def random_masks(rng, frames, n, hold=6):
+    """(frames, n) control bitmasks, each held for `hold` frames."""
+    blocks = rng.integers(0, 1 << len(CONTROL_BITS), size=(frames // hold + 1, n), dtype=np.uint8)
+    return np.repeat(blocks, hold, axis=0)[:frames]
+
+
+def _scalar_value(fighter, name):
+    if name == 'rect_x':
+        return fighter.rect.x
+    if name == 'rect_y':
+        return fighter.rect.y
+    value = getattr(fighter, name, 0)
+    if name in ('attack_type', 'last_attack_type'):
+        return {None: 0, 'punch': 1, 'kick': 2}[value]
+    return value
+
+
+def check_parity(n=16, frames=1800, seed=0, every=10):
+    rng = np.random.default_rng(seed)
+    masks = random_masks(rng, frames, n)
+    runners = [HeadlessRunner(mask_inputs(masks[:, i].tolist())) for i in range(n)]
+    batch = BatchSim.from_match(runners[0].match, n)
+    mismatches = []
+    for f in range(frames):
+        batch.step(masks[f], runners[0].dt)
+        for r in runners:
+            r.step()
+        if f % every and f != frames - 1:
+            continue
+        for i, r in enumerate(runners):
+            m = r.match
+            for side, fighter in ((batch.player, m.player), (batch.ai, m.ai)):
+                for name in FIGHTER_FLOAT_FIELDS + FIGHTER_INT_FIELDS + FIGHTER_BOOL_FIELDS:
+                    if name == 'attack_type' and not fighter.is_attacking:
+                        continue  # only meaningful while attacking
+                    expected = _scalar_value(fighter, name)
+                    got = getattr(side, name)[i]
+                    if not np.isclose(got, expected, rtol=0, atol=1e-9):
+                        mismatches.append((f, i, fighter.variant, name, expected, got))
+            for name in ('score_p1', 'score_ai', 'game_over'):
+                if getattr(m, name) != getattr(batch, name)[i]:
+                    mismatches.append((f, i, 'match', name, getattr(m, name), getattr(batch, name)[i]))
+        if mismatches:
+            break
+    return mismatches
+
+
+def bench(n, frames, seed=0):
+    rng = np.random.default_rng(seed)
+    masks = random_masks(rng, 64, n)
+    batch = BatchSim.from_match(Match(input_provider=None), n)
+    dt = 1.0 / 60.0
+    start = time.perf_counter()
+    for f in range(frames):
+        batch.step(masks[f % 64], dt)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=4096)
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--parity-matches', type=int, default=16)
+    parser.add_argument('--parity-frames', type=int, default=1800)
+    parser.add_argument('--skip-parity', action='store_true')
+    args = parser.parse_args()
+
+    init_headless()
+    if not args.skip_parity:
+        mismatches = check_parity(args.parity_matches, args.parity_frames)
+        if mismatches:
+            for row in mismatches[:20]:
+                print('MISMATCH frame=%d match=%d %s.%s expected=%r got=%r' % row)
+            sys.exit(1)
+        print(f'parity OK: {args.parity_matches} matches x {args.parity_frames} frames')
+
+    elapsed = bench(args.matches, args.frames)
+    rate = args.matches * args.frames / elapsed
+    print(f'{args.matches} matches x {args.frames} frames in {elapsed:.3f}s')
+    print(f'{rate:,.0f} match-frames/s ({elapsed / args.frames * 1000:.3f} ms per step)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Dirty-rect rendering benchmark: pixels pushed and frame time per draw.
+
+Records a fight against a scripted Player 1, then draws every recorded
+state with `Game.draw` in full-redraw mode and in dirty-rect mode on the
+SDL dummy drivers. Reports the average frame time, the pixels pushed to
+the display per frame and how often dirty mode fell back to a full redraw
+(screen shake, game over). Frames drawn through the dirty path are checked
+pixel for pixel against the full redraw of the same state.
+
+Usage:
+    python3 scripts/bench_dirty_rects.py --opponent masher --frames 1800
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless  # noqa: E402
+from match import HEIGHT, WIDTH  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+def draw_states(game, states, dirty):
+    """Draw every state; returns per-frame (ms, pixels pushed, drawn dirty, screen hash) lists."""
+    game.dirty_rects = dirty
+    game._dirty_prev = None
+    times = []
+    pushed = []
+    fast_frames = []
+    hashes = []
+    for state in states:
+        game.load_state(state)
+        fast = dirty and game._dirty_prev is not None and abs(game.screen_shake) <= 0.1 \
+            and not game.game_over and not game.paused
+        start = time.perf_counter()
+        game.draw()
+        times.append((time.perf_counter() - start) * 1000)
+        pushed.append(game.pixels_pushed)
+        fast_frames.append(fast)
+        # shaken frames use random offsets and are not comparable
+        hashes.append(hash(pygame.image.tobytes(game.screen, 'RGB')) if abs(game.screen_shake) <= 0.1 else None)
+    return times, pushed, fast_frames, hashes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    parser.add_argument('--frames', type=int, default=1800)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    from game import Game
+    game = Game(input_provider=SCRIPTED_OPPONENTS[args.opponent](args.seed))
+    pygame.mixer.music.stop()
+    states = []
+    for _ in range(args.frames):
+        game.update(FIXED_DT)
+        states.append(game.save_state())
+
+    n = len(states)
+    full_ms, full_px, _, full_hashes = draw_states(game, states, dirty=False)
+    dirty_ms, dirty_px, fast, dirty_hashes = draw_states(game, states, dirty=True)
+    mismatched = sum(a is not None and b is not None and a != b for a, b in zip(full_hashes, dirty_hashes))
+    calm = [i for i in range(n) if fast[i]]
+
+    def mean(values, frames):
+        return sum(values[i] for i in frames) / len(frames) if frames else 0.0
+
+    print(f'{n} frames vs {args.opponent}, screen {WIDTH}x{HEIGHT} ({WIDTH * HEIGHT:,} px); '
+          f'dirty path on {len(calm)} frames, full redraw on the rest (shake, game over)')
+    print('%-12s %-14s %10s %14s' % ('mode', 'frames', 'ms/frame', 'pixels/frame'))
+    for label, ms, px in (('full flip', full_ms, full_px), ('dirty rects', dirty_ms, dirty_px)):
+        for frames_label, frames in (('all', range(n)), ('dirty-path', calm)):
+            print('%-12s %-14s %10.3f %14s' % (label, frames_label, mean(ms, frames), f'{mean(px, frames):,.0f}'))
+    print(f'frames with different pixels: {mismatched}')
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Effect drawing benchmark: pre-rendered spark/fireball frames vs primitives.
+
+Keeps `--sparks` hit sparks (spread over combo tiers and ages) and
+`--fireballs` projectiles on screen and times drawing them each frame,
+once with the pre-rendered frames (`HitSpark.draw`/`Projectile.draw`) and
+once with the circle/line primitives they were baked from. The resulting
+frames are compared pixel for pixel.
+
+Usage:
+    python3 scripts/bench_effects.py --sparks 200 --frames 300
+"""
+import argparse
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless  # noqa: E402
+from match import HEIGHT, WIDTH, HitSpark, Projectile, _paint_fireball, _paint_spark  # noqa: E402
+
+
+def draw_primitives(screen, sparks, fireballs):
+    for spark in sparks:
+        if spark.life > 0:
+            size = int(spark.size * (1 + (1 - spark.life / 0.15)))
+            _paint_spark(screen, int(spark.x), int(spark.y), size)
+    for proj in fireballs:
+        _paint_fireball(screen, int(proj.x), int(proj.y), proj.radius)
+
+
+def draw_baked(screen, sparks, fireballs):
+    for spark in sparks:
+        spark.draw(screen)
+    for proj in fireballs:
+        proj.draw(screen)
+
+
+def run(draw, frames, sparks, fireballs, screen):
+    """Seconds spent drawing and a checksum per frame; effects age and respawn."""
+    rng = random.Random(1)
+    for spark in sparks:
+        spark.reset(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng.randint(1, 5))
+        spark.life = rng.uniform(0.001, 0.15)
+    for proj in fireballs:
+        proj.reset(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng.choice((-1, 1)))
+    spent = 0.0
+    sums = []
+    for _ in range(frames):
+        for spark in sparks:
+            spark.update(FIXED_DT)
+            if spark.life <= 0:
+                spark.reset(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng.randint(1, 5))
+        for proj in fireballs:
+            proj.update(FIXED_DT)
+            if not proj.active:
+                proj.reset(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng.choice((-1, 1)))
+        screen.fill((30, 60, 40))
+        start = time.perf_counter()
+        draw(screen, sparks, fireballs)
+        spent += time.perf_counter() - start
+        sums.append(zlib.crc32(pygame.image.tobytes(screen, 'RGB')))
+    return spent, sums
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sparks', type=int, default=200)
+    parser.add_argument('--fireballs', type=int, default=32)
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    init_headless()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    sparks = [HitSpark() for _ in range(args.sparks)]
+    fireballs = [Projectile() for _ in range(args.fireballs)]
+    start = time.perf_counter()
+    draw_baked(screen, sparks, fireballs)  # bakes the frames this mix needs
+    bake_ms = (time.perf_counter() - start) * 1000
+    before, before_sums = run(draw_primitives, args.frames, sparks, fireballs, screen)
+    after, after_sums = run(draw_baked, args.frames, sparks, fireballs, screen)
+    mismatched = sum(a != b for a, b in zip(before_sums, after_sums))
+    print(f'{args.sparks} sparks + {args.fireballs} fireballs on screen, {args.frames} frames '
+          f'(first draw incl. baking: {bake_ms:.1f} ms)')
+    print(f'  primitives:   {before / args.frames * 1000:7.3f} ms/frame')
+    print(f'  pre-rendered: {after / args.frames * 1000:7.3f} ms/frame ({before / after:.1f}x)')
+    print(f'  frames with different pixels: {mismatched}')
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Replay export throughput across worker counts.
+
+Records a scripted match to a temporary replay. It is then exported with
+`export.export` once per `--workers` value and `--formats` entry, and the
+frames/s are reported. Every run must produce the same frames; they are
+compared by the CRC of the decoded pixels.
+
+Usage:
+    python3 scripts/bench_export.py --frames 600 --workers 1 2 4 --formats png gif
+"""
+import argparse
+import os
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from export import export  # noqa: E402
+from headless import FIXED_DT, init_headless  # noqa: E402
+from match import Match  # noqa: E402
+from replay import ReplayRecorder  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+def record(path, opponent, frames):
+    match = Match(input_provider=SCRIPTED_OPPONENTS[opponent](0))
+    recorder = ReplayRecorder(match, path=path)
+    while not match.game_over and match.frame < frames:
+        recorder.update(FIXED_DT)
+    recorder.finish()
+    return match.frame
+
+
+def frames_crc(out, fmt):
+    """CRC over the decoded RGB pixels of every exported frame"""
+    from PIL import Image, ImageSequence
+    crc = 0
+    if fmt == 'png':
+        for path in sorted(Path(out).iterdir()):
+            crc = zlib.crc32(Image.open(path).convert('RGB').tobytes(), crc)
+    else:
+        for frame in ImageSequence.Iterator(Image.open(out)):
+            crc = zlib.crc32(frame.convert('RGB').tobytes(), crc)
+    return crc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    parser.add_argument('--frames', type=int, default=600, help='replay length to record and export')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--formats', nargs='+', default=['png', 'gif'], choices=('png', 'gif', 'webp'))
+    parser.add_argument('--scale', type=float, default=0.5, help='output scale for gif/webp')
+    args = parser.parse_args()
+
+    init_headless()
+    with tempfile.TemporaryDirectory() as tmp:
+        replay_path = Path(tmp) / 'bench.mfr'
+        frames = record(replay_path, args.opponent, args.frames)
+        print(f'{frames}-frame replay vs {args.opponent}, {os.cpu_count()} CPU(s)')
+        print('%-6s %8s %8s %9s %10s %6s' % ('format', 'workers', 'frames', 'seconds', 'frames/s', 'same'))
+        for fmt in args.formats:
+            reference = None
+            scale = 1.0 if fmt == 'png' else args.scale
+            for workers in args.workers:
+                out = Path(tmp) / (f'png-{workers}' if fmt == 'png' else f'out-{workers}.{fmt}')
+                written, seconds = export(replay_path, out, fmt, workers=workers, scale=scale)
+                crc = frames_crc(out, fmt)
+                if reference is None:
+                    reference = crc
+                print('%-6s %8d %8d %9.2f %10.1f %6s' % (fmt, workers, written, seconds, written / seconds,
+                                                         'yes' if crc == reference else 'NO'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Fixed-timestep loop check: sim ticks vs render frames under artificial load.
+
+First shows why the loop exists: the same scripted fight fed the variable
+per-frame dt of a 60, 30 and 15 FPS machine ends in different states,
+while `Game.advance` (fixed 1/tick_rate steps) ends in the same state at
+every frame rate. It also checks that hit pushback covers the same
+distance at every `--tick-rates` value: the first punch landed on the frog
+should move it as far in one step at 120 Hz as at 60 Hz.
+
+Then runs `Game.advance` + `Game.draw` against the wall clock with each
+frame padded by `--loads` ms of busy work and reports render frames and
+sim ticks per second for each `--tick-rates` value. Ticks should stay at
+the tick rate until a frame needs more than `Game.max_steps` steps; past
+that the excess is dropped instead of snowballing.
+
+Usage:
+    python3 scripts/bench_fixed_step.py --tick-rates 60 120 --loads 0 10 30 80 --seconds 2
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import KeyState, idle_inputs, init_headless  # noqa: E402
+from match import Match  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+def new_game(game_cls, opponent):
+    random.seed(0)
+    game = game_cls(input_provider=SCRIPTED_OPPONENTS[opponent](0))
+    pygame.mixer.music.stop()
+    return game
+
+
+def frame_rate_check(game_cls, opponent, seconds):
+    """(fps, variable-dt checksum, fixed-step checksum) for a few frame rates"""
+    rows = []
+    for fps in (60, 30, 15):
+        frames = int(seconds * fps)
+        game = new_game(game_cls, opponent)
+        for _ in range(frames):
+            game.update(1.0 / fps)  # the old loop: sim dt = frame time
+        variable = (game.checksum(), round(game.player.x), round(game.ai.x))
+        game = new_game(game_cls, opponent)
+        for _ in range(frames):
+            game.advance(1.0 / fps)
+        fixed = (game.checksum(), round(game.player.x), round(game.ai.x))
+        rows.append((fps, variable, fixed))
+    return rows
+
+
+def knockback_check(tick_rate):
+    """How far the first landed punch pushes the frog back, in px"""
+    # the frog stands still, so it only moves from the hit
+    match = Match(input_provider=lambda m: KeyState([m.player.controls['punch']]), p2_input_provider=idle_inputs)
+    match.ai.is_ai = False
+    # mid-stage, clear of the platform edges that would clamp the pushback
+    for fighter, x in ((match.player, 380), (match.ai, 500)):
+        fighter.x = fighter.rect.x = x
+    dt = 1.0 / tick_rate
+    while True:
+        before, health = match.ai.x, match.ai.health
+        match.update(dt)
+        if match.ai.health < health:
+            break
+    return match.ai.x - before
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def loaded_run(game_cls, opponent, tick_rate, load_ms, seconds):
+    game = new_game(game_cls, opponent)
+    game.tick_rate = tick_rate
+    clock = time.perf_counter
+    start = last = clock()
+    while clock() - start < seconds:
+        now = clock()
+        game.advance(now - last)
+        last = now
+        game.draw()
+        busy(load_ms)
+    elapsed = clock() - start
+    return game.render_frames / elapsed, game.sim_ticks / elapsed, game.dropped_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    parser.add_argument('--tick-rates', type=int, nargs='+', default=[60, 120])
+    parser.add_argument('--loads', type=float, nargs='+', default=[0, 10, 30, 80, 200])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    from game import MAX_STEPS_PER_FRAME, Game
+
+    print(f'{args.seconds * 4:g}s of game time vs {args.opponent} (checksum, P1 x, AI x)')
+    print('%5s  %-32s %-32s' % ('fps', 'variable dt', 'fixed step (60 Hz)'))
+    for fps, variable, fixed in frame_rate_check(Game, args.opponent, args.seconds * 4):
+        print('%5d  %-32s %-32s' % (fps, variable, fixed))
+
+    print('\nfirst punch on the frog: pushback on the hit step')
+    print('%8s %10s' % ('tick Hz', 'pushback'))
+    for tick_rate in args.tick_rates:
+        print('%8d %8.1fpx' % (tick_rate, knockback_check(tick_rate)))
+
+    print(f'\nwall-clock loop, {args.seconds:g}s per run, max {MAX_STEPS_PER_FRAME} steps per frame')
+    print('%8s %9s %10s %10s %11s' % ('tick Hz', 'load ms', 'frames/s', 'ticks/s', 'dropped s'))
+    for tick_rate in args.tick_rates:
+        for load in args.loads:
+            fps, tps, dropped = loaded_run(Game, args.opponent, tick_rate, load, args.seconds)
+            print('%8d %9.0f %10.1f %10.1f %11.2f' % (tick_rate, load, fps, tps, dropped))
+
+
+if __name__ == '__main__':
+    main()
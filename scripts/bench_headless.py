@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Benchmark the headless match engine in simulated frames per wall-clock second.
+
+Usage:
+    python3 scripts/bench_headless.py --matches 20
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import HeadlessRunner, random_inputs, init_headless  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=20, help='number of full matches to simulate')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    init_headless()
+    runners = [HeadlessRunner(random_inputs(args.seed + i)) for i in range(args.matches)]
+    frames = 0
+    start = time.perf_counter()
+    for runner in runners:
+        frames += runner.run()['frames']
+    elapsed = time.perf_counter() - start
+    print(f'{args.matches} matches, {frames} frames in {elapsed:.3f}s')
+    print(f'{frames / elapsed:,.0f} simulated frames/s ({frames / elapsed / 60:,.1f}x real time)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""HUD draw benchmark: cached text surfaces vs rendering every frame.
+
+Builds a `Game` on the SDL dummy drivers and times `draw_hud` plus
+`draw_overlays` during normal play, a combo, the game-over banner and the
+pause screen, with the default `TextCache` and with caching disabled
+(every string re-rendered each frame, as before). The cost of one
+`pygame.font.Font(None, size)` load is shown as well; the old combo, banner
+and pause code paid it every frame on top of the rendering.
+
+Usage:
+    python3 scripts/bench_hud.py --frames 600
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless, random_inputs  # noqa: E402
+from text_cache import TextCache  # noqa: E402
+
+
+def scenario(game, name):
+    game.game_over = name == 'game over'
+    game.paused = name == 'paused'
+    game.combo_display_timer = 0.6 if name == 'combo' else 0.0
+    game.last_combo_count = 4 if name == 'combo' else 0
+
+
+def time_hud(game, states, name):
+    """ms per draw_hud + draw_overlays call over the recorded states"""
+    spent = 0.0
+    for state in states:
+        game.load_state(state)  # timer and scores keep changing
+        scenario(game, name)
+        start = time.perf_counter()
+        game.draw_hud()
+        game.draw_overlays()
+        spent += time.perf_counter() - start
+    return spent / len(states) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=600)
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    from game import Game
+    game = Game(input_provider=random_inputs(seed=2))
+    states = []
+    for _ in range(args.frames):
+        game.update(FIXED_DT)
+        states.append(game.save_state())
+
+    print('%-10s %14s %14s %8s' % ('scenario', 'uncached ms', 'cached ms', 'speedup'))
+    for name in ('play', 'combo', 'game over', 'paused'):
+        results = []
+        for capacity in (0, 64):
+            game.text = TextCache(capacity)
+            results.append(time_hud(game, states, name))
+        print('%-10s %14.4f %14.4f %7.1fx' % (name, results[0], results[1], results[0] / results[1]))
+    start = time.perf_counter()
+    for _ in range(20):
+        pygame.font.Font(None, 72)
+    print(f'one Font(None, 72) load: {(time.perf_counter() - start) / 20 * 1000:.4f} ms')
+
+
+if __name__ == '__main__':
+    main()
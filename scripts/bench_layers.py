@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Per-layer render cost of `Game.draw` through the compositor's debug API.
+
+Records a fight against a scripted Player 1 (with a pause and the final
+game-over banner in the mix), draws every recorded state and prints
+`Game.compositor.format_timings()`: mean/max ms per layer and how often
+the cached HUD layer had to be rebuilt.
+
+Usage:
+    python3 scripts/bench_layers.py --opponent masher --frames 3600
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    parser.add_argument('--frames', type=int, default=3600)
+    parser.add_argument('--dirty-rects', action='store_true')
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    from game import Game
+    game = Game(input_provider=SCRIPTED_OPPONENTS[args.opponent](0))
+    pygame.mixer.music.stop()
+    states = []
+    for _ in range(args.frames):
+        game.update(FIXED_DT)
+        states.append(game.save_state())
+
+    game.dirty_rects = args.dirty_rects
+    game.compositor.reset_timings()
+    pause_from, pause_to = len(states) // 2, len(states) // 2 + 60
+    for i, state in enumerate(states):
+        game.load_state(state)
+        game.paused = pause_from <= i < pause_to
+        game.draw()
+    print(f'{len(states)} frames vs {args.opponent} (paused for 60, game over: {game.game_over}, '
+          f'dirty rects: {args.dirty_rects})')
+    print(game.compositor.format_timings())
+    total = sum(t['mean_ms'] for t in game.compositor.timings().values())
+    print(f'sum of layer means: {total:.4f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Particle system benchmark: NumPy arrays vs per-particle Python objects.
+
+Keeps `--counts` particles alive (dead ones are replaced by new bursts each
+frame) and times update + draw per frame against the 60 FPS budget. For
+comparison the same effect is run with one Python object per particle,
+updated in a loop and drawn with `Surface.fill` (only up to
+`--object-limit` particles, it gets slow).
+
+Usage:
+    python3 scripts/bench_particles.py --counts 1000 10000 16384 --frames 120
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless  # noqa: E402
+from match import HEIGHT, WIDTH  # noqa: E402
+from particles import ParticleSystem  # noqa: E402
+
+BUDGET_MS = 1000 / 60
+BURST = 64
+
+
+def burst_origin(rng):
+    return rng.uniform(100, WIDTH - 100), rng.uniform(100, HEIGHT - 100)
+
+
+def run_arrays(count, frames, screen):
+    """(update ms, draw ms, mean live particles) per frame"""
+    system = ParticleSystem(capacity=count, seed=1)
+    rng = random.Random(1)
+    update = draw = live = 0.0
+    for frame in range(frames + 30):  # 30 frames to reach the steady state
+        start = time.perf_counter()
+        while len(system) < count:
+            x, y = burst_origin(rng)
+            system.emit(BURST, x, y, speed=(60, 300), life=(0.5, 1.0),
+                        color=(255, 200, 120), color_jitter=0.4, gravity=600)
+        system.update(FIXED_DT)
+        mid = time.perf_counter()
+        system.draw(screen)
+        end = time.perf_counter()
+        if frame >= 30:
+            update += mid - start
+            draw += end - mid
+            live += len(system)
+    return update / frames * 1000, draw / frames * 1000, live / frames
+
+
+class Particle:
+    __slots__ = ('x', 'y', 'vx', 'vy', 'life', 'max_life', 'color')
+
+    def __init__(self, x, y, rng):
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(60, 300)
+        self.x, self.y = x, y
+        self.vx, self.vy = speed * math.cos(angle), speed * math.sin(angle)
+        self.life = self.max_life = rng.uniform(0.5, 1.0)
+        jitter = rng.uniform(0.6, 1.0)
+        self.color = (int(255 * jitter), int(200 * jitter), int(120 * jitter))
+
+
+def run_objects(count, frames, screen):
+    """Same effect with a list of Particle objects (no blending, opaque squares)"""
+    particles = []
+    rng = random.Random(1)
+    update = draw = 0.0
+    dt = FIXED_DT
+    for frame in range(frames + 30):
+        start = time.perf_counter()
+        while len(particles) < count:
+            x, y = burst_origin(rng)
+            particles.extend(Particle(x, y, rng) for _ in range(min(BURST, count - len(particles))))
+        alive = []
+        for p in particles:
+            p.vy += 600 * dt
+            p.x += p.vx * dt
+            p.y += p.vy * dt
+            p.life -= dt
+            if p.life > 0:
+                alive.append(p)
+        particles = alive
+        mid = time.perf_counter()
+        for p in particles:
+            if 0 <= p.x < WIDTH and 0 <= p.y < HEIGHT:
+                screen.fill(p.color, (int(p.x), int(p.y), 2, 2))
+        end = time.perf_counter()
+        if frame >= 30:
+            update += mid - start
+            draw += end - mid
+    return update / frames * 1000, draw / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000, 16384, 50000])
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--object-limit', type=int, default=10000)
+    args = parser.parse_args()
+
+    init_headless()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen.fill((45, 45, 70))
+    print(f"{args.frames} frames per run, screen {WIDTH}x{HEIGHT}, frame budget {BUDGET_MS:.1f} ms")
+    print('%-9s %8s %10s %9s %9s %9s %8s' % ('mode', 'target', 'live', 'update ms', 'draw ms', 'total ms', '60 FPS'))
+    for count in args.counts:
+        update, draw, live = run_arrays(count, args.frames, screen)
+        total = update + draw
+        print('%-9s %8d %10.0f %9.3f %9.3f %9.3f %8s' % ('numpy', count, live, update, draw, total,
+                                                         'yes' if total < BUDGET_MS else 'no'))
+        if count <= args.object_limit:
+            update, draw = run_objects(count, args.frames, screen)
+            total = update + draw
+            print('%-9s %8d %10s %9.3f %9.3f %9.3f %8s' % ('objects', count, '-', update, draw, total,
+                                                           'yes' if total < BUDGET_MS else 'no'))
+
+
+if __name__ == '__main__':
+    main()
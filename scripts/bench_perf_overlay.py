@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Cost of the F3 frame-time overlay (`perf_overlay.FrameProfiler`).
+
+Plays the same scripted fight through the run-loop body
+(`handle_events`, `update`, `draw`) in three modes:
+- never profiled;
+- profiled once and then detached, which should cost the same as never
+  profiled;
+- profiled with the overlay shown.
+It reports ms per frame for each mode, taking the best of `--repeats`
+interleaved runs. It then prints the overlay's own statistics for the
+profiled run.
+
+Usage:
+    python3 scripts/bench_perf_overlay.py --frames 1800 --repeats 5
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+def play(game, initial, opponent, frames):
+    """ms per frame of the run-loop body from the initial state"""
+    game.restore(initial)
+    game.particles.clear()
+    game.particles.rng = np.random.default_rng(0)
+    random.seed(0)  # screen shake
+    game.input_provider = SCRIPTED_OPPONENTS[opponent](0)
+    game._dirty_prev = game._frozen = None
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(frames):
+        game.handle_events()
+        game.update(FIXED_DT)
+        game.draw()
+    return (clock() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    parser.add_argument('--frames', type=int, default=1800)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    from game import Game
+    game = Game()
+    pygame.mixer.music.stop()
+    initial = game.snapshot()
+    best = {'off': [], 'detached': [], 'on': []}
+    profiler = None
+    for _ in range(args.repeats):
+        best['off'].append(play(game, initial, args.opponent, args.frames))
+        game.toggle_profiler()
+        game.toggle_profiler()
+        best['detached'].append(play(game, initial, args.opponent, args.frames))
+        game.toggle_profiler()
+        best['on'].append(play(game, initial, args.opponent, args.frames))
+        profiler = game.profiler
+        game.toggle_profiler()
+
+    base = min(best['off'])
+    print(f'{args.frames} frames vs {args.opponent}, best of {args.repeats}')
+    print('%-10s %10s %12s' % ('profiler', 'ms/frame', 'overhead'))
+    for mode, runs in best.items():
+        ms = min(runs)
+        print('%-10s %10.4f %+10.4fms (%+.1f%%)' % (mode, ms, ms - base, (ms - base) / base * 100))
+    print('\noverlay statistics, last %d frames of the profiled run:' % profiler.filled)
+    print(profiler.format_stats())
+
+
+if __name__ == '__main__':
+    main()
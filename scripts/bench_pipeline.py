@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Serial vs pipelined game loop under synthetic draw load.
+
+Runs the game against a scripted Player 1 for `--seconds` per mode and
+load. Every draw is padded with `--loads` ms of extra work:
+- `blit`: full-screen blits, which release the GIL;
+- `python`: a pure-Python busy loop, which holds it;
+- `sleep`: like waiting on vsync.
+
+The modes are:
+- serial: `Game.advance` + `Game.draw` on one thread;
+- pipelined: `PipelinedLoop` with 2 or 3 frame buffers.
+
+For each run it reports:
+- render frames/s and sim ticks/s;
+- the 99th percentile gap between sim ticks (how regularly the simulation
+  steps);
+- the age of the state on screen when a draw finishes (sim-to-display
+  latency).
+
+Usage:
+    python3 scripts/bench_pipeline.py --loads 0 10 25 --load-kind blit --seconds 3
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import init_headless  # noqa: E402
+from match import HEIGHT, WIDTH  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+def make_load(kind, ms):
+    scratch = pygame.Surface((WIDTH, HEIGHT))
+    source = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    source.fill((30, 60, 90, 128))
+    clock = time.perf_counter
+
+    def load():
+        end = clock() + ms / 1000
+        if kind == 'sleep':
+            time.sleep(ms / 1000)
+        elif kind == 'blit':
+            while clock() < end:
+                scratch.blit(source, (0, 0))
+        else:
+            n = 0
+            while clock() < end:
+                n += 1
+    return load
+
+
+def run(mode, opponent, load, seconds):
+    from game import Game
+    game = Game(input_provider=SCRIPTED_OPPONENTS[opponent](0))
+    pygame.mixer.music.stop()
+    game.fps = 0  # uncapped: the load sets the frame rate
+    clock = time.perf_counter
+    ticks = []
+    ages = []
+    loop = None
+    if mode != 'serial':
+        from pipeline import PipelinedLoop
+        loop = PipelinedLoop(game, buffers=int(mode[-1]))
+        stepper = loop.sim
+    else:
+        stepper = game
+    update = stepper.update
+
+    def timed_update(dt):
+        update(dt)
+        ticks.append(clock())
+    stepper.update = timed_update
+
+    draw = game.draw
+    end = clock() + seconds
+
+    def loaded_draw():
+        draw()
+        load()
+        now = clock()
+        shown = loop.shown.time if loop else (ticks[-1] if ticks else None)
+        if shown is not None:
+            ages.append(now - shown)
+        if now > end:
+            game.running = False
+    game.draw = loaded_draw
+
+    start = clock()
+    if loop:
+        loop.run()
+    else:
+        last = start
+        while game.running:
+            now = clock()
+            game.advance(now - last)
+            last = now
+            game.draw()
+    elapsed = clock() - start
+    gaps = np.diff(ticks) * 1000 if len(ticks) > 1 else np.zeros(1)
+    ages = np.array(ages) * 1000 if ages else np.zeros(1)
+    return (game.render_frames / elapsed, len(ticks) / elapsed, np.percentile(gaps, 99),
+            ages.mean(), np.percentile(ages, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    parser.add_argument('--loads', type=float, nargs='+', default=[0, 10, 25])
+    parser.add_argument('--load-kind', choices=('blit', 'python', 'sleep'), default='blit')
+    parser.add_argument('--modes', nargs='+', default=['serial', 'pipelined-2', 'pipelined-3'],
+                        choices=('serial', 'pipelined-2', 'pipelined-3'))
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    print(f'{args.seconds:g}s per run, {args.load_kind} load, sim at 60 Hz, {os.cpu_count()} CPU(s)')
+    print('%-12s %8s %9s %8s %12s %10s %10s' % ('mode', 'load ms', 'frames/s', 'ticks/s',
+                                                'tick gap p99', 'age mean', 'age p95'))
+    for load_ms in args.loads:
+        load = make_load(args.load_kind, load_ms)
+        for mode in args.modes:
+            fps, tps, gap, age, age95 = run(mode, args.opponent, load, args.seconds)
+            print('%-12s %8g %9.1f %8.1f %10.2fms %8.2fms %8.2fms' % (mode, load_ms, fps, tps, gap, age, age95))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Pixel observation benchmark: observations per second and allocations.
+
+Plays headless matches with random inputs and renders a grayscale
+observation after every frame, pushing it into a frame stack. Reports
+observations per second for rendering alone and with stacking, and the
+net NumPy/pygame allocation over the timed window (should stay flat).
+`--save` writes the final stacked observation as a PNG strip for a visual
+check.
+
+Usage:
+    python3 scripts/bench_pixel_obs.py --frames 2000 --size 84 --stack 4
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless, random_inputs  # noqa: E402
+from match import Match  # noqa: E402
+from pixel_obs import FrameStack, PixelRenderer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=84)
+    parser.add_argument('--stack', type=int, default=4)
+    parser.add_argument('--prescale', type=int, default=2, help='0 = smooth-scale the full canvas')
+    parser.add_argument('--save', help='PNG path for the last stacked observation')
+    args = parser.parse_args()
+
+    init_headless()
+    match = Match(input_provider=random_inputs(seed=1))
+    renderer = PixelRenderer((args.size, args.size), args.prescale)
+    stack = FrameStack(args.stack, renderer.frame.shape)
+    stack.reset(renderer.render(match))
+    for _ in range(60):  # warm up
+        match.update(FIXED_DT)
+        stack.push(renderer.render(match))
+
+    render_time = stack_time = 0.0
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(args.frames):
+        match.update(FIXED_DT)
+        if match.game_over:
+            match.reset_round()
+        start = time.perf_counter()
+        frame = renderer.render(match)
+        mid = time.perf_counter()
+        stack.push(frame)
+        stack.stacked()
+        stack_time += time.perf_counter() - mid
+        render_time += mid - start
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    obs = stack.stacked()
+    print(f'{args.frames} observations of {obs.shape} {obs.dtype} (tracing on)')
+    print(f'  render:         {args.frames / render_time:10,.0f} obs/s')
+    print(f'  render + stack: {args.frames / (render_time + stack_time):10,.0f} obs/s')
+    print(f'  net traced allocation: {grown:+d} bytes')
+    print(f'  last frame mean {obs[-1].mean():.1f}, min {obs[-1].min()}, max {obs[-1].max()}')
+    if args.save:
+        strip = np.concatenate(list(obs), axis=1)
+        surface = pygame.surfarray.make_surface(np.repeat(strip.T[:, :, None], 3, axis=2))
+        pygame.image.save(surface, args.save)
+        print(f'  wrote {args.save}')
+
+
+if __name__ == '__main__':
+    main()
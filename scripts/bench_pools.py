@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Allocation benchmark for the projectile and hit-spark pools.
+
+Runs a combo-heavy match (Player 1 chains punches, kicks and fireballs into a
+frog that fights back; health and timer are topped up so it never ends) and,
+after a warm-up, counts over the steady-state window:
+
+- entities spawned (pool acquires) vs Projectile/HitSpark objects constructed
+- net growth of gc-tracked objects (gc stays disabled for the window)
+- net memory allocated from src/ according to tracemalloc (should not grow
+  with --frames)
+
+Exits non-zero if any entity is constructed in the steady state, or if
+either growth goes over its fixed cap (MAX_TRACKED_GROWTH objects,
+MAX_NET_BYTES bytes). The caps do not scale with --frames, so even a
+small per-frame leak trips them on a long enough run.
+
+Usage:
+    python3 scripts/bench_pools.py --frames 6000
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, MASK_KEYS, init_headless  # noqa: E402
+from match import CONTROL_BITS, HitSpark, Match, Projectile  # noqa: E402
+from pool import Pool  # noqa: E402
+
+# steady-state growth allowed over the whole window, whatever its length
+MAX_TRACKED_GROWTH = 64
+MAX_NET_BYTES = 4096
+# punch, punch, kick, fireball, repeat; each press held for a few frames
+PATTERN = [CONTROL_BITS['punch']] * 6 + [0] * 2 + [CONTROL_BITS['punch']] * 6 + [0] * 2 \
+    + [CONTROL_BITS['kick']] * 8 + [0] * 2 + [CONTROL_BITS['fireball']] * 4 + [0] * 2
+
+
+def combo_inputs(match):
+    return MASK_KEYS[PATTERN[match.frame % len(PATTERN)]]
+
+
+class Counter:
+    """Counts calls to a wrapped function"""
+    def __init__(self, owner, name):
+        self.calls = 0
+        original = getattr(owner, name)
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return original(*args, **kwargs)
+
+        setattr(owner, name, counted)
+
+
+def keep_alive(match):
+    match.player.health = match.ai.health = 200
+    match.timer = 60.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=6000)
+    parser.add_argument('--warmup', type=int, default=600)
+    args = parser.parse_args()
+
+    init_headless()
+    match = Match(input_provider=combo_inputs)
+    for _ in range(args.warmup):
+        keep_alive(match)
+        match.update(FIXED_DT)
+
+    built = {cls.__name__: Counter(cls, '__init__') for cls in (Projectile, HitSpark)}
+    acquired = Counter(Pool, 'acquire')
+    hits_before = match.score_p1 + match.score_ai
+    src = str(project_root / 'src')
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    gc.collect()
+    gc.disable()
+    tracked = len(gc.get_objects())
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        keep_alive(match)
+        match.update(FIXED_DT)
+    elapsed = time.perf_counter() - start
+    tracked = len(gc.get_objects()) - tracked
+    gc.enable()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.filter_traces([tracemalloc.Filter(True, src + '/*')]).compare_to(
+        before.filter_traces([tracemalloc.Filter(True, src + '/*')]), 'lineno')
+    net_bytes = sum(stat.size_diff for stat in stats)
+
+    constructed = sum(counter.calls for counter in built.values())
+    print(f'{args.frames} frames ({args.frames / elapsed:,.0f} frames/s, includes tracing overhead)')
+    print(f'damage dealt: {match.score_p1 + match.score_ai - hits_before}, '
+          f'pool acquires: {acquired.calls}, pool capacity: {match.projectiles.capacity} projectiles / '
+          f'{match.hit_sparks.capacity} sparks')
+    print(f'Projectile/HitSpark objects constructed: {constructed}')
+    print(f'net gc-tracked objects: {tracked:+d}')
+    # a few hundred bytes of floats/ints that happen to be held in attributes at the
+    # end of the window; this does not grow with --frames
+    print(f'net bytes allocated from src/: {net_bytes:+d}')
+    failures = []
+    if constructed:
+        failures.append('steady state allocated pooled entities')
+    if tracked > MAX_TRACKED_GROWTH:
+        failures.append(f'gc-tracked objects grew by {tracked} (max {MAX_TRACKED_GROWTH})')
+    if net_bytes > MAX_NET_BYTES:
+        failures.append(f'src/ allocations grew by {net_bytes} bytes (max {MAX_NET_BYTES})')
+    if failures:
+        print('\n'.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Projectile stress benchmark for the spatial-hash broadphase.
+
+Keeps N projectiles in flight from both sides (`Match.start_stress`) and
+reports the simulation cost per frame and per projectile; with the broadphase
+the per-projectile cost should stay roughly flat as N grows. For contrast it
+times a brute-force all-pairs overlap pass over the same projectiles, and it
+checks that the grid finds exactly the overlapping pairs brute force finds
+(exits non-zero otherwise).
+
+Usage:
+    python3 scripts/bench_projectiles.py --counts 100 1000 5000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, idle_inputs, init_headless  # noqa: E402
+from match import Match, PROJECTILE_CELL  # noqa: E402
+from spatial import SpatialHash  # noqa: E402
+
+
+def overlapping(a, b):
+    dx = a.x - b.x
+    dy = a.y - b.y
+    reach = a.radius + b.radius
+    return dx * dx + dy * dy < reach * reach
+
+
+def brute_force_pairs(projectiles):
+    pairs = set()
+    for i, a in enumerate(projectiles):
+        for j in range(i + 1, len(projectiles)):
+            if overlapping(a, projectiles[j]):
+                pairs.add((i, j))
+    return pairs
+
+
+def grid_pairs(projectiles):
+    grid = SpatialHash(PROJECTILE_CELL)
+    for i, proj in enumerate(projectiles):
+        grid.insert(i, proj.x, proj.y)
+    pairs = set()
+    for i, a in enumerate(projectiles):
+        for j in grid.neighbors(a.x, a.y):
+            if j > i and overlapping(a, projectiles[j]):
+                pairs.add((i, j))
+    return pairs
+
+
+def stress_match(count, seed=0, warmup=30):
+    match = Match(input_provider=idle_inputs)
+    match.start_stress(count, seed)
+    for _ in range(warmup):
+        match.update(FIXED_DT)
+    return match
+
+
+def bench(count, frames):
+    match = stress_match(count)
+    start = time.perf_counter()
+    for _ in range(frames):
+        match.update(FIXED_DT)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 500, 1000, 2000, 5000])
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--brute-force-max', type=int, default=2000,
+                        help='skip the O(n^2) reference above this many projectiles')
+    args = parser.parse_args()
+
+    init_headless()
+    for count in (50, 500, 2000):
+        projectiles = stress_match(count, seed=count).projectiles
+        if grid_pairs(projectiles) != brute_force_pairs(projectiles):
+            print(f'broadphase missed or invented overlapping pairs with {count} projectiles')
+            sys.exit(1)
+    print('broadphase OK: grid pairs match brute force')
+
+    print('%11s %10s %13s %16s' % ('projectiles', 'ms/frame', 'us/projectile', 'all-pairs ms'))
+    for count in args.counts:
+        per_frame = bench(count, args.frames)
+        brute = '-'
+        if count <= args.brute_force_max:
+            projectiles = stress_match(count).projectiles
+            start = time.perf_counter()
+            brute_force_pairs(projectiles)
+            brute = '%.2f' % ((time.perf_counter() - start) * 1000)
+        print('%11d %10.3f %13.2f %16s' % (count, per_frame * 1000, per_frame * 1e6 / count, brute))
+
+
+if __name__ == '__main__':
+    main()
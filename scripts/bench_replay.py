@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Replay parity check and playback/seek benchmark.
+
+Records matches driven by random inputs (fixed and variable dt, one and two
+human players), round-trips them through replay files, and re-simulates:
+final health and scores must match the recording, and seeking to any frame
+must land on the same state as linear playback. Exits non-zero on mismatch.
+Then reports file size, playback speed with rendering off/on and seek cost.
+
+Usage:
+    python3 scripts/bench_replay.py --matches 8
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless, random_inputs  # noqa: E402
+from match import Match  # noqa: E402
+from replay import Replay, ReplayRecorder  # noqa: E402
+
+
+def record(seed, two_player=False, variable_dt=False):
+    kwargs = {'p2_input_provider': random_inputs(seed + 1000)} if two_player else {}
+    match = Match(input_provider=random_inputs(seed, hold_frames=5), **kwargs)
+    recorder = ReplayRecorder(match, seed=seed)
+    rng = random.Random(seed)
+    while not match.game_over:
+        recorder.update(rng.choice((0.015, 0.016, 0.017, 0.033)) if variable_dt else FIXED_DT)
+    return recorder.replay(), match
+
+
+def outcome(match):
+    return (match.frame, match.player.health, match.ai.health, match.score_p1, match.score_ai)
+
+
+def check(replays, tmpdir):
+    failures = []
+    for i, (replay, original) in enumerate(replays):
+        path = Path(tmpdir) / f'match{i}.mfr'
+        replay.save(path)
+        loaded = Replay.load(path)
+        match = loaded.create_match()
+        checkpoints = {}
+        rng = random.Random(i)
+        probes = sorted(rng.sample(range(1, loaded.frame_count), 5))
+        for frame in probes:
+            loaded.play(match, until=frame)
+            checkpoints[frame] = match.checksum()
+        loaded.play(match)
+        if outcome(match) != outcome(original):
+            failures.append(f'match {i}: replay ended {outcome(match)}, recorded {outcome(original)}')
+        seeker = loaded.create_match()
+        for frame in reversed(probes):
+            loaded.seek(seeker, frame)
+            if seeker.checksum() != checkpoints[frame]:
+                failures.append(f'match {i}: seek to frame {frame} diverged from linear playback')
+    return failures
+
+
+def bench_playback(replay, render_cls=None, repeats=3):
+    frames = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        if render_cls is None:
+            match = replay.create_match()
+            replay.play(match)
+        else:
+            match = replay.create_match(render_cls)
+            replay.play(match, lambda m: m.draw())
+        frames += match.frame
+    return frames / (time.perf_counter() - start)
+
+
+def bench_seek(replay, frame, repeats=50):
+    match = replay.create_match()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        replay.seek(match, frame)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=8)
+    parser.add_argument('--no-render-bench', action='store_true')
+    args = parser.parse_args()
+
+    init_headless()
+    replays = []
+    for seed in range(args.matches):
+        replays.append(record(seed, two_player=seed % 4 == 1, variable_dt=seed % 4 == 2))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        failures = check(replays, tmpdir)
+    if failures:
+        print('\n'.join(failures))
+        sys.exit(1)
+    print(f'replay parity OK: {len(replays)} matches (final health/score and seek checksums)')
+
+    replay = replays[0][0]
+    data = replay.to_bytes()
+    print(f'{replay.frame_count} frames, {len(replay.keyframes)} keyframes: {len(data)} bytes on disk')
+    print(f'playback, rendering off: {bench_playback(replay):,.0f} frames/s')
+    if not args.no_render_bench:
+        import pygame
+        from game import Game
+        pygame.init()  # fonts/mixer for Game (still on the dummy drivers)
+        print(f'playback, rendering on:  {bench_playback(replay, Game, repeats=1):,.0f} frames/s')
+    # worst case for each keyframe span: the frame just before the next keyframe
+    interval = replay.keyframe_interval
+    for frame in (interval - 1, (replay.frame_count // 2 // interval + 1) * interval - 1, replay.frame_count - 1):
+        print(f'seek to frame {frame:5d}: {bench_seek(replay, frame):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
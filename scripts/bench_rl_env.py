@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the reinforcement learning environments.
+
+Measures environment steps per second for a single in-process `FighterEnv`
+and for `VectorEnv` at each worker count, with uniformly random actions.
+Step rates only scale with workers up to the number of cores. Before
+timing, it checks that a fireball thrown by the agent shows up in the
+observation's projectile features.
+
+Usage:
+    python3 scripts/bench_rl_env.py --envs 16 --workers 1 2 4 --steps 500
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import init_headless  # noqa: E402
+from match import CONTROL_BITS  # noqa: E402
+from rl_env import ACTION_COUNT, FIGHTER_FEATURES, PROJECTILE_FEATURES, FighterEnv, VectorEnv  # noqa: E402
+
+
+def projectile_check(frames=10):
+    """Throw a fireball and return Player 1's projectile features once it is out"""
+    env = FighterEnv()
+    obs = env.reset()
+    offset = 2 * FIGHTER_FEATURES + 1
+    for _ in range(frames):
+        obs, _, _, _ = env.step(CONTROL_BITS['fireball'])
+        if env.match.projectiles:
+            break
+    own = obs[offset:offset + PROJECTILE_FEATURES]
+    if not env.match.projectiles or not own.any():
+        raise SystemExit(f'fireball missing from the observation: {own}')
+    return own
+
+
+def bench_single(steps, rng):
+    env = FighterEnv()
+    obs = np.empty(env.observation_size, np.float32)
+    env.reset(out=obs)
+    actions = rng.integers(0, ACTION_COUNT, steps)
+    episodes = 0
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action, obs)
+        if done:
+            episodes += 1
+            env.reset(out=obs)
+    return steps / (time.perf_counter() - start), episodes
+
+
+def bench_vector(num_envs, workers, steps, rng):
+    with VectorEnv(num_envs, workers=workers) as env:
+        env.reset()
+        actions = rng.integers(0, ACTION_COUNT, (steps, num_envs))
+        episodes = 0
+        start = time.perf_counter()
+        for row in actions:
+            _, _, dones, _ = env.step(row)
+            episodes += int(dones.sum())
+        elapsed = time.perf_counter() - start
+        return num_envs * steps / elapsed, episodes, env.workers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--envs', type=int, default=16)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--steps', type=int, default=500, help='vector steps per configuration')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    init_headless()
+    rng = np.random.default_rng(args.seed)
+    own = projectile_check()
+    print('own fireball features (present, gap, towards):', ' '.join(f'{v:+.3f}' for v in own))
+    print(f'{os.cpu_count()} cores')
+    print('%-22s %8s %12s %9s' % ('env', 'workers', 'steps/s', 'episodes'))
+    rate, episodes = bench_single(args.envs * args.steps, rng)
+    print('%-22s %8s %12s %9d' % ('FighterEnv', '-', f'{rate:,.0f}', episodes))
+    for workers in args.workers:
+        rate, episodes, used = bench_vector(args.envs, workers, args.steps, rng)
+        print('%-22s %8d %12s %9d' % (f'VectorEnv({args.envs})', used, f'{rate:,.0f}', episodes))
+
+
+if __name__ == '__main__':
+    main()
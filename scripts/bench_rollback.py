@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Rollback cost benchmark plus a localhost netplay sync check.
+
+1. snapshot/restore cost of a busy mid-match `Match`, with live fireballs
+   and hit sparks (the per-entity part of a snapshot)
+2. frame time when each frame also rolls back N frames (restore + resimulate),
+   with the fireballs and sparks topped up every frame
+3. two `RollbackSession`s talking over 127.0.0.1 UDP with injected latency,
+   jitter and loss; exits non-zero if the peers end on different state
+
+Usage:
+    python3 scripts/bench_rollback.py --latency 60 --loss 0.1
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, MASK_KEYS, init_headless, random_inputs  # noqa: E402
+from match import Match, CONTROL_BITS, GROUND_Y, WIDTH  # noqa: E402
+from netplay import connect, run_session  # noqa: E402
+
+
+def add_effects(match, rng, projectiles=12, sparks=12):
+    """Top the match up to `projectiles` live fireballs (both owners) and `sparks` hit sparks"""
+    while len(match.projectiles) < projectiles:
+        owner = rng.randrange(2)
+        match.projectiles.acquire().reset(rng.uniform(0, WIDTH), rng.uniform(GROUND_Y - 150, GROUND_Y),
+                                          -1 if owner else 1, owner)
+    while len(match.hit_sparks) < sparks:
+        match.hit_sparks.acquire().reset(rng.uniform(0, WIDTH), rng.uniform(GROUND_Y - 150, GROUND_Y),
+                                         rng.randint(1, 5))
+
+
+def busy_match(frames=240, seed=1):
+    match = Match(input_provider=random_inputs(seed, hold_frames=4),
+                  p2_input_provider=random_inputs(seed + 1, hold_frames=4))
+    for _ in range(frames):
+        match.update(FIXED_DT)
+    add_effects(match, random.Random(seed))
+    return match
+
+
+def bench_snapshot(match, repeats=20000):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        state = match.snapshot()
+    snap = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        match.restore(state)
+    restore = (time.perf_counter() - start) / repeats
+    return snap, restore
+
+
+def bench_depth(match, depth, frames=300, seed=1):
+    """Average ms per rendered frame that also rolls back and replays `depth` frames."""
+    rng = random.Random(seed)
+    history = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        add_effects(match, rng)
+        history.append(match.snapshot())
+        if depth and len(history) > depth:
+            match.restore(history[-depth - 1])
+            match.resimulating = True
+            for i in range(depth):
+                history[-depth - 1 + i] = match.snapshot()
+                match.update(FIXED_DT)
+            match.resimulating = False
+        match.update(FIXED_DT)
+        if match.game_over:
+            match.reset_round()
+        del history[:-16]
+    return (time.perf_counter() - start) / frames * 1000
+
+
+async def loopback(frames, latency, jitter, loss, delay, max_rollback, tick_rate, seed):
+    peers = []
+    ports = (47311, 47312)
+    for side in (0, 1):
+        match = Match(input_provider=None, p2_input_provider=MASK_KEYS.__getitem__)
+        peers.append(await connect(match, side, ('127.0.0.1', ports[side]), ('127.0.0.1', ports[1 - side]),
+                                   latency=latency, jitter=jitter, loss=loss, seed=seed + side,
+                                   input_delay=delay, max_rollback=max_rollback))
+
+    def scripted(side):
+        rng = random.Random(seed * 10 + side)
+        state = {'mask': 0}
+
+        def local_input(match):
+            if rng.random() < 0.15:
+                state['mask'] = rng.randrange(1 << len(CONTROL_BITS))
+            return state['mask']
+        return local_input
+
+    try:
+        await asyncio.gather(*(run_session(session, scripted(side), frames, tick_rate)
+                               for side, (session, _, _) in enumerate(peers)))
+    finally:
+        for _, _, transport in peers:
+            transport.close()
+    return peers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-depth', type=int, default=8)
+    parser.add_argument('--frames', type=int, default=360, help='loopback match length in frames')
+    parser.add_argument('--tick-rate', type=int, default=120, help='loopback tick rate (Hz)')
+    parser.add_argument('--latency', type=float, default=50.0, help='injected one-way latency (ms)')
+    parser.add_argument('--jitter', type=float, default=20.0, help='injected jitter (ms)')
+    parser.add_argument('--loss', type=float, default=0.1, help='injected packet loss (0..1)')
+    parser.add_argument('--delay', type=int, default=2, help='input delay (frames)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    init_headless()
+    match = busy_match()
+    snap, restore = bench_snapshot(match)
+    print(f'snapshot {snap * 1e6:.1f} us, restore {restore * 1e6:.1f} us '
+          f'({len(match.projectiles)} projectiles, {len(match.hit_sparks)} sparks)')
+    print('%6s %14s' % ('depth', 'ms per frame'))
+    for depth in range(args.max_depth + 1):
+        print('%6d %14.3f' % (depth, bench_depth(busy_match(), depth)))
+
+    peers = asyncio.run(loopback(args.frames, args.latency / 1000.0, args.jitter / 1000.0, args.loss,
+                                 args.delay, args.max_depth, args.tick_rate, args.seed))
+    checksums = set()
+    for side, (session, link, _) in enumerate(peers):
+        m = session.match
+        checksums.add((m.frame, m.checksum()))
+        print(f'peer {side}: frames={m.frame} rollbacks={session.rollbacks} max_depth={session.max_depth} '
+              f'resimulated={session.resimulated} stalls={session.stalls} '
+              f'sent={link.sent} dropped={link.dropped} checksum={m.checksum():08x}')
+    if len(checksums) != 1:
+        print('DESYNC: peers ended on different state')
+        sys.exit(1)
+    print('peers in sync')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Scripted end-to-end scenarios with a stored baseline and regression thresholds.
+
+Each scenario sets up a fresh headless `Game` and plays it through the
+run-loop body (`handle_events`, `update`, `draw`). The scenarios are:
+- idle: both fighters stand still;
+- combos: Player 1 walks in and chains punches and kicks;
+- fireballs: Player 1 keeps throwing fireballs;
+- shake: random mashing with the screen shake held at its maximum;
+- paused: the pause overlay;
+- game_over: the game-over banner.
+Health and the round timer are topped up every frame, so a round never
+ends mid-run. The overlay scenarios compose the dimmed frame every frame,
+which is the cost of the frame the overlay first appears on; after that,
+`Game.draw` only flips the frozen frame.
+
+Each scenario is measured twice:
+- timing runs report frame-time mean/p50/p95/p99/max, taking the best of
+  `--repeats` runs per statistic;
+- one allocation run reports Surfaces made per frame (counted as in
+  `perf_overlay`), the Python heap peak per frame, and the heap growth
+  over the run (`tracemalloc`).
+
+The results are compared with the baseline JSON. Any metric above
+baseline * (1 + tolerance) + slack counts as a regression, and the exit
+status is 1. `--save` writes the results as the new baseline.
+
+A baseline is committed as scripts/scenario_baseline.json, together with
+the environment it was recorded in. Frame times only compare on a
+matching environment. When the Python or pygame version, machine, core
+count or run settings differ, the times are still printed but cannot
+fail the run; Surface and heap counts are checked everywhere. Run
+`--save` on your own machine to gate frame times there too.
+
+Usage:
+    python3 scripts/bench_scenarios.py --save                  # record a baseline
+    python3 scripts/bench_scenarios.py                         # compare with it
+    python3 scripts/bench_scenarios.py --scenarios combos shake --tolerance ms_p95=0.5
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, KeyState, idle_inputs, init_headless, random_inputs  # noqa: E402
+from perf_overlay import ALLOCS, FrameProfiler  # noqa: E402
+from tournament import zoner_inputs  # noqa: E402
+
+DEFAULT_BASELINE = project_root / 'scripts' / 'scenario_baseline.json'
+# metric -> (relative tolerance, absolute slack); None: reported but never a regression
+TOLERANCES = {
+    'ms_mean': (0.20, 0.02),
+    'ms_p50': (0.20, 0.02),
+    'ms_p95': (0.35, 0.05),
+    'ms_p99': (0.50, 0.10),
+    'ms_max': None,
+    'surfaces_mean': (0.10, 0.05),
+    'surfaces_max': (0.0, 1),
+    'heap_kib_p95': (0.20, 4.0),
+    'heap_kib_growth': (0.0, 64.0),
+}
+
+
+def keep_fighting(game):
+    """Per-frame hook: top up health and the round timer"""
+    health = (game.player.health, game.ai.health)
+    timer = game.timer
+
+    def hook(game):
+        game.player.health, game.ai.health = health
+        game.timer = timer
+    return hook
+
+
+def idle(game):
+    game.input_provider = idle_inputs
+    game.ai.is_ai = False  # the frog slot takes (no) keys instead of walking in
+    game.p2_input_provider = idle_inputs
+    return keep_fighting(game)
+
+
+def combos(game):
+    def provider(match):
+        p, ai = match.player, match.ai
+        controls = p.controls
+        gap = ai.rect.centerx - p.rect.centerx
+        if abs(gap) > 90:
+            return KeyState([controls['right'] if gap > 0 else controls['left']])
+        return KeyState([controls['punch'] if match.frame % 2 else controls['kick']])
+    game.input_provider = provider
+    return keep_fighting(game)
+
+
+def fireballs(game):
+    game.input_provider = zoner_inputs(0)
+    return keep_fighting(game)
+
+
+def shake(game):
+    game.input_provider = random_inputs(0)
+    keep = keep_fighting(game)
+
+    def hook(game):
+        keep(game)
+        game.screen_shake = 8.0  # the most a combo hit sets
+    return hook
+
+
+def recompose(game):
+    """Per-frame hook: forget the frozen frame so the overlay is composed again"""
+    game._frozen = None
+
+
+def paused(game):
+    game.paused = True
+    return recompose
+
+
+def game_over(game):
+    game.player.health = 0
+    game.game_over = True
+    return recompose
+
+
+SCENARIOS = {
+    'idle': idle,
+    'combos': combos,
+    'fireballs': fireballs,
+    'shake': shake,
+    'paused': paused,
+    'game_over': game_over,
+}
+
+
+def start(scenario):
+    """A fresh Game set up for `scenario`, and its per-frame hook"""
+    from game import Game
+    game = Game()
+    pygame.mixer.music.stop()
+    random.seed(0)  # screen shake
+    game.particles.rng = np.random.default_rng(0)
+    return game, SCENARIOS[scenario](game)
+
+
+def frames(game, hook, count):
+    """Play `count` frames; yields after each one"""
+    for _ in range(count):
+        if hook:
+            hook(game)
+        game.handle_events()
+        game.update(FIXED_DT)
+        game.draw()
+        yield
+
+
+def time_run(scenario, count, warmup):
+    game, hook = start(scenario)
+    for _ in frames(game, hook, warmup):
+        pass
+    times = np.empty(count)
+    clock = time.perf_counter
+    last = clock()
+    for i, _ in enumerate(frames(game, hook, count)):
+        now = clock()
+        times[i] = now - last
+        last = now
+    times *= 1000
+    p50, p95, p99 = np.percentile(times, (50, 95, 99))
+    return {'ms_mean': times.mean(), 'ms_p50': p50, 'ms_p95': p95, 'ms_p99': p99, 'ms_max': times.max()}
+
+
+def alloc_run(scenario, count, warmup):
+    game, hook = start(scenario)
+    for _ in frames(game, hook, warmup):
+        pass
+    profiler = FrameProfiler(capacity=count)
+    profiler.attach(game)
+    layers = game.compositor.layers
+    layers[-1] = ('perf', lambda target: [])  # count only, don't draw the overlay
+    peaks = np.empty(count)
+    tracemalloc.start()
+    try:
+        begin = tracemalloc.get_traced_memory()[0]
+        before = begin
+        tracemalloc.reset_peak()
+        for i, _ in enumerate(frames(game, hook, count)):
+            current, peak = tracemalloc.get_traced_memory()
+            peaks[i] = peak - before
+            before = current
+            tracemalloc.reset_peak()
+        growth = tracemalloc.get_traced_memory()[0] - begin
+    finally:
+        tracemalloc.stop()
+        profiler.detach()
+    surfaces = profiler.history()[:, ALLOCS]
+    return {'surfaces_mean': surfaces.mean(), 'surfaces_max': surfaces.max(),
+            'heap_kib_p95': np.percentile(peaks, 95) / 1024, 'heap_kib_growth': growth / 1024}
+
+
+def measure(scenario, count, warmup, repeats):
+    runs = [time_run(scenario, count, warmup) for _ in range(repeats)]
+    result = {metric: min(run[metric] for run in runs) for metric in runs[0]}
+    result.update(alloc_run(scenario, count, warmup))
+    return {metric: round(float(value), 4) for metric, value in result.items()}
+
+
+def environment(args):
+    return {'python': platform.python_version(), 'pygame': pygame.version.ver, 'machine': platform.machine(),
+            'cpus': os.cpu_count(), 'frames': args.frames, 'warmup': args.warmup, 'repeats': args.repeats}
+
+
+def compare(results, baseline, tolerances):
+    """Print results against `baseline`; returns the regressions as (scenario, metric) pairs"""
+    regressions = []
+    print('%-10s %-16s %10s %10s %8s  %s' % ('scenario', 'metric', 'baseline', 'current', 'change', 'status'))
+    for scenario, metrics in results.items():
+        base = baseline.get(scenario)
+        for metric, value in metrics.items():
+            if base is None or metric not in base:
+                print('%-10s %-16s %10s %10.4f %8s  new' % (scenario, metric, '-', value, ''))
+                continue
+            reference = base[metric]
+            change = '%+7.1f%%' % ((value - reference) / reference * 100) if reference else ''
+            tolerance = tolerances.get(metric)
+            if tolerance is None:
+                status = ''
+            elif value > reference * (1 + tolerance[0]) + tolerance[1]:
+                status = 'REGRESSION'
+                regressions.append((scenario, metric))
+            else:
+                status = 'ok'
+            print('%-10s %-16s %10.4f %10.4f %8s  %s' % (scenario, metric, reference, value, change, status))
+    return regressions
+
+
+def parse_tolerance(text):
+    metric, _, fraction = text.partition('=')
+    if metric not in TOLERANCES:
+        raise argparse.ArgumentTypeError(f'unknown metric {metric!r} (one of {", ".join(TOLERANCES)})')
+    try:
+        return metric, float(fraction)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected METRIC=FRACTION, got {text!r}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=tuple(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--frames', type=int, default=600, help='measured frames per run')
+    parser.add_argument('--warmup', type=int, default=60, help='frames played before measuring')
+    parser.add_argument('--repeats', type=int, default=3, help='timing runs per scenario (best is kept)')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='write the results as the baseline')
+    parser.add_argument('--tolerance', type=parse_tolerance, action='append', default=[], metavar='METRIC=FRACTION',
+                        help='relative tolerance for one metric (repeatable)')
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    tolerances = dict(TOLERANCES)
+    for metric, fraction in args.tolerance:
+        slack = tolerances[metric][1] if tolerances[metric] else 0.0
+        tolerances[metric] = (fraction, slack)
+
+    results = {}
+    for scenario in args.scenarios:
+        results[scenario] = measure(scenario, args.frames, args.warmup, args.repeats)
+
+    stored = {}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text())
+    print(f'{args.frames} frames per run after {args.warmup} warm-up, best of {args.repeats}')
+    if stored.get('environment', {}) not in ({}, environment(args)):
+        print('note: the baseline was recorded with different settings or on a different machine;',
+              'frame times are shown but not checked:', stored['environment'])
+        tolerances.update({metric: None for metric in TOLERANCES if metric.startswith('ms_')})
+    regressions = compare(results, stored.get('scenarios', {}), tolerances)
+
+    if args.save:
+        scenarios = dict(stored.get('scenarios', {}))
+        scenarios.update(results)
+        args.baseline.write_text(json.dumps({'environment': environment(args), 'scenarios': scenarios},
+                                            indent=2, sort_keys=True) + '\n')
+        print(f'Saved baseline for {len(results)} scenario(s) to {args.baseline}')
+    elif not stored:
+        print(f'No baseline at {args.baseline}; run with --save to record one')
+    elif regressions:
+        print(f'{len(regressions)} regression(s):', ', '.join(f'{s}.{m}' for s, m in regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
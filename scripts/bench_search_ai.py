@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Lookahead AI benchmark: strength against scripted players and search speed.
+
+Plays the built-in frog (`ai_update`) and `SearchAI` at each budget against
+the tournament's scripted Player 1 policies on the same seeds, then reports
+results, search throughput (simulated frames, i.e. nodes, per second) and how
+well each search stayed inside its budget.
+
+Usage:
+    python3 scripts/bench_search_ai.py --budgets 2 4 8 --seeds 4
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import HeadlessRunner, init_headless  # noqa: E402
+from match import Match  # noqa: E402
+from search_ai import SearchAI  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+def play(opponent, seed, budget=None):
+    """One match; returns (result, SearchAI or None, per-search ms list)."""
+    ai = None
+    times = []
+    if budget is not None:
+        ai = SearchAI(budget_ms=budget, seed=seed)
+        search = ai.search
+
+        def timed(match):
+            start = time.perf_counter()
+            action = search(match)
+            times.append((time.perf_counter() - start) * 1000)
+            return action
+
+        ai.search = timed
+    match = Match(input_provider=SCRIPTED_OPPONENTS[opponent](seed), p2_input_provider=ai)
+    return HeadlessRunner(match=match).run(), ai, times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budgets', type=float, nargs='+', default=[2.0, 4.0])
+    parser.add_argument('--seeds', type=int, default=3)
+    args = parser.parse_args()
+
+    init_headless()
+    print('%-12s %-10s %5s %5s %5s %8s %8s %11s %8s %8s' % (
+        'frog', 'vs', 'win', 'loss', 'draw', 'dealt', 'taken', 'nodes/s', 'p50 ms', 'p99 ms'))
+    for budget in [None] + args.budgets:
+        label = 'ai_update' if budget is None else f'search {budget:g}ms'
+        all_times = []
+        for opponent in SCRIPTED_OPPONENTS:
+            record = {'ai': 0, 'p1': 0, 'draw': 0}
+            dealt = taken = nodes = 0
+            search_time = 0.0
+            times = []
+            for seed in range(args.seeds):
+                result, ai, match_times = play(opponent, seed, budget)
+                record[result['winner']] += 1
+                dealt += result['score_ai']
+                taken += result['score_p1']
+                if ai is not None:
+                    nodes += ai.nodes
+                    search_time += ai.search_time
+                    times.extend(match_times)
+            times.sort()
+            all_times.extend(times)
+            speed = '%11s' % (f'{nodes / search_time:,.0f}' if search_time else '-')
+            p50 = '%8.2f' % times[len(times) // 2] if times else '%8s' % '-'
+            p99 = '%8.2f' % times[int(len(times) * 0.99)] if times else '%8s' % '-'
+            print('%-12s %-10s %5d %5d %5d %8.1f %8.1f %s %s %s' % (
+                label, opponent, record['ai'], record['p1'], record['draw'],
+                dealt / args.seeds, taken / args.seeds, speed, p50, p99))
+        if all_times:
+            over = sum(t > budget for t in all_times) / len(all_times)
+            print(f'  {label}: {len(all_times)} searches, {over:.1%} over budget, max {max(all_times):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Screen-shake benchmark: cost of a shaking frame vs a still frame.
+
+Records a fight, then draws every recorded state with `Game.draw` twice:
+once with the shake forced off and once forced on, counting how many
+pygame Surfaces are constructed while drawing. The old compositing path
+(two full-screen temporary surfaces, one SRCALPHA, per shaking frame) is
+timed as a reference.
+
+Usage:
+    python3 scripts/bench_shake.py --frames 1200
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless  # noqa: E402
+from match import HEIGHT, WIDTH  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+
+class CountingSurface(pygame.Surface):
+    """pygame.Surface that counts constructions"""
+    made = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingSurface.made += 1
+        super().__init__(*args, **kwargs)
+
+
+def legacy_shake(game, dx, dy):
+    # the compositing the old Game.draw did on every shaking frame
+    temp_surface = pygame.Surface((WIDTH, HEIGHT))
+    temp_surface.fill((0, 0, 0))
+    if game.background:
+        temp_surface.blit(game.background, (0, 0))
+    fighter_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    game.player.draw(fighter_surface)
+    game.ai.draw(fighter_surface)
+    temp_surface.blit(fighter_surface, (0, 0))
+    game.screen.blit(temp_surface, (dx, dy))
+
+
+def time_draws(game, states, shake):
+    """ms per Game.draw and Surfaces constructed, with the shake forced to `shake`"""
+    spent = 0.0
+    made = CountingSurface.made
+    for state in states:
+        game.load_state(state)
+        game.screen_shake = shake
+        start = time.perf_counter()
+        game.draw()
+        spent += time.perf_counter() - start
+    return spent / len(states) * 1000, CountingSurface.made - made
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=1200)
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    from game import Game
+    game = Game(input_provider=SCRIPTED_OPPONENTS[args.opponent](0))
+    pygame.mixer.music.stop()
+    states = []
+    for _ in range(args.frames):
+        game.update(FIXED_DT)
+        states.append(game.save_state())
+
+    real_surface = pygame.Surface
+    pygame.Surface = CountingSurface
+    try:
+        still_ms, still_made = time_draws(game, states, 0.0)
+        shake_ms, shake_made = time_draws(game, states, 6.0)
+    finally:
+        pygame.Surface = real_surface
+    start = time.perf_counter()
+    for state in states:
+        game.load_state(state)
+        legacy_shake(game, 3, -2)
+    legacy_ms = (time.perf_counter() - start) / len(states) * 1000
+
+    print(f'{len(states)} frames vs {args.opponent}')
+    print('%-28s %10s %18s' % ('frame', 'ms/draw', 'surfaces created'))
+    print('%-28s %10.3f %18d' % ('still', still_ms, still_made))
+    print('%-28s %10.3f %18d' % ('shaking (camera offset)', shake_ms, shake_made))
+    print('%-28s %10.3f %18s' % ('old temp-surface compositing', legacy_ms, f'{2 * len(states)}'))
+    print('  (old row: the compositing step alone, on top of the rest of the frame)')
+
+
+if __name__ == '__main__':
+    main()
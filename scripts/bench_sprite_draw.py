@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Fighter.draw benchmark: cached flipped/scaled frames vs per-frame transforms.
+
+Steps a headless match with random inputs and times `Fighter.draw` for both
+fighters onto an off-screen surface, once with the draw-frame cache and
+once with it emptied (the old flip + scale on every call). The two runs
+draw the same recorded states and their pixels are compared.
+
+Usage:
+    python3 scripts/bench_sprite_draw.py --frames 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless, random_inputs  # noqa: E402
+from match import HEIGHT, WIDTH, Match  # noqa: E402
+
+
+def run(states, match, surface, cached):
+    """Draw every recorded state; returns (seconds spent in draw, frame checksums)."""
+    fighters = (match.player, match.ai)
+    saved = [f.draw_frames for f in fighters]
+    if not cached:
+        for f in fighters:
+            f.draw_frames = {}
+    spent = 0.0
+    sums = []
+    try:
+        for state in states:
+            match.load_state(state)
+            surface.fill((0, 0, 0))
+            start = time.perf_counter()
+            for f in fighters:
+                f.draw(surface)
+            spent += time.perf_counter() - start
+            sums.append(hash(pygame.image.tobytes(surface, 'RGB')))
+    finally:
+        for f, frames in zip(fighters, saved):
+            f.draw_frames = frames
+    return spent, sums
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=2000)
+    args = parser.parse_args()
+
+    init_headless()
+    match = Match(input_provider=random_inputs(seed=3))
+    states = []
+    for _ in range(args.frames):
+        match.update(FIXED_DT)
+        if match.game_over:
+            match.reset_round()
+        states.append(match.save_state())
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    draws = 2 * len(states)
+    before, before_sums = run(states, match, surface, cached=False)
+    after, after_sums = run(states, match, surface, cached=True)
+    print(f'{draws} Fighter.draw calls')
+    print(f'  flip + scale per call: {before / draws * 1000:.4f} ms/draw')
+    print(f'  cached frames:         {after / draws * 1000:.4f} ms/draw ({before / after:.1f}x)')
+    mismatched = sum(a != b for a, b in zip(before_sums, after_sums))
+    print(f'  frames with different pixels: {mismatched}')
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
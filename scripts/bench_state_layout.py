@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Per-object memory and per-frame update cost of the fighter/effect state layout.
+
+Memory is compared with the old per-instance `__dict__` layout: a plain
+object holding the same attribute values. The packed binary save state
+(`Match.save_state`/`load_state`) is compared with pickling the
+`Match.snapshot()` tuples, for both size and round-trip time.
+
+Usage:
+    python3 scripts/bench_state_layout.py
+"""
+import pickle
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import HeadlessRunner, init_headless, random_inputs  # noqa: E402
+from match import Projectile, HitSpark  # noqa: E402
+
+
+def object_size(obj):
+    # instance plus its attribute dict, not the objects it references
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+class _DictLayout:
+    """Stand-in for the old layout: the same attributes in an instance __dict__"""
+
+
+def dict_layout_size(obj):
+    names = {name for cls in type(obj).__mro__ for name in getattr(cls, '__slots__', ())}
+    plain = _DictLayout()
+    plain.__dict__.update((name, getattr(obj, name)) for name in names if hasattr(obj, name))
+    return object_size(plain)
+
+
+def pickled_snapshot(match):
+    """`Match.snapshot()` pickled, minus the animators' shared sprite frame lists (assets, not state)"""
+    state = match.snapshot()
+    fighters = tuple(f[:20] + (None,) + f[21:] for f in state[8:10])
+    return pickle.dumps(state[:8] + fighters + state[10:], pickle.HIGHEST_PROTOCOL)
+
+
+def per_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    init_headless()
+    runner = HeadlessRunner(random_inputs(7))
+    runner.run(600)
+    match = runner.match
+    fighter = match.ai
+
+    print('per-object memory (bytes)    __dict__    slots')
+    for name, obj in (('Fighter', fighter), ('SpriteAnimator', fighter.animator),
+                      ('Projectile', Projectile(0, 0, 1)), ('HitSpark', HitSpark(0, 0, 2))):
+        print('  %-26s %8d %8d' % (name, dict_layout_size(obj), object_size(obj)))
+
+    dt = 1.0 / 60.0
+    print('per-call cost (us)')
+    print('  %-26s %7.2f' % ('Fighter.update', per_call(lambda: fighter.update(dt), 100000)))
+    print('  %-26s %7.2f' % ('Fighter.on_ground', per_call(fighter.on_ground, 200000)))
+    print('  %-26s %7.2f' % ('Fighter.ai_update', per_call(lambda: fighter.ai_update(match.player, dt), 100000)))
+
+    runner = HeadlessRunner(random_inputs(11))
+    frames = 0
+    start = time.perf_counter()
+    for _ in range(20):
+        runner.match.reset_round()
+        runner.match.frame = 0
+        frames += runner.run()['frames']
+    print('  %-26s %7.2f' % ('Match.update (full frame)', (time.perf_counter() - start) / frames * 1e6))
+
+    data = match.save_state()
+    pickled = pickled_snapshot(match)
+    print('save state (bytes)           pickled   packed')
+    print('  %-26s %8d %8d' % ('size', len(pickled), len(data)))
+    print('round trip (us)')
+    print('  %-26s %7.2f' % ('pickle snapshot()', per_call(lambda: pickled_snapshot(match), 20000)))
+    print('  %-26s %7.2f' % ('unpickle', per_call(lambda: pickle.loads(pickled), 20000)))
+    print('  %-26s %7.2f' % ('Match.save_state', per_call(match.save_state, 20000)))
+    print('  %-26s %7.2f' % ('Match.load_state', per_call(lambda: match.load_state(data), 20000)))
+
+
+if __name__ == '__main__':
+    main()
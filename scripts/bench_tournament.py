@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Measure tournament throughput and parallel scaling across worker counts.
+
+Speedup and efficiency are relative to a 1-worker run, which is always
+timed first (and added if `--workers` leaves it out).
+
+Usage:
+    python3 scripts/bench_tournament.py --rounds 2 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from tournament import run_tournament, schedule  # noqa: E402
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=2)
+    parser.add_argument('--chunksize', type=int, default=4)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    args = parser.parse_args()
+
+    worker_counts = sorted(set(args.workers) | {1})
+    specs = schedule(args.rounds)
+    print(f'{len(specs)} matches per run, {cores} cores available')
+    print('%8s %10s %12s %9s %11s' % ('workers', 'seconds', 'matches/s', 'speedup', 'efficiency'))
+    base = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        n = sum(1 for _ in run_tournament(specs, workers, args.chunksize))
+        elapsed = time.perf_counter() - start
+        rate = n / elapsed
+        if workers == 1:
+            base = rate
+        speedup = rate / base
+        print('%8d %10.2f %12.1f %8.2fx %10.0f%%' % (workers, elapsed, rate, speedup, 100 * speedup / workers))
+
+
+if __name__ == '__main__':
+    main()
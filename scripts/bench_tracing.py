@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Cost of Chrome trace recording (`tracing.Tracer`).
+
+Plays the same scripted fight through the `Game.run` loop body (tick,
+`handle_events`, `advance`, `draw`) with and without a tracer. It reports
+ms per frame for each, taking the best of `--repeats` interleaved runs,
+and the trace events recorded per frame. Every trace written must load
+as JSON and contain the expected spans.
+
+Usage:
+    python3 scripts/bench_tracing.py --frames 1800 --repeats 5
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root / 'src'))
+
+from headless import FIXED_DT, init_headless  # noqa: E402
+from tournament import SCRIPTED_OPPONENTS  # noqa: E402
+
+EXPECTED = ('frame', 'tick', 'events', 'advance', 'update', 'draw', 'Fighter.update', 'Fighter.ai_update')
+
+
+def play(game, initial, opponent, frames):
+    """ms per frame of the run-loop body from the initial state"""
+    game.restore(initial)
+    game.particles.clear()
+    game.particles.rng = np.random.default_rng(0)
+    random.seed(0)  # screen shake
+    game.input_provider = SCRIPTED_OPPONENTS[opponent](0)
+    game._dirty_prev = game._frozen = None
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(frames):
+        game.clock.tick(0)
+        game.handle_events()
+        game.advance(FIXED_DT)
+        game.draw()
+    return (clock() - start) / frames * 1000
+
+
+def traced_play(game, initial, opponent, frames, path):
+    from tracing import Tracer
+    tracer = Tracer(path)
+    tracer.install()
+    tracer.watch(game)
+    try:
+        ms = play(game, initial, opponent, frames)
+    finally:
+        tracer.close()
+    names = Counter(event['name'] for event in json.loads(Path(path).read_text()))
+    missing = [name for name in EXPECTED if not names[name]]
+    if missing:
+        raise SystemExit(f'trace {path} is missing spans: {missing}')
+    return ms, tracer.written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--opponent', choices=sorted(SCRIPTED_OPPONENTS), default='masher')
+    parser.add_argument('--frames', type=int, default=1800)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    init_headless()
+    pygame.init()
+    from game import Game
+    game = Game()
+    pygame.mixer.music.stop()
+    initial = game.snapshot()
+    best = {'off': [], 'tracing': []}
+    events = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.repeats):
+            best['off'].append(play(game, initial, args.opponent, args.frames))
+            ms, events = traced_play(game, initial, args.opponent, args.frames, Path(tmp) / f'trace-{i}.json')
+            best['tracing'].append(ms)
+
+    base = min(best['off'])
+    print(f'{args.frames} frames vs {args.opponent}, best of {args.repeats}')
+    print('%-10s %10s %12s' % ('tracer', 'ms/frame', 'overhead'))
+    for mode, runs in best.items():
+        ms = min(runs)
+        print('%-10s %10.4f %+10.4fms (%+.1f%%)' % (mode, ms, ms - base, (ms - base) / base * 100))
+    print(f'{events} trace events written, {events / args.frames:.1f} per frame')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Table-driven frog AI: one precomputed action per discretized game state.
+
+The state is reduced to a handful of small integers (signed x distance to the
+opponent, both vertical velocity signs, both attack flags, the frog's hit
+cooldown, the opponent's fireball cooldown and how close the nearest incoming
+projectile is) and packed into a flat index into a uint8 table of `ACTIONS`
+indices. At runtime `Fighter.ai_update` does one lookup per frame. HEURISTIC
+cells (where the built-in rules did best) and UNKNOWN cells (never reached in
+training) fall back to the heuristic.
+
+The table is learned offline: matches against the scripted tournament players
+are played with the frog driven by the table-in-training, which asks `SearchAI`
+to evaluate every action plus the heuristic at each decision and accumulates
+those values into the current cell. Each cell then keeps the candidate with
+the best average value.
+
+Usage:
+    python3 src/ai_policy.py --matches 64 --workers 8   # writes assets/frog_policy.npz
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from headless import MASK_KEYS, HeadlessRunner, init_headless
+from match import PLAYER_CONTROLS, Match
+from search_ai import ACTIONS, SearchAI
+from tournament import SCRIPTED_OPPONENTS
+
+DEFAULT_PATH = Path(__file__).resolve().parents[1] / 'assets' / 'frog_policy.npz'
+POLICY_VERSION = 1
+HEURISTIC = len(ACTIONS)  # table entry: use the ai_update rules
+UNKNOWN = 255
+# what training evaluates at each decision; index = table entry
+CANDIDATES = ACTIONS + (None,)
+
+# signed x distance (opponent centre - own centre) in DX_STEP buckets, clamped
+DX_STEP = 40
+DX_HALF = 20
+# nearest incoming projectile: none, far, mid, near
+PROJ_FAR, PROJ_NEAR = 300, 150
+# dx, own vy, other vy, own attacking, other attacking, own hit cooldown,
+# other fireball cooldown, projectile proximity
+SHAPE = (2 * DX_HALF, 3, 3, 2, 2, 2, 2, 4)
+CELLS = int(np.prod(SHAPE))
+
+# the table frog presses the same keys as a human-controlled frog
+FROG_CONTROLS = {k: v for k, v in PLAYER_CONTROLS.items() if k != 'fireball'}
+ACTION_KEYS = [MASK_KEYS[mask] for mask in ACTIONS]
+
+
+def _vy_sign(vy):
+    return 0 if vy < -1 else (2 if vy > 1 else 1)
+
+
+def _projectile_bucket(me, projectiles):
+    # distance to the nearest projectile flying toward `me`
+    cx = me.rect.centerx
+    nearest = None
+    for proj in projectiles:
+        gap = cx - proj.x
+        if gap * proj.direction > 0 and (nearest is None or abs(gap) < nearest):
+            nearest = abs(gap)
+    if nearest is None:
+        return 0
+    return 1 if nearest > PROJ_FAR else (2 if nearest > PROJ_NEAR else 3)
+
+
+def state_index(me, other, projectiles=()):
+    """Flat table index for `me` fighting `other` (row-major over SHAPE)."""
+    dx = int((other.rect.centerx - me.rect.centerx) // DX_STEP) + DX_HALF
+    dx = 0 if dx < 0 else (2 * DX_HALF - 1 if dx >= 2 * DX_HALF else dx)
+    index = dx
+    index = index * 3 + _vy_sign(me.vy)
+    index = index * 3 + _vy_sign(other.vy)
+    index = index * 2 + me.is_attacking
+    index = index * 2 + other.is_attacking
+    index = index * 2 + (me.hit_cooldown > 0)
+    index = index * 2 + (other.fireball_cooldown > 0)
+    return index * 4 + _projectile_bucket(me, projectiles)
+
+
+class PolicyTable:
+    """Flat uint8 table of ACTIONS indices (HEURISTIC/UNKNOWN = use ai_update)"""
+    __slots__ = ('actions', 'lookup')
+
+    def __init__(self, actions=None):
+        self.actions = np.full(CELLS, UNKNOWN, np.uint8) if actions is None else actions
+        # bytes indexing returns a plain int, several times cheaper than a NumPy scalar
+        self.lookup = self.actions.tobytes()
+
+    def keys_for(self, me, other, projectiles=()):
+        """Key state for the table action in this state, or None to fall back."""
+        action = self.lookup[state_index(me, other, projectiles)]
+        return ACTION_KEYS[action] if action < HEURISTIC else None
+
+    @property
+    def coverage(self):
+        return float(np.mean(self.actions != UNKNOWN))
+
+    def save(self, path=DEFAULT_PATH):
+        np.savez_compressed(path, actions=self.actions, shape=np.array(SHAPE),
+                            masks=np.array(ACTIONS, np.uint8), version=POLICY_VERSION)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with np.load(path) as data:
+            if int(data['version']) != POLICY_VERSION or tuple(data['shape']) != SHAPE \
+                    or tuple(data['masks']) != ACTIONS:
+                raise ValueError(f'{path}: policy table was built for a different state layout')
+            return cls(data['actions'].copy())
+
+
+def attach(fighter, table):
+    """Make an AI fighter follow `table` (frog key bindings, no fireball)."""
+    fighter.policy = table
+    fighter.controls = dict(FROG_CONTROLS)
+
+
+class _Trainer:
+    """Policy used while training: plays like SearchAI over CANDIDATES (plus
+    some random exploration) and records the search's values per cell"""
+    def __init__(self, match, search, sums, counts, explore=0.2):
+        self.match = match
+        self.search = search
+        self.sums = sums
+        self.counts = counts
+        self.explore = explore
+        self.choice = HEURISTIC
+        self.hold = 0
+
+    def keys_for(self, me, other, projectiles=()):
+        if self.hold > 0:
+            self.hold -= 1
+        else:
+            values = self.search.evaluate(self.match, CANDIDATES)
+            cell = state_index(me, other, projectiles)
+            best = HEURISTIC
+            for i, value in enumerate(values):
+                if value is None:
+                    continue
+                self.sums[cell, i] += value
+                self.counts[cell, i] += 1
+                if values[best] is None or value > values[best]:
+                    best = i
+            if self.search.rng.random() < self.explore:
+                best = self.search.rng.randrange(len(CANDIDATES))
+            self.choice = best
+            self.hold = self.search.hold_frames - 1
+        return ACTION_KEYS[self.choice] if self.choice < HEURISTIC else None
+
+
+def train_match(opponent, seed, rollouts=18, horizon=60, distance_weight=0.004):
+    """Play one training match; returns (value sums, visit counts) per cell and action."""
+    sums = np.zeros((CELLS, len(CANDIDATES)))
+    counts = np.zeros((CELLS, len(CANDIDATES)), np.int32)
+    match = Match(input_provider=SCRIPTED_OPPONENTS[opponent](seed))
+    attach(match.ai, _Trainer(match, SearchAI(max_rollouts=rollouts, seed=seed, horizon=horizon,
+                                                  distance_weight=distance_weight), sums, counts))
+    HeadlessRunner(match=match).run()
+    return sums, counts
+
+
+def train(matches=64, rollouts=18, seed=0, workers=None, progress=None, **search_kwargs):
+    """Learn a PolicyTable from `matches` training matches spread over a process pool."""
+    opponents = list(SCRIPTED_OPPONENTS)
+    sums = np.zeros((CELLS, len(CANDIDATES)))
+    counts = np.zeros((CELLS, len(CANDIDATES)), np.int32)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_headless) as pool:
+        futures = [pool.submit(train_match, opponents[i % len(opponents)], seed * 1000003 + i, rollouts,
+                               **search_kwargs) for i in range(matches)]
+        for done, future in enumerate(as_completed(futures), 1):
+            match_sums, match_counts = future.result()
+            sums += match_sums
+            counts += match_counts
+            if progress:
+                progress(done, matches)
+    means = np.where(counts > 0, sums / np.maximum(counts, 1), -np.inf)
+    actions = np.argmax(means, axis=1).astype(np.uint8)
+    actions[counts.sum(axis=1) == 0] = UNKNOWN
+    return PolicyTable(actions)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=64)
+    parser.add_argument('--rollouts', type=int, default=18, help='search rollouts per training decision')
+    parser.add_argument('--horizon', type=int, default=60, help='rollout length in frames')
+    parser.add_argument('--distance-weight', type=float, default=0.004,
+                        help='rollout value penalty per pixel between the fighters')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='defaults to all cores')
+    parser.add_argument('--out', default=str(DEFAULT_PATH))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def progress(done, total):
+        print(f'  {done}/{total} matches ({time.perf_counter() - start:.0f}s)', file=sys.stderr)
+
+    table = train(args.matches, args.rollouts, args.seed, args.workers, progress,
+                  horizon=args.horizon, distance_weight=args.distance_weight)
+    table.save(args.out)
+    print(f'wrote {args.out}: {CELLS} cells, {table.coverage:.1%} visited, '
+          f'{Path(args.out).stat().st_size} bytes')
+
+
+if __name__ == '__main__':
+    main()
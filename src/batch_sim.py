@@ -0,0 +1,315 @@
+"""Vectorized simulator that steps many independent matches in lockstep.
+
+State for N matches lives in NumPy struct-of-arrays blocks; every rule from
+`Fighter.update`, `Fighter.ai_update`, `Projectile` and `Match._resolve_combat`
+is re-expressed as whole-array operations so one `step()` advances all matches.
+Visual-only state (animators, hit sparks, screen shake, sounds) is not modelled.
+
+Player input is one `CONTROL_BITS` bitmask per match per frame.
+"""
+import numpy as np
+
+from match import (WIDTH, PLATFORM_LEFT, PLATFORM_RIGHT, CONTROL_BITS, KNOCKBACK_DT)
+
+LEFT = CONTROL_BITS['left']
+RIGHT = CONTROL_BITS['right']
+PUNCH = CONTROL_BITS['punch']
+KICK = CONTROL_BITS['kick']
+JUMP = CONTROL_BITS['jump']
+FIREBALL = CONTROL_BITS['fireball']
+
+# attack_type / last_attack_type codes
+NO_ATTACK, ATTACK_PUNCH, ATTACK_KICK = 0, 1, 2
+
+# projectile slots per match; a fireball lives at most ~2.5s and the cooldown
+# is 0.8s, so no more than four can be in flight at once
+MAX_PROJECTILES = 4
+
+FIGHTER_FLOAT_FIELDS = ('x', 'y', 'vx', 'vy', 'attack_timer', 'hit_cooldown',
+                        'hop_cooldown', 'fireball_cooldown', 'combo_timer')
+FIGHTER_INT_FIELDS = ('health', 'rect_x', 'rect_y', 'combo_count',
+                      'last_attack_type', 'attack_type')
+FIGHTER_BOOL_FIELDS = ('is_attacking', 'facing_left')
+
+_ATTACK_CODES = {None: NO_ATTACK, 'punch': ATTACK_PUNCH, 'kick': ATTACK_KICK}
+
+
+class FighterArrays:
+    """Per-field views for one side (player or AI) into the shared state blocks"""
+    def __init__(self, fighter, floats, ints, bools):
+        for name, row in zip(FIGHTER_FLOAT_FIELDS, floats):
+            setattr(self, name, row)
+        for name, row in zip(FIGHTER_INT_FIELDS, ints):
+            setattr(self, name, row)
+        for name, row in zip(FIGHTER_BOOL_FIELDS, bools):
+            setattr(self, name, row)
+        # geometry and tuning are identical across matches
+        self.width = fighter.rect.width
+        self.height = fighter.HEIGHT
+        self.ground_y = fighter.ground_y
+        self.attack_duration = fighter.attack_duration
+        self.variant = fighter.variant
+        self.ai_speed = fighter.ai_speed
+        self.ai_attack_range = fighter.ai_attack_range
+        self.hop_interval = fighter.hop_interval
+        self.load(fighter)
+
+    def load(self, fighter, rows=slice(None)):
+        """Broadcast a scalar `Fighter`'s state into `rows`."""
+        for name in FIGHTER_FLOAT_FIELDS:
+            getattr(self, name)[rows] = getattr(fighter, name)
+        self.health[rows] = fighter.health
+        self.rect_x[rows] = fighter.rect.x
+        self.rect_y[rows] = fighter.rect.y
+        self.combo_count[rows] = fighter.combo_count
+        self.last_attack_type[rows] = _ATTACK_CODES[fighter.last_attack_type]
+        self.attack_type[rows] = _ATTACK_CODES[fighter.attack_type]
+        self.is_attacking[rows] = fighter.is_attacking
+        self.facing_left[rows] = fighter.facing_left
+
+    def on_ground(self):
+        return (self.y + self.height) >= (self.ground_y - 1)
+
+    def centerx(self):
+        return self.rect_x + self.width // 2
+
+    def start_attack(self, mask):
+        # attack_type must already be set for these rows
+        start = mask & ~self.is_attacking & self.on_ground()
+        self.is_attacking[start] = True
+        self.attack_timer[start] = self.attack_duration
+
+    def press_attack(self, pressed, code):
+        # handle_input's punch/kick branch: combo bookkeeping runs even if the attack can't start
+        go = pressed & ~self.is_attacking
+        chain = go & (self.combo_timer > 0) & (self.last_attack_type == code)
+        self.combo_count[:] = np.where(chain, self.combo_count + 1, np.where(go, 1, self.combo_count))
+        self.combo_timer[go] = 0.4
+        self.last_attack_type[go] = code
+        self.attack_type[go] = code
+        self.start_attack(go)
+
+    def attack_rects(self):
+        kick = self.attack_type == ATTACK_KICK
+        w = np.where(kick, int(self.width * 1.5), int(self.width * 1.2))
+        h = int(self.height * 0.35)
+        y_off = np.where(kick, int(self.height * 0.45), int(self.height * 0.25))
+        x = np.where(self.facing_left, self.rect_x - w, self.rect_x + self.width)
+        return x, self.rect_y + y_off, w, h
+
+    def overlaps(self, x, y, w, h):
+        # pygame.Rect.colliderect for (x, y, w, h) against this fighter's rect
+        return ((x < self.rect_x + self.width) & (self.rect_x < x + w) &
+                (y < self.rect_y + self.height) & (self.rect_y < y + h) & (w > 0))
+
+    def update(self, dt):
+        # mirrors Fighter.update (without the animator)
+        center = self.x + self.width // 2
+        on_platform = (center >= PLATFORM_LEFT) & (center <= PLATFORM_RIGHT)
+        speed_multiplier = np.where(on_platform, 1.0, 0.5)
+        self.x += self.vx * dt * speed_multiplier
+        np.maximum(0, np.minimum(WIDTH - self.width, self.x), out=self.x)
+        self.rect_x[:] = np.trunc(self.x)
+
+        friction = 800 * dt
+        self.vx[:] = np.where(self.vx > 0, np.maximum(0, self.vx - friction),
+                              np.where(self.vx < 0, np.minimum(0, self.vx + friction), self.vx))
+
+        self.vy += 900 * dt  # gravity
+        self.y += self.vy * dt
+        grounded = self.y + self.height >= self.ground_y
+        self.y[grounded] = self.ground_y - self.height
+        self.vy[grounded] = 0
+        self.rect_y[:] = np.trunc(self.y)
+
+        attacking = self.is_attacking.copy()
+        self.attack_timer[attacking] -= dt
+        ended = attacking & (self.attack_timer <= 0)
+        self.is_attacking[ended] = False
+        self.attack_type[ended] = NO_ATTACK
+
+        for timer in (self.hop_cooldown, self.fireball_cooldown):
+            running = timer > 0
+            timer[running] -= dt
+            timer[timer < 0] = 0
+
+        running = self.combo_timer > 0
+        self.combo_timer[running] -= dt
+        expired = running & (self.combo_timer <= 0)
+        self.combo_count[expired] = 0
+        self.last_attack_type[expired] = NO_ATTACK
+
+    def decay_hit_cooldown(self, dt):
+        running = self.hit_cooldown > 0
+        self.hit_cooldown[running] -= dt
+        self.hit_cooldown[self.hit_cooldown < 0] = 0
+
+
+class BatchSim:
+    """N matches stepped in lockstep; build with `BatchSim.from_match`."""
+    def __init__(self, match, n):
+        self.n = n
+        nf = len(FIGHTER_FLOAT_FIELDS)
+        ni = len(FIGHTER_INT_FIELDS)
+        nb = len(FIGHTER_BOOL_FIELDS)
+        # one contiguous block per dtype; rows are fields, columns are matches
+        self._floats = np.zeros((2 * nf + 1, n))
+        self._ints = np.zeros((2 * ni + 2, n), dtype=np.int64)
+        self._bools = np.zeros((2 * nb + 1, n), dtype=bool)
+        self.player = FighterArrays(match.player, self._floats[:nf], self._ints[:ni], self._bools[:nb])
+        self.ai = FighterArrays(match.ai, self._floats[nf:2 * nf], self._ints[ni:2 * ni], self._bools[nb:2 * nb])
+        self.timer = self._floats[2 * nf]
+        self.score_p1 = self._ints[2 * ni]
+        self.score_ai = self._ints[2 * ni + 1]
+        self.game_over = self._bools[2 * nb]
+        self._proj_floats = np.zeros((3, MAX_PROJECTILES, n))  # x, y, direction
+        self._proj_active = np.zeros((MAX_PROJECTILES, n), dtype=bool)
+        self.proj_x, self.proj_y, self.proj_dir = self._proj_floats
+        self.proj_active = self._proj_active
+        self.frame = 0
+        self.load(match)
+
+    @classmethod
+    def from_match(cls, match, n):
+        """N copies of `match`'s current state."""
+        return cls(match, n)
+
+    def load(self, match, rows=slice(None)):
+        self.player.load(match.player, rows)
+        self.ai.load(match.ai, rows)
+        self.timer[rows] = match.timer
+        self.score_p1[rows] = match.score_p1
+        self.score_ai[rows] = match.score_ai
+        self.game_over[rows] = match.game_over
+        self.proj_active[:, rows] = False
+        for slot, proj in zip(range(MAX_PROJECTILES), match.projectiles):
+            self.proj_x[slot, rows] = proj.x
+            self.proj_y[slot, rows] = proj.y
+            self.proj_dir[slot, rows] = proj.direction
+            self.proj_active[slot, rows] = proj.active
+
+    def _blocks(self):
+        return (self._floats, self._ints, self._bools, self._proj_floats, self._proj_active)
+
+    def step(self, actions, dt):
+        """Advance every unfinished match by `dt` given per-match control bitmasks."""
+        done = np.flatnonzero(self.game_over)
+        if len(done) == self.n:
+            return
+        # finished matches are computed along with the rest and restored afterwards
+        frozen = [block[..., done].copy() for block in self._blocks()] if len(done) else None
+        self.frame += 1
+        p, a = self.player, self.ai
+        actions = np.asarray(actions)
+
+        np.maximum(0.0, self.timer - dt, out=self.timer)
+
+        # Fighter.handle_input
+        left = (actions & LEFT) != 0
+        right = (actions & RIGHT) != 0
+        p.vx[:] = 0
+        p.vx[left] = -220
+        p.facing_left[left] = True
+        p.vx[right] = 220
+        p.facing_left[right] = False
+        p.press_attack((actions & PUNCH) != 0, ATTACK_PUNCH)
+        p.press_attack((actions & KICK) != 0, ATTACK_KICK)
+        p_ground = p.on_ground()
+        p.vy[((actions & JUMP) != 0) & p_ground] = -520 if p.variant == "human" else -420
+        shoot = ((actions & FIREBALL) != 0) & (p.fireball_cooldown <= 0) & p_ground
+        p.fireball_cooldown[shoot] = 0.8
+        if shoot.any():
+            self._spawn_projectiles(shoot)
+
+        p.update(dt)
+        self._ai_update(a, p)
+        a.update(dt)
+        self._update_projectiles(dt)
+        self._resolve_combat(dt)
+
+        self.game_over |= (p.health <= 0) | (a.health <= 0) | (self.timer <= 0)
+        if frozen is not None:
+            for block, saved in zip(self._blocks(), frozen):
+                block[..., done] = saved
+
+    def _spawn_projectiles(self, shoot):
+        p = self.player
+        free = ~self.proj_active
+        rows = np.flatnonzero(shoot & free.any(axis=0))
+        slots = free[:, rows].argmax(axis=0)
+        direction = np.where(p.facing_left[rows], -1, 1)
+        self.proj_x[slots, rows] = p.centerx()[rows] + 40 * direction
+        self.proj_y[slots, rows] = p.rect_y[rows] + p.height // 2 - 20
+        self.proj_dir[slots, rows] = direction
+        self.proj_active[slots, rows] = True
+
+    def _ai_update(self, a, other):
+        # mirrors Fighter.ai_update
+        mine = a.centerx()
+        theirs = other.centerx()
+        go_left = theirs < mine - a.ai_attack_range
+        go_right = ~go_left & (theirs > mine + a.ai_attack_range)
+        close = ~go_left & ~go_right
+        a.vx[:] = np.where(go_left, -a.ai_speed, np.where(go_right, a.ai_speed, 0))
+        a.facing_left[go_left] = True
+        a.facing_left[go_right] = False
+        starting = close & ~a.is_attacking
+        a.attack_type[starting & a.on_ground()] = ATTACK_PUNCH
+        a.start_attack(starting)
+        if a.hop_interval > 0:
+            hop = a.on_ground() & (np.abs(a.vx) > 10) & (a.hop_cooldown <= 0)
+            a.vy[hop] = -440
+            a.hop_cooldown[hop] = a.hop_interval
+
+    def _update_projectiles(self, dt):
+        a = self.ai
+        for slot in range(MAX_PROJECTILES):
+            live = self.proj_active[slot]
+            if not live.any():
+                continue
+            x = self.proj_x[slot]
+            direction = self.proj_dir[slot]
+            x[live] = (x + 450 * direction * dt)[live]
+            gone = live & ((x < -50) | (x > WIDTH + 50))
+            live &= ~gone
+            hit = live & a.overlaps(np.trunc(x - 12), np.trunc(self.proj_y[slot] - 12), 24, 24) & (a.hit_cooldown <= 0)
+            if not hit.any():
+                continue
+            kb_dir = np.where(direction > 0, 1, -1)
+            a.health[hit] = np.maximum(0, a.health[hit] - 20)
+            a.vy[hit] = -320
+            a.x[hit] += (kb_dir * 280 * KNOCKBACK_DT * 15)[hit]
+            a.vx[hit] = (kb_dir * 500)[hit]
+            a.hit_cooldown[hit] = 0.5
+            self.score_p1[hit] += 20
+            live &= ~hit
+
+    def _resolve_combat(self, dt):
+        for attacker, defender, score, from_player in ((self.player, self.ai, self.score_p1, True),
+                                                       (self.ai, self.player, self.score_ai, False)):
+            t = attacker.attack_timer
+            total = attacker.attack_duration if attacker.attack_duration > 0 else 0.001
+            active = attacker.is_attacking & (t < total * 0.80) & (t > total * 0.20)
+            if active.any():
+                ax, ay, aw, ah = attacker.attack_rects()
+                hit = active & defender.overlaps(ax, ay, aw, ah) & (defender.hit_cooldown <= 0)
+                if hit.any():
+                    kick = attacker.attack_type == ATTACK_KICK
+                    dmg = np.where(kick, 15, 10)
+                    defender.health[hit] = np.maximum(0, defender.health - dmg)[hit]
+                    if from_player:
+                        kb_x = np.where(kick, 500, 350)
+                        momentum = np.where(kick, 450, 350)
+                        vy_knock = -280
+                    else:
+                        kb_x = np.where(kick, 350, 250)
+                        momentum = 300
+                        vy_knock = -220
+                    push = kb_x * KNOCKBACK_DT * 15
+                    ahead = attacker.centerx() < defender.centerx()
+                    defender.x[hit] = np.where(ahead, defender.x + push, defender.x - push)[hit]
+                    defender.vx[hit] = np.where(ahead, momentum, -momentum)[hit]
+                    defender.vy[hit] = vy_knock
+                    defender.hit_cooldown[hit] = 0.5
+                    score[hit] += dmg[hit]
+            defender.decay_hit_cooldown(dt)
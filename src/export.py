@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Export a recorded match to a PNG sequence or an animated GIF/WebP.
+
+Frames come from the real `Game.draw` (HUD, sparks, particles, screen
+shake), drawn off-screen under the SDL dummy driver. The frame range is
+split into chunks for a pool of worker processes. Each worker seeks the
+replay to `WARMUP_FRAMES` before its chunk (nearest keyframe, then
+simulation) and plays the warm-up with drawing, so particles and other
+presentation state match a straight run. Screen shake and particle
+randomness are re-seeded from the replay seed and frame number, so the
+output does not depend on how the range is split.
+
+PNG frames are written by the workers. GIF and WebP frames go back to
+the parent in order and are streamed into Pillow. GIF frames are
+quantized in the workers.
+
+Usage:
+    python3 src/export.py match.mfr highlights.gif --start 600 --end 1200 --every 2 --scale 0.5
+    python3 src/export.py match.mfr frames/ --format png --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from headless import init_headless
+from replay import Replay
+
+FORMATS = ('png', 'gif', 'webp')
+WARMUP_FRAMES = 60  # longer than any particle lives, see Game.update_effects
+CHUNK_FRAMES = 240  # source frames per worker task
+
+_worker = None  # per-process _FrameRenderer
+
+
+class _FrameRenderer:
+    """A Game playing one replay off-screen; renders frame ranges of it"""
+    def __init__(self, path, scale):
+        init_headless()
+        import pygame
+        pygame.init()
+        from game import Game
+        self.pygame = pygame
+        self.replay = Replay.load(path)
+        self.game = self.replay.create_match(Game)
+        pygame.mixer.music.stop()
+        width, height = self.game.screen.get_size()
+        self.size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        self.scaled = pygame.Surface(self.size) if scale != 1.0 else None
+
+    def _step(self):
+        game = self.game
+        # randomness that only affects presentation, seeded per frame
+        game.particles.rng = np.random.default_rng((self.replay.seed, game.frame))
+        game.update(self.replay.dt_at(game.frame))
+
+    def _draw(self):
+        random.seed(self.replay.seed * 1000003 + self.game.frame)  # screen shake
+        self.game.draw()
+        if self.scaled:
+            self.pygame.transform.smoothscale(self.game.screen, self.size, self.scaled)
+            return self.scaled
+        return self.game.screen
+
+    def frames(self, start, end, every=1):
+        """Yield (frame, surface) for frames start, start + every, ... below `end`.
+
+        Frame f is the state after f updates. Every state is drawn, kept or
+        not, so presentation state evolves as in a straight run. The yielded
+        surface is reused.
+        """
+        game = self.game
+        game.particles.clear()
+        game._frozen = None
+        game.paused = False
+        self.replay.seek(game, max(0, start - WARMUP_FRAMES))
+        while game.frame < end:
+            surface = self._draw()
+            if game.frame >= start and (game.frame - start) % every == 0:
+                yield game.frame, surface
+            if game.game_over or game.frame >= self.replay.frame_count:
+                break
+            self._step()
+
+
+def _init_worker(path, scale):
+    global _worker
+    _worker = _FrameRenderer(path, scale)
+
+
+def _render_chunk(start, end, every, fmt, out_dir):
+    """Render one chunk: writes PNGs and returns their count, or returns Pillow images"""
+    pygame = _worker.pygame
+    if fmt == 'png':
+        count = 0
+        for frame, surface in _worker.frames(start, end, every):
+            pygame.image.save(surface, str(Path(out_dir) / f'frame_{frame:06d}.png'))
+            count += 1
+        return count
+    from PIL import Image
+    images = []
+    for frame, surface in _worker.frames(start, end, every):
+        image = Image.frombytes('RGB', surface.get_size(), pygame.image.tobytes(surface, 'RGB'))
+        if fmt == 'gif':
+            image = image.quantize(method=Image.Quantize.FASTOCTREE)
+        images.append(image)
+    return images
+
+
+def export(path, out, fmt='png', workers=None, start=0, end=None, every=1, scale=1.0,
+           fps=None, chunk=CHUNK_FRAMES):
+    """Export frames [start, end) of the replay at `path`; returns (frames written, seconds).
+
+    `out` is a directory for PNG and a file for GIF/WebP. `fps` (animation
+    speed) defaults to the replay's frame rate divided by `every`.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'unknown format {fmt!r} (expected one of {FORMATS})')
+    replay = Replay.load(path)
+    last = replay.frame_count  # the final state, after every recorded frame
+    end = last + 1 if end is None else min(end, last + 1)
+    workers = workers or os.cpu_count() or 1
+    if fps is None:
+        fps = 1.0 / replay.dt / every
+    if fmt == 'png':
+        Path(out).mkdir(parents=True, exist_ok=True)
+    # chunk boundaries on the `every` grid so chunks don't skip or repeat frames
+    chunk = max(every, chunk // every * every)
+    ranges = [(s, min(s + chunk, end)) for s in range(start, end, chunk)]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(path), scale)) as pool:
+        # a bounded window of chunks in flight keeps memory flat on long replays
+        pending = deque()
+        ranges = iter(ranges)
+
+        def results():
+            for _ in range(2 * workers):
+                submit()
+            while pending:
+                result = pending.popleft().result()
+                submit()
+                yield result
+
+        def submit():
+            span = next(ranges, None)
+            if span is not None:
+                pending.append(pool.submit(_render_chunk, span[0], span[1], every, fmt, str(out)))
+
+        if fmt == 'png':
+            written = sum(results())
+        else:
+            images = (image for batch in results() for image in batch)
+            first = next(images, None)
+            if first is None:
+                return 0, time.perf_counter() - started
+            counted = _Counter(images)
+            options = {'lossless': False, 'quality': 80} if fmt == 'webp' else {'optimize': False}
+            first.save(out, format=fmt.upper(), save_all=True, append_images=counted,
+                       duration=round(1000 / fps), loop=0, **options)
+            written = counted.count + 1
+    return written, time.perf_counter() - started
+
+
+class _Counter:
+    """Iterable wrapper counting the items Pillow pulls from it"""
+    def __init__(self, items):
+        self.items = items
+        self.count = 0
+
+    def __iter__(self):
+        for item in self.items:
+            self.count += 1
+            yield item
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render a replay to a PNG sequence or animated GIF/WebP')
+    parser.add_argument('replay', help='replay file recorded with main.py --record')
+    parser.add_argument('out', help='output directory (png) or file (gif, webp)')
+    parser.add_argument('--format', choices=FORMATS, help='default: from the output suffix, else png')
+    parser.add_argument('--workers', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('--start', type=int, default=0, help='first frame')
+    parser.add_argument('--end', type=int, help='stop before this frame (default: through the end)')
+    parser.add_argument('--every', type=int, default=1, help='keep every Nth frame')
+    parser.add_argument('--scale', type=float, default=1.0, help='output size relative to the window')
+    parser.add_argument('--fps', type=float, help='animation speed (default: real time)')
+    args = parser.parse_args()
+    fmt = args.format or (Path(args.out).suffix.lstrip('.').lower() if Path(args.out).suffix else 'png')
+    if fmt not in FORMATS:
+        parser.error(f'unknown format {fmt!r}; use --format')
+    written, seconds = export(args.replay, args.out, fmt, args.workers, args.start, args.end,
+                              args.every, args.scale, args.fps)
+    print(f'Wrote {written} frames to {args.out} in {seconds:.1f}s ({written / max(seconds, 1e-9):.1f} frames/s)')
+
+
+if __name__ == '__main__':
+    main()
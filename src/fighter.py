@@ -1,9 +1,31 @@
 import pygame
 import os
+import struct
 from pathlib import Path
 
+# loaded sprite strips keyed by path, shared by every Fighter using that sheet
+_SPRITE_CACHE = {}
+# draw-ready frames keyed by (path, size):
+# {source frame: ((image, opaque bounds) facing right, (image, opaque bounds) facing left)}
+_DRAW_CACHE = {}
+
+
+# animation actions in sprite-strip order (frame counts must match generator)
+ANIM_COUNTS = {'idle': 4, 'walk': 4, 'punch': 4, 'kick': 4, 'jump': 3, 'jumpkick': 3}
+_ANIM_ACTIONS = tuple(ANIM_COUNTS)
+_ATTACK_TYPES = (None, 'punch', 'kick')
+
+# packed fighter state for save states (see Fighter.pack_state):
+# x, y, vx, vy, attack_timer, fireball_cooldown, combo_timer, hop_cooldown,
+# hit_cooldown, anim index, anim fps, health, combo_count, rect x/y,
+# facing_left, is_attacking, just_started_attack, took_hit, shoot_fireball,
+# last_attack_type, attack_type, anim action
+FIGHTER_STATE = struct.Struct('<11d4i5?3b')
+
 
 class SpriteAnimator:
+    __slots__ = ('frames', 'fps', 'index')
+
     def __init__(self, frames, fps=8):
         self.frames = frames
         self.fps = fps
@@ -25,9 +47,44 @@ class SpriteAnimator:
         return self.frames[int(self.index)]
 
 
+def _draw_frames(path, frames, size):
+    """Flipped and scaled copies of `frames` for drawing at `size`, built once per sheet and size"""
+    key = (path, size)
+    cached = _DRAW_CACHE.get(key)
+    if cached is None:
+        cached = {}
+        for frame in frames:
+            # same flip-then-scale order as the uncached path in Fighter.draw
+            pair = []
+            for flipped in (frame, pygame.transform.flip(frame, True, False)):
+                if flipped.get_size() != size:
+                    flipped = pygame.transform.scale(flipped, size)
+                else:
+                    flipped = flipped.copy()
+                bounds = flipped.get_bounding_rect()
+                # run-length encode the mostly transparent sprite: blits skip
+                # transparent runs and come out pixel-identical
+                flipped.set_alpha(255, pygame.RLEACCEL)
+                pair.append((flipped, bounds))
+            cached[frame] = tuple(pair)
+        _DRAW_CACHE[key] = cached
+    return cached
+
+
 class Fighter:
-    # base dimensions; will be overridden after sprite load with scale applied
-    WIDTH, HEIGHT = 60, 100
+    # base dimensions; WIDTH/HEIGHT are overridden after sprite load with scale applied
+    BASE_WIDTH, BASE_HEIGHT = 60, 100
+
+    # fixed state layout: every field is assigned in __init__
+    __slots__ = (
+        'scale', 'x', 'y', 'vx', 'vy', 'ground_y', 'sprite_path', 'variant', 'rect',
+        'WIDTH', 'HEIGHT', 'health', 'is_ai', 'controls', 'facing_left',
+        'is_attacking', 'just_started_attack', 'attack_type', 'attack_timer',
+        'attack_duration', 'took_hit', 'hit_cooldown', 'fireball_cooldown',
+        'shoot_fireball', 'combo_count', 'combo_timer', 'last_attack_type',
+        'ai_speed', 'ai_attack_range', 'hop_interval', 'hop_cooldown', 'policy',
+        'sprite_frames', 'anim_map', 'animator', 'draw_frames',
+    )
 
     def __init__(self, x, ground_y, is_ai=False, controls=None, variant="human"):
         self.scale = 2.2  # make fighters larger on screen with more detail
@@ -36,59 +93,77 @@ class Fighter:
         self.sprite_path = None
         self.variant = variant
         self.vx = 0
+        self.vy = 0.0
+        self.WIDTH, self.HEIGHT = self.BASE_WIDTH, self.BASE_HEIGHT
         # temp rect; will be resized after sprite load using scale
         self.rect = pygame.Rect(int(self.x), int(ground_y - self.HEIGHT), self.WIDTH, self.HEIGHT)
+        self.y = float(self.rect.y)
         self.health = 300 if variant == "frog" else 200
         self.is_ai = is_ai
         self.controls = controls or {}
         self.facing_left = False if not is_ai else True
         self.is_attacking = False
         self.just_started_attack = False
+        self.attack_type = None
         self.attack_timer = 0.0
         self.attack_duration = 0.12  # Faster for combos
         self.took_hit = False
+        self.hit_cooldown = 0.0
         self.fireball_cooldown = 0.0
         self.shoot_fireball = False
         self.combo_count = 0
         self.combo_timer = 0.0
         self.last_attack_type = None
+        # AI tuning used by ai_update (tournaments override these per entrant)
+        self.ai_speed = 180 if variant == "frog" else 120
+        self.ai_attack_range = 50
+        self.hop_interval = 0.55 if variant == "frog" else 0.0
+        # optional lookup-table policy consulted first by ai_update (see ai_policy.py)
+        self.policy = None
+        # frog hop timer
+        self.hop_cooldown = 0.0
 
         # sprite support
         self.sprite_frames = []
+        self.anim_map = None
         self.animator = None
+        self.draw_frames = {}
         self._load_sprite()
         # anchor to ground after sprite size applied
         self.y = self.ground_y - self.rect.height
         self.rect.y = int(self.y)
-        # frog hop timer
-        self.hop_cooldown = 0.0
 
     def _load_sprite(self):
         # look for the fighter-specific sprite path if provided, otherwise fallback
         base = Path(__file__).resolve().parents[1]
-        if hasattr(self, 'sprite_path') and self.sprite_path:
+        if self.sprite_path:
             candidate = Path(self.sprite_path)
         else:
             candidate = base / 'assets' / 'character.png'
         if candidate.exists():
             try:
-                img = pygame.image.load(str(candidate)).convert_alpha()
-                h = img.get_height()
-                if h <= 0:
-                    return
-                # assume square frames, frame width = height
-                fw = h
-                n = img.get_width() // fw
-                frames = []
-                for i in range(n):
-                    frame = img.subsurface((i * fw, 0, fw, h)).copy()
-                    frames.append(frame)
+                frames = _SPRITE_CACHE.get(str(candidate))
+                if frames is None:
+                    img = pygame.image.load(str(candidate)).convert_alpha()
+                    h = img.get_height()
+                    if h <= 0:
+                        return
+                    # assume square frames, frame width = height
+                    fw = h
+                    n = img.get_width() // fw
+                    frames = []
+                    for i in range(n):
+                        frame = img.subsurface((i * fw, 0, fw, h)).copy()
+                        frames.append(frame)
+                    _SPRITE_CACHE[str(candidate)] = frames
+                    print('Loaded', n, 'sprite frames for fighter from', candidate)
+                fw, h = frames[0].get_size()
+                n = len(frames)
                 self.sprite_frames = frames
                 # map frames to actions (counts must match generator)
-                counts = {'idle': 4, 'walk': 4, 'punch': 4, 'kick': 4, 'jump': 3, 'jumpkick': 3}
                 idx = 0
                 self.anim_map = {}
-                for action, cnt in counts.items():
+                for action, cnt in ANIM_COUNTS.items():
                     self.anim_map[action] = frames[idx:idx+cnt]
                     idx += cnt
                 # default animator uses idle
@@ -99,7 +174,7 @@ class Fighter:
                 self.WIDTH, self.HEIGHT = scaled_w, scaled_h
                 self.rect.width = scaled_w
                 self.rect.height = scaled_h
-                print('Loaded', n, 'sprite frames for fighter from', candidate)
+                self.draw_frames = _draw_frames(str(candidate), frames, (scaled_w, scaled_h))
             except Exception as e:
                 print('Failed to load sprite:', e)
 
@@ -142,27 +217,30 @@ class Fighter:
             self.start_attack(force=True)
         if jump_key and keys[jump_key] and self.on_ground():
             # jump impulse - Player 1 (human) jumps MUCH higher
-            if not hasattr(self, 'vy'):
-                self.vy = 0.0
             self.vy = -520 if self.variant == "human" else -420
             # set jump animation
-            if hasattr(self, 'anim_map') and 'jump' in self.anim_map:
+            if self.anim_map and 'jump' in self.anim_map:
                 self.animator.frames = self.anim_map['jump']
                 self.animator.index = 0.0
         # fireball shooting (L key, player only)
-        if not self.is_ai and keys[pygame.K_l] and self.fireball_cooldown <= 0 and self.on_ground():
+        if not self.is_ai and fireball_key and keys[fireball_key] and self.fireball_cooldown <= 0 and self.on_ground():
             self.shoot_fireball = True
             self.fireball_cooldown = 0.8
 
-    def ai_update(self, other, dt):
+    def ai_update(self, other, dt, projectiles=()):
         if not self.is_ai:
             return
+        if self.policy is not None:
+            keys = self.policy.keys_for(self, other, projectiles)
+            if keys is not None:
+                self.handle_input(keys)
+                return
         # approach player, attack when close
-        if other.rect.centerx < self.rect.centerx - 50:
-            self.vx = -180 if self.variant == "frog" else -120
+        if other.rect.centerx < self.rect.centerx - self.ai_attack_range:
+            self.vx = -self.ai_speed
             self.facing_left = True
-        elif other.rect.centerx > self.rect.centerx + 50:
-            self.vx = 180 if self.variant == "frog" else 120
+        elif other.rect.centerx > self.rect.centerx + self.ai_attack_range:
+            self.vx = self.ai_speed
             self.facing_left = False
         else:
             self.vx = 0
@@ -170,22 +248,20 @@ class Fighter:
                 self.just_started_attack = True
                 self.start_attack()
 
-        # frog variant hops while moving
-        if self.variant == "frog" and self.on_ground() and abs(self.vx) > 10 and self.hop_cooldown <= 0:
-            if not hasattr(self, 'vy'):
-                self.vy = 0.0
+        # hop while moving (frog variant by default, see hop_interval)
+        if self.hop_interval > 0 and self.on_ground() and abs(self.vx) > 10 and self.hop_cooldown <= 0:
             self.vy = -440
-            self.hop_cooldown = 0.55
+            self.hop_cooldown = self.hop_interval
 
     def start_attack(self, force=False):
         if not self.is_attacking and self.on_ground():
             self.is_attacking = True
             self.attack_timer = self.attack_duration
             # set attack type earlier when called with type param (kept compatibility)
-            if not hasattr(self, 'attack_type') or self.attack_type is None:
+            if self.attack_type is None:
                 self.attack_type = 'punch' if not force else 'kick'
             # set corresponding animation
-            if hasattr(self, 'anim_map') and self.attack_type in self.anim_map:
+            if self.anim_map and self.attack_type in self.anim_map:
                 self.animator.frames = self.anim_map[self.attack_type]
                 self.animator.index = 0.0
                 self.animator.fps = 14  # Faster attack animations for combos
@@ -195,7 +271,7 @@ class Fighter:
             return pygame.Rect(0, 0, 0, 0)
         # active only in the middle of attack duration
         # position differs for punch vs kick
-        atype = getattr(self, 'attack_type', 'punch')
+        atype = self.attack_type
         # Much larger hitboxes to match extended punch/kick animations
         # Punch extends far forward (Ryu's extended arm), kick extends even further
         w = int(self.rect.width * (1.2 if atype == 'punch' else 1.5))
@@ -208,8 +284,7 @@ class Fighter:
 
     def on_ground(self):
         # check if fighter is on stored ground level (allow small tolerance)
-        height = getattr(self, 'HEIGHT', self.rect.height)
-        return (self.y + height) >= (getattr(self, 'ground_y', self.y + height) - 1)
+        return (self.y + self.HEIGHT) >= (self.ground_y - 1)
 
     def take_damage(self, amount):
         self.health = max(0, self.health - amount)
@@ -239,13 +314,11 @@ class Fighter:
                 self.vx = min(0, self.vx + friction)
 
         # vertical physics
-        if not hasattr(self, 'vy'):
-            self.vy = 0.0
         self.vy += 900 * dt  # gravity
         self.y += self.vy * dt
         # ground clamp: use stored ground_y
-        GROUND_Y = getattr(self, 'ground_y', (600 - 120))
-        height = getattr(self, 'HEIGHT', self.rect.height)
+        GROUND_Y = self.ground_y
+        height = self.HEIGHT
         # rect bottom should not go below ground
         if self.y + height >= GROUND_Y:
             self.y = GROUND_Y - height
@@ -275,11 +348,11 @@ class Fighter:
                 self.last_attack_type = None
 
         # update animator based on state
-        if hasattr(self, 'anim_map'):
+        if self.anim_map is not None:
             # determine current state
             if self.is_attacking:
-                state = getattr(self, 'attack_type', 'punch')
-            elif getattr(self, 'vy', 0) < -1:
+                state = self.attack_type
+            elif self.vy < -1:
                 state = 'jump'
             elif abs(self.vx) > 10:
                 state = 'walk'
@@ -301,9 +374,84 @@ class Fighter:
                 self.animator.fps = 10
             self.animator.update(dt)
 
-    def draw(self, surface):
+    def snapshot(self):
+        """Gameplay and animation state as a flat tuple, for rollback (see restore)."""
+        a = self.animator
+        return (self.x, self.y, self.vx, self.vy, self.health, self.facing_left,
+                self.is_attacking, self.just_started_attack, self.attack_timer, self.took_hit,
+                self.fireball_cooldown, self.shoot_fireball, self.combo_count, self.combo_timer,
+                self.last_attack_type, self.hop_cooldown, self.hit_cooldown,
+                self.attack_type, self.rect.x, self.rect.y,
+                a.frames if a else None, a.index if a else 0.0, a.fps if a else 0)
+
+    def restore(self, state):
+        (self.x, self.y, self.vx, self.vy, self.health, self.facing_left,
+         self.is_attacking, self.just_started_attack, self.attack_timer, self.took_hit,
+         self.fireball_cooldown, self.shoot_fireball, self.combo_count, self.combo_timer,
+         self.last_attack_type, self.hop_cooldown, self.hit_cooldown,
+         self.attack_type, self.rect.x, self.rect.y, frames, index, fps) = state
+        if self.animator:
+            self.animator.frames = frames
+            self.animator.index = index
+            self.animator.fps = fps
+
+    def pack_state(self):
+        """Gameplay and animation state packed with FIGHTER_STATE (fixed size)."""
+        a = self.animator
+        action = -1
+        if a and self.anim_map:
+            for i, name in enumerate(_ANIM_ACTIONS):
+                if self.anim_map.get(name) is a.frames:
+                    action = i
+                    break
+        return FIGHTER_STATE.pack(
+            self.x, self.y, self.vx, self.vy, self.attack_timer, self.fireball_cooldown,
+            self.combo_timer, self.hop_cooldown, self.hit_cooldown,
+            a.index if a else 0.0, a.fps if a else 0.0,
+            self.health, self.combo_count, self.rect.x, self.rect.y,
+            self.facing_left, self.is_attacking, self.just_started_attack, self.took_hit,
+            self.shoot_fireball, _ATTACK_TYPES.index(self.last_attack_type),
+            _ATTACK_TYPES.index(self.attack_type), action)
+
+    @staticmethod
+    def decode_state(data, offset=0):
+        """Unpack a pack_state record from `data` at `offset` without applying
+        it; raises ValueError if an attack type or anim action is out of range."""
+        values = FIGHTER_STATE.unpack_from(data, offset)
+        last_attack, attack, action = values[-3:]
+        if not (0 <= last_attack < len(_ATTACK_TYPES) and 0 <= attack < len(_ATTACK_TYPES)
+                and -1 <= action < len(_ANIM_ACTIONS)):
+            raise ValueError(f'bad fighter state: attack types {last_attack}, {attack}, anim action {action}')
+        return values
+
+    def unpack_state(self, data, offset=0):
+        """Restore state written by pack_state from `data` at `offset`."""
+        self.apply_state(self.decode_state(data, offset))
+
+    def apply_state(self, values):
+        """Restore a record returned by decode_state."""
+        (self.x, self.y, self.vx, self.vy, self.attack_timer, self.fireball_cooldown,
+         self.combo_timer, self.hop_cooldown, self.hit_cooldown, index, fps,
+         self.health, self.combo_count, self.rect.x, self.rect.y,
+         self.facing_left, self.is_attacking, self.just_started_attack, self.took_hit,
+         self.shoot_fireball, last_attack, attack, action) = values
+        self.last_attack_type = _ATTACK_TYPES[last_attack]
+        self.attack_type = _ATTACK_TYPES[attack]
+        if self.animator:
+            if action >= 0 and self.anim_map:
+                self.animator.frames = self.anim_map.get(_ANIM_ACTIONS[action], [])
+            self.animator.index = index
+            self.animator.fps = fps
+
+    def draw(self, surface, dx=0, dy=0):
+        """Draw the current frame offset by (dx, dy) (screen shake); returns the Rect it covers"""
         if self.animator and self.animator.get_frame() is not None:
             frame = self.animator.get_frame()
+            cached = self.draw_frames.get(frame)
+            if cached is not None:
+                # blit only the non-transparent part so the returned Rect is tight
+                image, bounds = cached[self.facing_left]
+                return surface.blit(image, (self.rect.x + bounds.x + dx, self.rect.y + bounds.y + dy), bounds)
             # flip if facing left
             if self.facing_left:
                 frame = pygame.transform.flip(frame, True, False)
@@ -311,9 +459,10 @@ class Fighter:
             fw, fh = frame.get_size()
             if (fw, fh) != (self.rect.width, self.rect.height):
                 frame = pygame.transform.scale(frame, (self.rect.width, self.rect.height))
-            surface.blit(frame, self.rect)
+            return surface.blit(frame, self.rect.move(dx, dy))
         else:
             color = (200, 80, 80) if not self.is_ai else (80, 80, 200)
-            pygame.draw.rect(surface, color, self.rect)
+            drawn = pygame.draw.rect(surface, color, self.rect.move(dx, dy))
             if self.is_attacking:
-                pygame.draw.rect(surface, (255, 255, 0), self.attack_rect())
+                drawn = drawn.union(pygame.draw.rect(surface, (255, 255, 0), self.attack_rect().move(dx, dy)))
+            return drawn
@@ -1,75 +1,38 @@
 import pygame
-from fighter import Fighter
+from match import Match, WIDTH, HEIGHT, GROUND_Y
+from compositor import CachedLayer, Compositor
+from particles import ParticleSystem
+from text_cache import TextCache
 from pathlib import Path
 
-WIDTH, HEIGHT = 1024, 640
-GROUND_Y = HEIGHT - 120
-PLATFORM_LEFT = 100
-PLATFORM_RIGHT = 924  # width - 100
-
-
-class Projectile:
-    """Fireball projectile for Player 1"""
-    def __init__(self, x, y, direction):
-        self.x = x
-        self.y = y
-        self.direction = direction  # 1 for right, -1 for left
-        self.speed = 450
-        self.radius = 12
-        self.active = True
-        self.damage = 20
-        
-    def update(self, dt):
-        self.x += self.speed * self.direction * dt
-        # deactivate if off-screen
-        if self.x < -50 or self.x > WIDTH + 50:
-            self.active = False
-    
-    def draw(self, screen):
-        # draw fireball as orange/red gradient circle
-        cx, cy = int(self.x), int(self.y)
-        pygame.draw.circle(screen, (255, 150, 0), (cx, cy), self.radius)
-        pygame.draw.circle(screen, (255, 220, 0), (cx, cy), self.radius - 4)
-        pygame.draw.circle(screen, (255, 255, 200), (cx, cy), self.radius - 8)
-    
-    def get_rect(self):
-        return pygame.Rect(self.x - self.radius, self.y - self.radius, 
-                          self.radius * 2, self.radius * 2)
-
-
-class HitSpark:
-    """Visual effect for hit impacts"""
-    def __init__(self, x, y, combo=1):
-        self.x = x
-        self.y = y
-        self.life = 0.15  # Duration
-        self.combo = combo
-        self.size = 8 + (combo * 2)  # Bigger sparks for combos
-        
-    def update(self, dt):
-        self.life -= dt
-        
-    def draw(self, screen):
-        if self.life > 0:
-            alpha = int(255 * (self.life / 0.15))
-            size = int(self.size * (1 + (1 - self.life / 0.15)))
-            # Draw expanding star burst
-            cx, cy = int(self.x), int(self.y)
-            colors = [(255, 255, 100), (255, 200, 50), (255, 100, 0)]
-            for i, color in enumerate(colors):
-                s = size - i * 3
-                # Draw star points
-                pygame.draw.circle(screen, color, (cx, cy), s)
-                for angle in range(0, 360, 45):
-                    import math
-                    rad = math.radians(angle)
-                    ex = cx + int(math.cos(rad) * s * 1.5)
-                    ey = cy + int(math.sin(rad) * s * 1.5)
-                    pygame.draw.line(screen, color, (cx, cy), (ex, ey), 3)
-
-
-class Game:
-    def __init__(self):
+import numpy as np
+
+PARTICLE_CAPACITY = 16384
+LANDING_SPEED = 200  # fall speed (px/s) that kicks up dust on landing
+TRAIL_PER_PROJECTILE = 2
+TICK_RATE = 60  # default simulation steps per second
+MAX_STEPS_PER_FRAME = 8  # spiral-of-death cap: simulation time beyond this is dropped
+
+def draw_stage(surface, background=None, dx=0, dy=0):
+    """Background image, or the fallback stage shapes, offset by (dx, dy)"""
+    if background:
+        # strips uncovered by the shifted background stay black
+        if dx:
+            surface.fill((0, 0, 0), (0 if dx > 0 else WIDTH + dx, 0, abs(dx), HEIGHT))
+        if dy:
+            surface.fill((0, 0, 0), (0, 0 if dy > 0 else HEIGHT + dy, WIDTH, abs(dy)))
+        surface.blit(background, (dx, dy))
+        return
+    surface.fill((45, 45, 70))
+    # ground fallback
+    pygame.draw.rect(surface, (30, 200, 30), (dx, GROUND_Y + 50 + dy, WIDTH, HEIGHT - (GROUND_Y + 50)))
+    # simple 2D shapes (challenge visual flavor)
+    pygame.draw.circle(surface, (90, 90, 140), (WIDTH // 2 + dx, GROUND_Y + 70 + dy), 30)
+    pygame.draw.rect(surface, (120, 80, 160), (WIDTH - 120 + dx, GROUND_Y + 60 + dy, 60, 30))
+
+
+class Game(Match):
+    def __init__(self, input_provider=None, p2_input_provider=None):
         # init audio first
         try:
             pygame.mixer.pre_init(22050, -16, 2, 512)
@@ -90,46 +53,47 @@ class Game:
             except Exception:
                 pass
         
-        self.player = Fighter(150, GROUND_Y, is_ai=False, controls={
-            "left": pygame.K_a,
-            "right": pygame.K_d,
-            "punch": pygame.K_j,
-            "kick": pygame.K_k,
-            "jump": pygame.K_w,
-            "fireball": pygame.K_l,
-        })
-        self.ai = Fighter(WIDTH - 174, GROUND_Y, is_ai=True, variant="frog")
-        # set player-specific sprite path
-        base = Path(__file__).resolve().parents[1]
-        p1 = base / 'assets' / 'player1.png'
-        p2 = base / 'assets' / 'player2.png'
-        if p1.exists():
-            self.player.sprite_path = str(p1)
-            # reload sprites now that path is set
-            try:
-                self.player._load_sprite()
-            except Exception:
-                pass
-        if p2.exists():
-            self.ai.sprite_path = str(p2)
-            try:
-                self.ai._load_sprite()
-            except Exception:
-                pass
-        # HUD/fonts and round state
-        self.small_font = pygame.font.Font(None, 24)
-        self.font = pygame.font.Font(None, 36)
-        self.game_over = False
-        self.paused = False
-        self.timer = 60.0
-        self.score_p1 = 0
-        self.score_ai = 0
+        if input_provider is None:
+            input_provider = lambda match: pygame.key.get_pressed()
+        Match.__init__(self, input_provider, p2_input_provider)
+        self.recorder = None  # optional replay.ReplayRecorder
+        # fixed-step loop (see advance): the simulation always steps by 1/tick_rate,
+        # rendering runs at up to `fps` and interpolates between the last two steps
+        self.tick_rate = TICK_RATE
+        self.fps = 60  # render frame cap, 0 for uncapped
+        self.max_steps = MAX_STEPS_PER_FRAME
+        self.accumulator = 0.0
+        self.alpha = 1.0  # how far rendering is between the previous and current step
+        self.sim_ticks = 0
+        self.render_frames = 0
+        self.dropped_time = 0.0  # seconds of simulation skipped by the step cap
+        self._prev_positions = None  # fighter (x, y) before the last step
+        self.pipeline = None  # set by pipeline.PipelinedLoop while it runs the game
+        self.profiler = None  # perf_overlay.FrameProfiler while the F3 overlay is shown
+        # HUD text: cached text surfaces on shared fonts (see text_cache.py)
+        self.text = TextCache()
+        self._overlays = {}  # dimming overlays keyed by alpha
         self.running = True
-        self.projectiles = []
-        self.hit_sparks = []  # Visual hit effects
-        self.screen_shake = 0.0  # Screen shake intensity
-        self.combo_display_timer = 0.0
-        self.last_combo_count = 0
+        # frame layers, back to front; compositor.timings() reports the cost of each
+        self._stage = pygame.Surface((WIDTH, HEIGHT))  # pre-rendered background layer
+        draw_stage(self._stage, self.background)
+        self._shake = (0, 0)
+        self._feet = None  # bottom of each fighter as last drawn
+        # dust, projectile trails and hit debris (visual only, see particles.py)
+        self.particles = ParticleSystem(PARTICLE_CAPACITY)
+        self.hud_layer = CachedLayer((WIDTH, HEIGHT), self.draw_hud, self._hud_signature)
+        self.compositor = Compositor()
+        self.compositor.add('background', self._draw_background)
+        self.compositor.add('world', self._draw_world)
+        self.compositor.add('particles', self._draw_particles)
+        self.compositor.add('hud', self.hud_layer)
+        self.compositor.add('effects', self._draw_effects)
+        self.compositor.add('overlay', self.draw_overlays)
+        # dirty-rect mode: redraw and push only the regions that changed
+        self.dirty_rects = False
+        self._dirty_prev = None  # layer rects drawn last frame, None forces a full redraw
+        self._frozen = None  # state shown by the paused/game-over frame on screen
+        self.pixels_pushed = 0
 
         # audio assets: generate/load bgm and sfx
         base = Path(__file__).resolve().parents[1]
@@ -159,16 +123,47 @@ class Game:
 
     def run(self):
         while self.running:
-            dt = self.clock.tick(60) / 1000.0
+            frame_dt = self.clock.tick(self.fps) / 1000.0
             self.handle_events()
-            self.update(dt)
+            self.advance(frame_dt)
             self.draw()
+        if self.recorder:
+            self.recorder.finish()
+
+    def advance(self, frame_dt):
+        """Run the fixed steps that `frame_dt` seconds of wall time add up to.
+
+        Leftover time carries over to the next frame and sets `alpha` for
+        drawing. At most `max_steps` steps run per call; beyond that the
+        backlog is dropped (and counted in `dropped_time`) so a slow frame
+        can't snowball into ever longer catch-ups. Returns the steps run.
+        """
+        step = 1.0 / self.tick_rate
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= step:
+            if steps == self.max_steps:
+                self.dropped_time += self.accumulator - self.accumulator % step
+                self.accumulator %= step
+                break
+            self._prev_positions = (self.player.x, self.player.y, self.ai.x, self.ai.y)
+            if self.recorder:
+                self.recorder.update(step)
+            else:
+                self.update(step)
+            self.accumulator -= step
+            steps += 1
+        self.sim_ticks += steps
+        self.alpha = self.accumulator / step
+        return steps
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.toggle_profiler()
                 if event.key == pygame.K_ESCAPE and not self.game_over:
                     self.paused = not self.paused
                     try:
@@ -185,133 +180,54 @@ class Game:
     def update(self, dt):
         if self.game_over or self.paused:
             return
+        falling = (self.player.vy, self.ai.vy)
+        Match.update(self, dt)
+        if not self.resimulating:
+            self.update_effects(falling, dt)
 
-        # update challenge timer
-        self.timer = max(0.0, self.timer - dt)
-        
-        # Update visual effects
-        for spark in self.hit_sparks[:]:
-            spark.update(dt)
-            if spark.life <= 0:
-                self.hit_sparks.remove(spark)
-        
-        # Decay screen shake
-        if self.screen_shake > 0:
-            self.screen_shake = max(0, self.screen_shake - dt * 30)
-        
-        # Decay combo display
-        if self.combo_display_timer > 0:
-            self.combo_display_timer -= dt
+    def update_effects(self, falling, dt):
+        """Emit landing dust and projectile trails, then advance the particles.
 
-        keys = pygame.key.get_pressed()
-        self.player.handle_input(keys)
-        
-        # check for fireball shooting (player only)
-        if getattr(self.player, 'shoot_fireball', False):
-            self.player.shoot_fireball = False
-            direction = -1 if self.player.facing_left else 1
-            proj_x = self.player.rect.centerx + (40 * direction)
-            proj_y = self.player.rect.centery - 20
-            self.projectiles.append(Projectile(proj_x, proj_y, direction))
-            if self.sfx_fireball:
-                self.sfx_fireball.play()
-        
-        self.player.update(dt, WIDTH, PLATFORM_LEFT, PLATFORM_RIGHT)
-        self.ai.ai_update(self.player, dt)
-        self.ai.update(dt, WIDTH, PLATFORM_LEFT, PLATFORM_RIGHT)
-        
-        # update projectiles
-        for proj in self.projectiles[:]:
-            proj.update(dt)
-            if not proj.active:
-                self.projectiles.remove(proj)
-            # check collision with AI
-            elif proj.get_rect().colliderect(self.ai.rect) and getattr(self.ai, 'hit_cooldown', 0) <= 0:
-                self.ai.take_damage(proj.damage)
-                self.ai.vy = -320  # Much stronger upward knock
-                kb_dir = 1 if proj.direction > 0 else -1
-                self.ai.x += kb_dir * 280 * dt * 15  # Much stronger pushback
-                self.ai.vx = kb_dir * 500  # Much stronger momentum
-                self.ai.hit_cooldown = 0.5
-                self.score_p1 += proj.damage
-                proj.active = False
-                self.projectiles.remove(proj)
-
-        # play SFX on attack start
-        for f in (self.player, self.ai):
-            if getattr(f, 'just_started_attack', False):
-                atype = getattr(f, 'attack_type', 'punch')
-                if getattr(f, 'variant', 'human') == 'frog' and getattr(self, 'sfx_frog', None):
-                    self.sfx_frog.play()
-                else:
-                    if atype == 'kick':
-                        if getattr(self, 'sfx_kick', None):
-                            self.sfx_kick.play()
-                    else:
-                        if getattr(self, 'sfx_punch', None):
-                            self.sfx_punch.play()
-                f.just_started_attack = False
-
-        # simple combat: check attack rectangles with active windows
-        for attacker, defender in ((self.player, self.ai), (self.ai, self.player)):
-            if attacker.is_attacking:
-                # determine active portion of attack - wider window (60%) to catch extended animations
-                # Hits register during extension phase (frames 1-2 of 4-frame animation)
-                t = attacker.attack_timer
-                total = attacker.attack_duration if attacker.attack_duration > 0 else 0.001
-                active = (t < total * 0.80) and (t > total * 0.20)
-                if active:
-                    ar = attacker.attack_rect()
-                    if ar.colliderect(defender.rect) and getattr(defender, 'hit_cooldown', 0) <= 0:
-                        # apply damage and enhanced knockback
-                        dmg = 15 if getattr(attacker, 'attack_type', 'punch') == 'kick' else 10
-                        defender.take_damage(dmg)
-                        
-                        # Add hit spark effect
-                        spark_x = (ar.centerx + defender.rect.centerx) // 2
-                        spark_y = (ar.centery + defender.rect.centery) // 2
-                        combo = getattr(attacker, 'combo_count', 1)
-                        self.hit_sparks.append(HitSpark(spark_x, spark_y, combo))
-                        
-                        # Screen shake based on combo
-                        self.screen_shake = min(8.0, 3.0 + combo * 1.5)
-                        
-                        # Update combo display
-                        if combo > 1:
-                            self.combo_display_timer = 1.5
-                            self.last_combo_count = combo
-                        # Enhanced knockback - AI gets pushed back much more by Player 1
-                        if attacker is self.player:  # Player 1 attacking AI
-                            kb_x = 500 if getattr(attacker, 'attack_type', 'kick') == 'kick' else 350
-                            momentum = 450 if getattr(attacker, 'attack_type', 'kick') == 'kick' else 350
-                            vy_knock = -280
-                        else:  # AI attacking Player 1 - normal knockback
-                            kb_x = 350 if getattr(attacker, 'attack_type', 'kick') == 'kick' else 250
-                            momentum = 300
-                            vy_knock = -220
-                        
-                        if attacker.rect.centerx < defender.rect.centerx:
-                            defender.x += kb_x * dt * 15  # Visible pushback
-                            defender.vx = momentum  # Add momentum
-                        else:
-                            defender.x -= kb_x * dt * 15
-                            defender.vx = -momentum
-                        defender.vy = vy_knock  # Pop-up
-                        defender.hit_cooldown = 0.5
-                        # scoring
-                        if attacker is self.player:
-                            self.score_p1 += dmg
-                        else:
-                            self.score_ai += dmg
-            # decrement hit cooldowns
-            if getattr(defender, 'hit_cooldown', 0) > 0:
-                defender.hit_cooldown -= dt
-                if defender.hit_cooldown < 0:
-                    defender.hit_cooldown = 0
+        `falling` is each fighter's vy before the `dt` of simulation that led
+        to the current state.
+        """
+        particles = self.particles
+        for i, (fighter, vy) in enumerate(zip((self.player, self.ai), falling)):
+            if vy > LANDING_SPEED and fighter.vy == 0 and fighter.on_ground():
+                # dust kicked up both ways along the ground
+                feet = self._feet[i] if self._feet else fighter.rect.bottom
+                particles.emit(int(vy / 20), fighter.rect.centerx, feet - 2,
+                               speed=(40, 160), angle=(190, 350), life=(0.25, 0.6),
+                               color=(170, 150, 110), color_jitter=0.3, gravity=500, spread=12)
+        if self.projectiles:
+            xs = np.repeat([proj.x for proj in self.projectiles], TRAIL_PER_PROJECTILE)
+            ys = np.repeat([proj.y for proj in self.projectiles], TRAIL_PER_PROJECTILE)
+            particles.emit(len(xs), xs, ys, speed=(10, 50), life=(0.15, 0.35),
+                           color=(255, 150, 40), color_jitter=0.4, gravity=-120, spread=6)
+        particles.update(dt)
 
-        # win/loss conditions
-        if self.player.health <= 0 or self.ai.health <= 0 or self.timer <= 0:
-            self.game_over = True
+    def on_hit(self, x, y, combo):
+        if self.resimulating:
+            return
+        self.particles.emit(20 + 15 * min(combo, 5), x, y, speed=(120, 420), life=(0.3, 0.7),
+                            color=(255, 230, 160), color_jitter=0.5, gravity=900)
+
+    def toggle_profiler(self):
+        """Show or hide the frame-time overlay (profiling costs nothing while hidden)"""
+        if self.profiler:
+            self.profiler.detach()
+            self.profiler = None
+        else:
+            from perf_overlay import FrameProfiler
+            self.profiler = FrameProfiler()
+            self.profiler.attach(self)
+
+    def play_sfx(self, name):
+        if self.resimulating:
+            return
+        sound = getattr(self, 'sfx_' + name, None)
+        if sound:
+            sound.play()
 
     def _ensure_audio_assets(self):
         # simple WAV synthesis for bgm and sfx without external deps
@@ -413,106 +329,194 @@ class Game:
             print(f"Generated SF2-style fighting music: {self.bgm_path}")
 
     def draw(self):
+        self.render_frames += 1
+        shaking = abs(self.screen_shake) > 0.1
+        overlay = self.game_over or self.paused
+        if not overlay:
+            self._frozen = None  # an overlay shown again later must be composed afresh
+        if self.dirty_rects and self._dirty_prev is not None and not (shaking or overlay):
+            self._draw_dirty()
+            return
+        if overlay:
+            # the match is frozen while paused or over: the composed frame only
+            # changes when these do, so it stays on screen until then
+            frozen = (self.frame, self.paused, self.game_over, self.player.health, self.ai.health)
+            if frozen == self._frozen:
+                self.pixels_pushed = WIDTH * HEIGHT
+                pygame.display.flip()
+                return
+            self._frozen = frozen
         # Apply screen shake
         import random
         shake_x = int(random.uniform(-self.screen_shake, self.screen_shake))
         shake_y = int(random.uniform(-self.screen_shake, self.screen_shake))
         
-        # Draw background instead of solid fill
-        if self.background:
-            self.screen.blit(self.background, (shake_x, shake_y))
-        else:
-            self.screen.fill((45, 45, 70))
-            # ground fallback
-            pygame.draw.rect(self.screen, (30, 200, 30), (shake_x, GROUND_Y + 50 + shake_y, WIDTH, HEIGHT - (GROUND_Y + 50)))
-            # simple 2D shapes (challenge visual flavor)
-            pygame.draw.circle(self.screen, (90, 90, 140), (WIDTH // 2 + shake_x, GROUND_Y + 70 + shake_y), 30)
-            pygame.draw.rect(self.screen, (120, 80, 160), (WIDTH - 120 + shake_x, GROUND_Y + 60 + shake_y, 60, 30))
-
-        # Create temporary surface for shake effect
-        if abs(self.screen_shake) > 0.1:
-            temp_surface = pygame.Surface((WIDTH, HEIGHT))
-            temp_surface.fill((0, 0, 0))
-            if self.background:
-                temp_surface.blit(self.background, (0, 0))
-            
-            # Draw fighters on temp surface
-            fighter_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            self.player.draw(fighter_surface)
-            self.ai.draw(fighter_surface)
-            temp_surface.blit(fighter_surface, (0, 0))
-            
-            # Draw temp surface with shake offset
-            self.screen.blit(temp_surface, (shake_x, shake_y))
+        self._shake = (shake_x, shake_y)
+        drawn = self.compositor.render(self.screen)
+        # a shaken or dimmed screen can't be patched; the next frame redraws fully too
+        self._dirty_prev = None if shaking or overlay else drawn
+        self.pixels_pushed = WIDTH * HEIGHT
+        pygame.display.flip()
+
+    def _draw_background(self, target):
+        # the stage and fighters shake by drawing at the camera offset
+        draw_stage(target, self._stage, *self._shake)
+        return [target.get_rect()]
+
+    def _lerp_offset(self, fighter, prev_x, prev_y):
+        """Offset from `fighter.rect` to its position interpolated by `alpha`"""
+        alpha = self.alpha
+        return (int(prev_x + (fighter.x - prev_x) * alpha) - fighter.rect.x,
+                int(prev_y + (fighter.y - prev_y) * alpha) - fighter.rect.y)
+
+    def _draw_world(self, target):
+        """Fighters and projectiles, interpolated between the last two steps"""
+        dx, dy = self._shake
+        alpha = self.alpha
+        prev = self._prev_positions
+        if alpha < 1.0 and prev:
+            px, py = self._lerp_offset(self.player, prev[0], prev[1])
+            ax, ay = self._lerp_offset(self.ai, prev[2], prev[3])
         else:
-            self.player.draw(self.screen)
-            self.ai.draw(self.screen)
-        
-        # Draw projectiles
+            alpha = 1.0
+            px = py = ax = ay = 0
+        rects = [self.player.draw(target, dx + px, dy + py), self.ai.draw(target, dx + ax, dy + ay)]
+        # sprite frames carry transparent padding: dust rises from the drawn feet
+        self._feet = (rects[0].bottom - dy - py, rects[1].bottom - dy - ay)
         for proj in self.projectiles:
-            proj.draw(self.screen)
+            rects.append(proj.draw(target, alpha))
+        return rects
+
+    def _draw_particles(self, target):
+        """Dust, trails and debris"""
+        return self.particles.draw(target)
+
+    def _draw_effects(self, target):
+        """Hit sparks (drawn over the HUD)"""
+        rects = []
+        for spark in self.hit_sparks:
+            rect = spark.draw(target)
+            if rect:
+                rects.append(rect)
+        return rects
 
+    def _hud_signature(self):
+        # everything the HUD text and bars are drawn from
+        return (int(self.timer), self.score_p1, self.score_ai, self.player.health, self.ai.health)
+
+    def _draw_dirty(self):
+        """Erase last frame's elements from the stage copy, redraw, push only changed regions.
+
+        The HUD layer is recomposited every frame (the erase may cut into it) but
+        only pushed when it was rebuilt; elsewhere the display already shows the
+        same pixels.
+        """
+        screen = self.screen
+        stage = self._stage
+        prev = self._dirty_prev
+        for name, rects in prev.items():
+            if name != 'background':
+                for rect in rects:
+                    screen.blit(stage, rect, rect)
+        self._shake = (0, 0)
+        hud_changed = self.hud_layer.refresh()
+        drawn = self.compositor.render(screen, skip=('background',))
+        self._dirty_prev = drawn
+        dirty = []
+        for name in drawn:
+            if name != 'hud':
+                dirty += prev[name]
+                dirty += drawn[name]
+        if hud_changed:
+            dirty += prev['hud']
+            dirty += drawn['hud']
+        self.pixels_pushed = sum(rect.width * rect.height for rect in dirty)
+        pygame.display.update(dirty)
+
+    def _overlay(self, alpha):
+        overlay = self._overlays.get(alpha)
+        if overlay is None:
+            overlay = pygame.Surface((WIDTH, HEIGHT))
+            overlay.set_alpha(alpha)
+            overlay.fill((0, 0, 0))
+            self._overlays[alpha] = overlay
+        return overlay
+
+    def draw_hud(self, surface=None):
+        """Health bars, names, timer, score and instructions; returns the drawn rects.
+
+        Normally drawn once per change into the cached HUD layer.
+        """
+        if surface is None:
+            surface = self.screen
+        text = self.text
+        rects = []
+        add = rects.append
         # SF2-style HUD with health bars
         # P1 health bar (left side)
         bar_w = 150
         bar_h = 20
         p1_x, p1_y = 20, 20
-        pygame.draw.rect(self.screen, (0, 0, 0), (p1_x, p1_y, bar_w + 4, bar_h + 4))  # black outline
-        pygame.draw.rect(self.screen, (50, 50, 50), (p1_x + 2, p1_y + 2, bar_w, bar_h))  # bg
+        add(pygame.draw.rect(surface, (0, 0, 0), (p1_x, p1_y, bar_w + 4, bar_h + 4)))  # black outline
+        add(pygame.draw.rect(surface, (50, 50, 50), (p1_x + 2, p1_y + 2, bar_w, bar_h)))  # bg
         health_w = int((self.player.health / 100.0) * bar_w)
-        pygame.draw.rect(self.screen, (0, 255, 0), (p1_x + 2, p1_y + 2, health_w, bar_h))  # health
+        add(pygame.draw.rect(surface, (0, 255, 0), (p1_x + 2, p1_y + 2, health_w, bar_h)))  # health
         
         # P1 name
-        p1_name = self.small_font.render("MARTIAL ARTIST", True, (255, 255, 200))
-        self.screen.blit(p1_name, (p1_x, p1_y - 20))
+        p1_name = text.render(24, "MARTIAL ARTIST", (255, 255, 200))
+        add(surface.blit(p1_name, (p1_x, p1_y - 20)))
         
         # AI health bar (right side)
         ai_x = WIDTH - bar_w - 20
-        pygame.draw.rect(self.screen, (0, 0, 0), (ai_x - 2, p1_y, bar_w + 4, bar_h + 4))  # black outline
-        pygame.draw.rect(self.screen, (50, 50, 50), (ai_x, p1_y + 2, bar_w, bar_h))  # bg
+        add(pygame.draw.rect(surface, (0, 0, 0), (ai_x - 2, p1_y, bar_w + 4, bar_h + 4)))  # black outline
+        add(pygame.draw.rect(surface, (50, 50, 50), (ai_x, p1_y + 2, bar_w, bar_h)))  # bg
         ai_health_w = int((self.ai.health / 100.0) * bar_w)
-        pygame.draw.rect(self.screen, (255, 0, 0), (ai_x, p1_y + 2, ai_health_w, bar_h))  # health
+        add(pygame.draw.rect(surface, (255, 0, 0), (ai_x, p1_y + 2, ai_health_w, bar_h)))  # health
         
         # AI name
-        ai_name = self.small_font.render("FROG WARRIOR", True, (255, 100, 100))
+        ai_name = text.render(24, "FROG WARRIOR", (255, 100, 100))
         ai_name_rect = ai_name.get_rect(topright=(WIDTH - p1_x, p1_y - 20))
-        self.screen.blit(ai_name, ai_name_rect)
+        add(surface.blit(ai_name, ai_name_rect))
         
         # Round timer - center top
-        timer_text = self.font.render(f"ROUND 1 - {max(0, int(self.timer))}s", True, (255, 255, 0))
+        # cached per string, so this only renders when the whole seconds change
+        timer_text = text.render(36, f"ROUND 1 - {max(0, int(self.timer))}s", (255, 255, 0))
         timer_rect = timer_text.get_rect(midtop=(WIDTH // 2, 20))
-        self.screen.blit(timer_text, timer_rect)
+        add(surface.blit(timer_text, timer_rect))
 
         # Score display - lower HUD
-        score_text = self.small_font.render(f"P1 Score: {self.score_p1}  |  AI Score: {self.score_ai}", True, (200, 200, 255))
+        score_text = text.render(24, f"P1 Score: {self.score_p1}  |  AI Score: {self.score_ai}", (200, 200, 255))
         score_rect = score_text.get_rect(midbottom=(WIDTH // 2, HEIGHT - 10))
-        self.screen.blit(score_text, score_rect)
+        add(surface.blit(score_text, score_rect))
 
         # On-screen instructions (subtle)
-        instr1 = self.small_font.render("A/D: Move  W: Jump  J: Punch  K: Kick  L: Fireball", True, (150, 150, 150))
-        self.screen.blit(instr1, (20, HEIGHT - 30))
-        
-        # Draw hit sparks
-        for spark in self.hit_sparks:
-            spark.draw(self.screen)
-        
+        instr1 = text.render(24, "A/D: Move  W: Jump  J: Punch  K: Kick  L: Fireball", (150, 150, 150))
+        add(surface.blit(instr1, (20, HEIGHT - 30)))
+        return rects
+
+    def draw_overlays(self, surface=None):
+        """Combo counter, game-over banner and pause screen; returns the drawn rects"""
+        if surface is None:
+            surface = self.screen
+        text = self.text
+        rects = []
+        add = rects.append
         # Draw combo counter
         if self.combo_display_timer > 0 and self.last_combo_count > 1:
             combo_text = f"{self.last_combo_count} HIT COMBO!"
             combo_size = 48 + min(24, self.last_combo_count * 4)
-            combo_font = pygame.font.Font(None, combo_size)
             alpha = int(255 * min(1.0, self.combo_display_timer / 0.5))
             
             # Pulsing effect
             pulse = 1.0 + (0.2 * abs((self.combo_display_timer % 0.3) - 0.15) / 0.15)
             
-            combo_surf = combo_font.render(combo_text, True, (255, 255, 0))
-            combo_surf.set_alpha(alpha)
-            # Scale for pulse
+            combo_surf = text.render(combo_size, combo_text, (255, 255, 0))
+            # Scale for pulse (a new surface, so the cached text keeps full alpha)
             w, h = combo_surf.get_size()
             scaled = pygame.transform.scale(combo_surf, (int(w * pulse), int(h * pulse)))
+            scaled.set_alpha(alpha)
             combo_rect = scaled.get_rect(center=(WIDTH // 2, HEIGHT // 3))
-            self.screen.blit(scaled, combo_rect)
+            add(surface.blit(scaled, combo_rect))
 
         # Game over banner
         if self.game_over:
@@ -528,61 +532,37 @@ class Game:
                 result_col = (255, 255, 0)
             
             # Draw semi-transparent overlay
-            overlay = pygame.Surface((WIDTH, HEIGHT))
-            overlay.set_alpha(100)
-            overlay.fill((0, 0, 0))
-            self.screen.blit(overlay, (0, 0))
-            
-            over = pygame.font.Font(None, 72).render(result, True, result_col)
+            add(surface.blit(self._overlay(100), (0, 0)))
+
+            over = text.render(72, result, result_col)
             rect = over.get_rect(center=(WIDTH//2, HEIGHT//2 - 100))
-            self.screen.blit(over, rect)
+            add(surface.blit(over, rect))
             
-            restart_text = self.small_font.render("Press ENTER or R to restart", True, (200, 200, 200))
+            restart_text = text.render(24, "Press ENTER or R to restart", (200, 200, 200))
             restart_rect = restart_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 40))
-            self.screen.blit(restart_text, restart_rect)
+            add(surface.blit(restart_text, restart_rect))
         
         # Draw pause overlay
         if self.paused and not self.game_over:
-            overlay = pygame.Surface((WIDTH, HEIGHT))
-            overlay.set_alpha(120)
-            overlay.fill((0, 0, 0))
-            self.screen.blit(overlay, (0, 0))
-            
-            pause_text = pygame.font.Font(None, 96).render("PAUSED", True, (255, 255, 100))
+            add(surface.blit(self._overlay(120), (0, 0)))
+
+            pause_text = text.render(96, "PAUSED", (255, 255, 100))
             pause_rect = pause_text.get_rect(center=(WIDTH//2, HEIGHT//2 - 50))
-            self.screen.blit(pause_text, pause_rect)
+            add(surface.blit(pause_text, pause_rect))
             
-            resume_text = self.font.render("Press ESC to resume", True, (220, 220, 220))
+            resume_text = text.render(36, "Press ESC to resume", (220, 220, 220))
             resume_rect = resume_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 40))
-            self.screen.blit(resume_text, resume_rect)
-
-        pygame.display.flip()
+            add(surface.blit(resume_text, resume_rect))
+        return rects
 
     def reset_round(self):
-        # reset health, positions, timer, scores remain to show cumulative performance
-        self.player.health = 200
-        self.ai.health = 200
-        self.player.x = 150
-        self.player.y = GROUND_Y - self.player.HEIGHT
-        self.ai.x = WIDTH - 174
-        self.projectiles = []
-        self.ai.y = GROUND_Y - self.ai.HEIGHT
-        self.player.vx = 0
-        self.player.vy = 0
-        self.ai.vx = 0
-        self.ai.vy = 0
-        self.player.rect.x = int(self.player.x)
-        self.player.rect.y = int(self.player.y)
-        self.ai.rect.x = int(self.ai.x)
-        self.ai.rect.y = int(self.ai.y)
-        self.timer = 60.0
-        self.game_over = False
-        self.paused = False
-        try:
-            pygame.mixer.music.unpause()
-        except Exception:
-            pass
-        self.paused = False
+        Match.reset_round(self)
+        if self.pipeline:
+            self.pipeline.reset_round()
+        self.particles.clear()
+        self._prev_positions = None  # fighters jumped back to their start positions
+        if self.recorder:
+            self.recorder.next_round()
         try:
             pygame.mixer.music.unpause()
         except Exception:
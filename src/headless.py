@@ -0,0 +1,128 @@
+"""Run matches without a window, audio or the pygame event loop.
+
+Usage:
+    from headless import init_headless, HeadlessRunner
+    init_headless()
+    result = HeadlessRunner(random_inputs(seed=1)).run()
+"""
+import os
+import random
+
+import pygame
+
+from match import Match, PLAYER_CONTROLS, CONTROL_BITS
+
+FIXED_DT = 1.0 / 60.0
+
+
+def init_headless():
+    """Initialise pygame against the SDL dummy drivers.
+
+    A 1x1 display mode is still set so `Fighter._load_sprite` can
+    `convert_alpha()` and fighters get the same hitbox sizes as in the game.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+class KeyState:
+    """Minimal stand-in for `pygame.key.get_pressed()` built from a set of keys"""
+    __slots__ = ('pressed',)
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+NO_KEYS = KeyState()
+
+
+def keys_from_mask(mask, controls=PLAYER_CONTROLS):
+    """Build a key state from a `CONTROL_BITS` bitmask."""
+    return KeyState(controls[name] for name, bit in CONTROL_BITS.items() if mask & bit)
+
+
+def mask_from_keys(keys, controls=PLAYER_CONTROLS):
+    """Pack a key state into a `CONTROL_BITS` bitmask."""
+    mask = 0
+    for name, bit in CONTROL_BITS.items():
+        key = controls.get(name)
+        if key is not None and keys[key]:
+            mask |= bit
+    return mask
+
+
+# prebuilt key states for every bitmask (player key bindings)
+MASK_KEYS = [keys_from_mask(m) for m in range(1 << len(CONTROL_BITS))]
+
+
+def mask_inputs(masks):
+    """Input provider that replays one control bitmask per frame, then idles."""
+    def provider(match):
+        i = match.frame - 1
+        return MASK_KEYS[masks[i]] if i < len(masks) else NO_KEYS
+
+    return provider
+
+
+def idle_inputs(match):
+    return NO_KEYS
+
+
+def random_inputs(seed=None, hold_frames=8):
+    """Input provider that mashes random player controls, holding each choice a few frames."""
+    rng = random.Random(seed)
+    state = {'keys': NO_KEYS, 'left': 0}
+
+    def provider(match):
+        if state['left'] <= 0:
+            controls = list(match.player.controls.values())
+            state['keys'] = KeyState(k for k in controls if rng.random() < 0.3)
+            state['left'] = hold_frames
+        state['left'] -= 1
+        return state['keys']
+
+    return provider
+
+
+class HeadlessRunner:
+    """Steps a `Match` at a fixed dt as fast as the CPU allows."""
+    def __init__(self, input_provider=None, dt=FIXED_DT, match=None):
+        init_headless()
+        self.dt = dt
+        self.match = match or Match(input_provider=input_provider or idle_inputs)
+        if match is not None and input_provider is not None:
+            self.match.input_provider = input_provider
+
+    def step(self):
+        self.match.update(self.dt)
+
+    def run(self, max_frames=None):
+        match = self.match
+        dt = self.dt
+        while not match.game_over and (max_frames is None or match.frame < max_frames):
+            match.update(dt)
+        return self.result()
+
+    def result(self):
+        m = self.match
+        if m.player.health > m.ai.health:
+            winner = 'p1'
+        elif m.ai.health > m.player.health:
+            winner = 'ai'
+        else:
+            winner = 'draw'
+        return {
+            'frames': m.frame,
+            'winner': winner,
+            'p1_health': m.player.health,
+            'ai_health': m.ai.health,
+            'score_p1': m.score_p1,
+            'score_ai': m.score_ai,
+        }
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -8,27 +9,135 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(project_root))
 
-# If player sprites aren't present, generate two original archetype sprites
-p1 = project_root / 'assets' / 'player1.png'
-p2 = project_root / 'assets' / 'player2.png'
-if not p1.exists() or not p2.exists():
-    try:
-        from scripts.generate_sprite import generate_pair
-
-        print('Generating archetype sprites at', p1, 'and', p2)
-        generate_pair(str(p1), str(p2))
-    except Exception as e:
-        print('Could not generate archetype sprites:', e)
-
 import pygame
 from game import Game
+from match import Match
+
+
+def ensure_sprites():
+    """If player sprites aren't present, generate two original archetype sprites"""
+    p1 = project_root / 'assets' / 'player1.png'
+    p2 = project_root / 'assets' / 'player2.png'
+    if not p1.exists() or not p2.exists():
+        try:
+            from scripts.generate_sprite import generate_pair
+
+            print('Generating archetype sprites at', p1, 'and', p2)
+            generate_pair(str(p1), str(p2))
+        except Exception as e:
+            print('Could not generate archetype sprites:', e)
+
+
+def play_replay(path, render=True):
+    from replay import Replay
+    replay = Replay.load(path)
+    if not render:
+        from headless import HeadlessRunner
+        match = replay.create_match(Match)
+        replay.play(match)
+        print(HeadlessRunner(match=match).result())
+        return
+    game = replay.create_match(Game)
+
+    def on_frame(match):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        game.draw()
+
+    replay.play(game, on_frame)
+    print(f'Replayed {game.frame} frames: P1 {game.player.health} HP, AI {game.ai.health} HP, '
+          f'score {game.score_p1}-{game.score_ai}')
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Mini 2D Fighter')
+    parser.add_argument('--record', metavar='PATH', help='record each round to a replay file')
+    parser.add_argument('--replay', metavar='PATH', help='play back a replay file as fast as possible')
+    parser.add_argument('--no-render', action='store_true', help='with --replay: simulate only and print the result')
+    parser.add_argument('--stress', type=int, metavar='N', help='keep N projectiles in flight (broadphase stress test)')
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help='redraw and update only changed screen regions (full redraw while shaking)')
+    parser.add_argument('--tick-rate', type=int, default=60, metavar='HZ',
+                        help='fixed simulation steps per second (rendering interpolates between steps)')
+    parser.add_argument('--pipelined', type=int, nargs='?', const=3, choices=(2, 3), metavar='BUFFERS',
+                        help='simulate on a worker thread, handing frames over through 2 or 3 buffers (default 3)')
+    parser.add_argument('--fps', type=int, default=60, help='render frame cap, 0 for uncapped')
+    parser.add_argument('--perf', action='store_true', help='start with the frame-time overlay shown (F3 toggles)')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='record a Chrome trace-event JSON of the session (open in chrome://tracing or Perfetto)')
+    parser.add_argument('--layer-stats', action='store_true',
+                        help='print per-layer render times and loop stats on exit')
+    parser.add_argument('--ai', choices=('frog', 'search', 'table'), default='frog',
+                        help='frog opponent: built-in rules, lookahead search or learned policy table')
+    parser.add_argument('--ai-budget', type=float, default=4.0, metavar='MS',
+                        help='with --ai search: search time per decision in milliseconds')
+    args = parser.parse_args()
+    if args.pipelined and args.record:
+        parser.error('--record needs the serial loop (drop --pipelined)')
+    tracer = None
+    if args.trace:
+        from tracing import Tracer
+        tracer = Tracer(args.trace)
+        tracer.install()
+    try:
+        run(args, tracer)
+    finally:
+        if tracer:
+            tracer.close()
+            print(f'Wrote {tracer.written} trace events to {args.trace}')
+
+
+def run(args, tracer=None):
+    (tracer.span('generate sprites', ensure_sprites) if tracer else ensure_sprites)()
+    if args.replay and args.no_render:
+        from headless import init_headless
+        init_headless()
+        play_replay(args.replay, render=False)
+        return
     pygame.init()
-    game = Game()
     try:
-        game.run()
+        if args.replay:
+            play_replay(args.replay)
+            return
+        search_ai = None
+        if args.ai == 'search':
+            from search_ai import SearchAI
+            search_ai = SearchAI(budget_ms=args.ai_budget)
+        game = Game(p2_input_provider=search_ai)
+        if tracer:
+            tracer.watch(game)
+        if args.ai == 'table':
+            from ai_policy import DEFAULT_PATH, PolicyTable, attach
+            try:
+                attach(game.ai, PolicyTable.load(DEFAULT_PATH))
+            except (OSError, ValueError) as e:
+                print('Could not load policy table, using the built-in frog:', e)
+        game.dirty_rects = args.dirty_rects
+        game.tick_rate = args.tick_rate
+        game.fps = args.fps
+        if args.stress:
+            game.start_stress(args.stress)
+        if args.record:
+            from replay import ReplayRecorder
+            game.recorder = ReplayRecorder(game, path=args.record)
+        if args.perf:
+            game.toggle_profiler()
+        if args.pipelined:
+            from pipeline import PipelinedLoop
+            loop = PipelinedLoop(game, buffers=args.pipelined)
+            if tracer:
+                tracer.watch_update(loop.sim)
+            loop.run()
+        else:
+            game.run()
+        if args.layer_stats:
+            print(f'{game.sim_ticks} sim ticks at {game.tick_rate} Hz, {game.render_frames} frames rendered, '
+                  f'{game.dropped_time:.2f}s of simulation dropped')
+            print(game.compositor.format_timings())
+        if search_ai is not None:
+            print(f'Search AI: {search_ai.searches} searches, {search_ai.nodes_per_second:,.0f} nodes/s, '
+                  f'slowest {search_ai.max_search_ms:.2f} ms')
     finally:
         pygame.quit()
 
@@ -0,0 +1,591 @@
+import math
+import pygame
+import random
+import struct
+import zlib
+from array import array
+from fighter import Fighter, FIGHTER_STATE
+from operator import attrgetter
+from pathlib import Path
+from pool import Pool
+from spatial import SpatialHash
+
+WIDTH, HEIGHT = 1024, 640
+GROUND_Y = HEIGHT - 120
+PLATFORM_LEFT = 100
+PLATFORM_RIGHT = 924  # width - 100
+
+PLAYER_CONTROLS = {
+    "left": pygame.K_a,
+    "right": pygame.K_d,
+    "punch": pygame.K_j,
+    "kick": pygame.K_k,
+    "jump": pygame.K_w,
+    "fireball": pygame.K_l,
+}
+# one bit per player control, used for compact per-frame input masks
+CONTROL_BITS = {name: 1 << i for i, name in enumerate(PLAYER_CONTROLS)}
+
+# packed save state header (see Match.save_state): magic, version, frame,
+# timer, screen_shake, combo_display_timer, scores, last combo, game_over,
+# projectile count, spark count
+SAVE_MAGIC = b'MFSV'
+SAVE_VERSION = 2
+SAVE_HEADER = struct.Struct('<4sHI3d3i?HH')
+PROJECTILE_FIELDS = 6  # doubles per projectile in a save state (see Projectile.snapshot)
+
+# broadphase cell size; must be at least the largest projectile diameter
+PROJECTILE_CELL = 32
+# pool sizes; a fireball cooldown and 0.5s hit cooldowns keep normal play far below these
+PROJECTILE_CAPACITY = 32
+SPARK_CAPACITY = 32
+# hit pushback is an instant displacement tuned at 60 Hz; it uses this step
+# rather than the tick's dt so it is the same distance at every tick rate
+KNOCKBACK_DT = 1.0 / 60.0
+_is_active = attrgetter('active')
+
+# pre-rendered effect images: fireballs keyed by radius, spark bursts keyed by
+# base size (one frame per drawn size); values are (image, opaque bounds, centre)
+_FIREBALL_IMAGES = {}
+_SPARK_FRAMES = {}
+_SPARK_COLORS = ((255, 255, 100), (255, 200, 50), (255, 100, 0))
+_SPARK_DIRECTIONS = [(math.cos(math.radians(a)), math.sin(math.radians(a))) for a in range(0, 360, 45)]
+
+
+def _effect_image(reach, paint):
+    # black is the colour key; none of the effect colours are black
+    side = 2 * reach + 1
+    image = pygame.Surface((side, side))
+    paint(image, reach, reach)
+    image.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+    return image, image.get_bounding_rect(), reach
+
+
+def _paint_fireball(surface, cx, cy, radius):
+    # orange/red gradient circle
+    pygame.draw.circle(surface, (255, 150, 0), (cx, cy), radius)
+    pygame.draw.circle(surface, (255, 220, 0), (cx, cy), radius - 4)
+    pygame.draw.circle(surface, (255, 255, 200), (cx, cy), radius - 8)
+
+
+def _paint_spark(surface, cx, cy, size):
+    # expanding star burst
+    for i, color in enumerate(_SPARK_COLORS):
+        s = size - i * 3
+        pygame.draw.circle(surface, color, (cx, cy), s)
+        for cos, sin in _SPARK_DIRECTIONS:
+            ex = cx + int(cos * s * 1.5)
+            ey = cy + int(sin * s * 1.5)
+            pygame.draw.line(surface, color, (cx, cy), (ex, ey), 3)
+
+
+def _fireball_image(radius):
+    image = _FIREBALL_IMAGES.get(radius)
+    if image is None:
+        image = _FIREBALL_IMAGES[radius] = _effect_image(
+            radius + 1, lambda surface, cx, cy: _paint_fireball(surface, cx, cy, radius))
+    return image
+
+
+def _spark_frames(base):
+    """Frames for a spark of base size `base`: index = drawn size - base (base..2*base)"""
+    frames = _SPARK_FRAMES.get(base)
+    if frames is None:
+        frames = _SPARK_FRAMES[base] = [
+            _effect_image(int(size * 1.5) + 2, lambda surface, cx, cy, size=size: _paint_spark(surface, cx, cy, size))
+            for size in range(base, 2 * base + 1)]
+    return frames
+
+
+def _blit_effect(screen, effect, x, y):
+    image, bounds, centre = effect
+    return screen.blit(image, (x - centre + bounds.x, y - centre + bounds.y), bounds)
+
+
+class Projectile:
+    """Fireball projectile; `owner` 0 is Player 1 (the only shooter in normal play), 1 the frog"""
+    __slots__ = ('x', 'y', 'direction', 'speed', 'radius', 'active', 'damage', 'owner', 'prev_x')
+
+    def __init__(self, x=0.0, y=0.0, direction=1, owner=0, damage=20):
+        self.speed = 450
+        self.radius = 12
+        self.reset(x, y, direction, owner, damage)
+
+    def reset(self, x, y, direction, owner=0, damage=20):
+        """Re-initialise a pooled projectile"""
+        self.x = x
+        self.prev_x = x  # x before the last update, for interpolated drawing
+        self.y = y
+        self.direction = direction  # 1 for right, -1 for left
+        self.active = True
+        self.damage = damage
+        self.owner = owner
+
+    def update(self, dt):
+        self.prev_x = self.x
+        self.x += self.speed * self.direction * dt
+        # deactivate if off-screen
+        if self.x < -50 or self.x > WIDTH + 50:
+            self.active = False
+
+    def draw(self, screen, alpha=1.0):
+        # one blit of the pre-rendered fireball at `alpha` of the way from the
+        # previous to the current position; returns the covered Rect
+        x = self.x if alpha >= 1.0 else self.prev_x + (self.x - self.prev_x) * alpha
+        return _blit_effect(screen, _fireball_image(self.radius), int(x), int(self.y))
+
+    def get_rect(self):
+        return pygame.Rect(self.x - self.radius, self.y - self.radius,
+                          self.radius * 2, self.radius * 2)
+
+    def hits(self, rect):
+        """Same as `get_rect().colliderect(rect)` without allocating a Rect"""
+        size = self.radius * 2
+        left = int(self.x - self.radius)  # Rect truncates like int()
+        top = int(self.y - self.radius)
+        return left < rect.right and rect.left < left + size and top < rect.bottom and rect.top < top + size
+
+    def snapshot(self):
+        return (self.x, self.y, self.direction, self.active, self.owner, self.damage)
+
+    def restore(self, state):
+        x, y, direction, active, owner, damage = state
+        self.reset(x, y, direction, owner, damage)
+        self.active = active
+
+
+class HitSpark:
+    """Visual effect for hit impacts"""
+    __slots__ = ('x', 'y', 'life', 'combo', 'size')
+
+    def __init__(self, x=0, y=0, combo=1):
+        self.reset(x, y, combo)
+
+    def reset(self, x, y, combo=1):
+        """Re-initialise a pooled spark"""
+        self.x = x
+        self.y = y
+        self.life = 0.15  # Duration
+        self.combo = combo
+        self.size = 8 + (combo * 2)  # Bigger sparks for combos
+
+    def update(self, dt):
+        self.life -= dt
+
+    def snapshot(self):
+        return (self.x, self.y, self.life, self.combo)
+
+    def restore(self, state):
+        x, y, life, combo = state
+        self.reset(x, y, combo)
+        self.life = life
+
+    def draw(self, screen):
+        # one blit of the pre-rendered burst frame for the current size (which
+        # grows from self.size to twice that over the spark's life); returns
+        # the covered Rect, or None once it has expired
+        if self.life > 0:
+            size = int(self.size * (1 + (1 - self.life / 0.15)))
+            frames = _spark_frames(self.size)
+            return _blit_effect(screen, frames[min(size - self.size, len(frames) - 1)], int(self.x), int(self.y))
+
+
+class Match:
+    """Round state and combat rules, independent of window, audio and event loop.
+
+    `input_provider` is called once per update with the match and must return a
+    key-state object indexable by pygame key constants (like the result of
+    `pygame.key.get_pressed()`). Passing `p2_input_provider` hands the frog to a
+    second human (same key bindings, no fireball) instead of `ai_update`.
+    """
+    def __init__(self, input_provider=None, p2_input_provider=None):
+        self.input_provider = input_provider
+        self.p2_input_provider = p2_input_provider
+        self.player = Fighter(150, GROUND_Y, is_ai=False, controls=dict(PLAYER_CONTROLS))
+        self.ai = Fighter(WIDTH - 174, GROUND_Y, is_ai=True, variant="frog")
+        if p2_input_provider is not None:
+            self.ai.is_ai = False
+            self.ai.controls = {k: v for k, v in PLAYER_CONTROLS.items() if k != "fireball"}
+        # set player-specific sprite path
+        base = Path(__file__).resolve().parents[1]
+        p1 = base / 'assets' / 'player1.png'
+        p2 = base / 'assets' / 'player2.png'
+        if p1.exists():
+            self.player.sprite_path = str(p1)
+            # reload sprites now that path is set
+            try:
+                self.player._load_sprite()
+            except Exception:
+                pass
+        if p2.exists():
+            self.ai.sprite_path = str(p2)
+            try:
+                self.ai._load_sprite()
+            except Exception:
+                pass
+        # round state
+        self.game_over = False
+        self.paused = False
+        self.timer = 60.0
+        self.score_p1 = 0
+        self.score_ai = 0
+        self.frame = 0
+        self.resimulating = False  # set while rollback replays frames; suppresses sound
+        self.projectiles = Pool(Projectile, PROJECTILE_CAPACITY)
+        self._grids = (SpatialHash(PROJECTILE_CELL), SpatialHash(PROJECTILE_CELL))  # by owner
+        self.stress_projectiles = 0  # see start_stress
+        self._stress_rng = None
+        self.hit_sparks = Pool(HitSpark, SPARK_CAPACITY)  # Visual hit effects
+        self.screen_shake = 0.0  # Screen shake intensity
+        self.combo_display_timer = 0.0
+        self.last_combo_count = 0
+
+    def play_sfx(self, name):
+        # hook for sound effects ('punch', 'kick', 'frog', 'fireball'); silent by default
+        pass
+
+    def on_hit(self, x, y, combo):
+        # hook for purely visual impact effects at (x, y); nothing by default
+        pass
+
+    def update(self, dt):
+        if self.game_over or self.paused:
+            return
+        self.frame += 1
+
+        # update challenge timer
+        self.timer = max(0.0, self.timer - dt)
+
+        # Update visual effects
+        sparks = self.hit_sparks
+        items = sparks.items
+        i = 0
+        while i < sparks.count:
+            spark = items[i]
+            spark.update(dt)
+            if spark.life <= 0:
+                sparks.release(i)
+            else:
+                i += 1
+
+        # Decay screen shake
+        if self.screen_shake > 0:
+            self.screen_shake = max(0, self.screen_shake - dt * 30)
+
+        # Decay combo display
+        if self.combo_display_timer > 0:
+            self.combo_display_timer -= dt
+
+        if self.player.is_ai:
+            # AI-vs-AI: the player slot is driven by its own ai_update
+            self.player.ai_update(self.ai, dt, self.projectiles)
+        else:
+            keys = self.input_provider(self)
+            self.player.handle_input(keys)
+
+        # check for fireball shooting (player only)
+        if self.player.shoot_fireball:
+            self.player.shoot_fireball = False
+            direction = -1 if self.player.facing_left else 1
+            proj_x = self.player.rect.centerx + (40 * direction)
+            proj_y = self.player.rect.centery - 20
+            proj = self.projectiles.acquire()
+            if proj is not None:
+                proj.reset(proj_x, proj_y, direction)
+                self.play_sfx('fireball')
+        if self.stress_projectiles:
+            self._spawn_stress()
+
+        self.player.update(dt, WIDTH, PLATFORM_LEFT, PLATFORM_RIGHT)
+        self.finish_frame(dt)
+
+    def finish_frame(self, dt):
+        """The second half of `update`, from the frog's input on.
+
+        `update` asks the frog slot for its input after Player 1 has already
+        moved, so a snapshot taken inside `p2_input_provider` is mid-frame.
+        Restoring that snapshot and calling `finish_frame` completes the same
+        frame; calling `update` instead would step Player 1 a second time.
+        Lookahead AIs (`search_ai`) resume their rollouts this way."""
+        if self.ai.is_ai:
+            self.ai.ai_update(self.player, dt, self.projectiles)
+        else:
+            self.ai.handle_input(self.p2_input_provider(self))
+        self.ai.update(dt, WIDTH, PLATFORM_LEFT, PLATFORM_RIGHT)
+
+        if self.projectiles:
+            self._update_projectiles(dt)
+
+        # play SFX on attack start
+        for f in (self.player, self.ai):
+            if f.just_started_attack:
+                atype = f.attack_type
+                if f.variant == 'frog':
+                    self.play_sfx('frog')
+                elif atype == 'kick':
+                    self.play_sfx('kick')
+                else:
+                    self.play_sfx('punch')
+                f.just_started_attack = False
+
+        self._resolve_combat(dt)
+
+        # win/loss conditions
+        if self.player.health <= 0 or self.ai.health <= 0 or self.timer <= 0:
+            self.game_over = True
+
+    def _update_projectiles(self, dt):
+        """Move projectiles, cancel opposing ones that meet and apply fighter hits.
+
+        All pair and fighter tests go through a spatial hash rebuilt each frame
+        over pool slots, and dead projectiles are swap-removed from the pool.
+        """
+        pool = self.projectiles
+        projectiles = pool.items
+        i = 0
+        while i < pool.count:
+            proj = projectiles[i]
+            proj.update(dt)
+            if proj.active:
+                i += 1
+            else:
+                pool.release(i)
+        grids = self._grids
+        for grid in grids:
+            grid.clear()
+        for i in range(pool.count):
+            proj = projectiles[i]
+            grids[proj.owner].insert(i, proj.x, proj.y)
+
+        # projectiles from opposite sides cancel each other out
+        if len(grids[1]) and len(grids[0]):
+            self._cancel_projectiles(pool, grids[1])
+
+        # the projectile in the lowest pool slot touching a fighter hits it
+        margin = PROJECTILE_CELL
+        for owner, target in ((0, self.ai), (1, self.player)):
+            if target.hit_cooldown > 0 or not len(grids[owner]):
+                continue
+            r = target.rect
+            for i in grids[owner].query_rect(r.left, r.top, r.right, r.bottom, margin):
+                proj = projectiles[i]
+                if proj.active and proj.hits(r):
+                    target.take_damage(proj.damage)
+                    target.vy = -320  # Much stronger upward knock
+                    kb_dir = 1 if proj.direction > 0 else -1
+                    target.x += kb_dir * 280 * KNOCKBACK_DT * 15  # Much stronger pushback
+                    target.vx = kb_dir * 500  # Much stronger momentum
+                    target.hit_cooldown = 0.5
+                    if owner == 0:
+                        self.score_p1 += proj.damage
+                    else:
+                        self.score_ai += proj.damage
+                    proj.active = False
+                    break
+
+        pool.sweep(_is_active)
+
+    def _cancel_projectiles(self, pool, frog_grid):
+        # each of Player 1's projectiles cancels the first overlapping frog one
+        projectiles = pool.items
+        for i in range(pool.count):
+            proj = projectiles[i]
+            if proj.owner or not proj.active:
+                continue
+            for j in frog_grid.neighbors(proj.x, proj.y):
+                other = projectiles[j]
+                if other.active:
+                    dx = other.x - proj.x
+                    dy = other.y - proj.y
+                    reach = proj.radius + other.radius
+                    if dx * dx + dy * dy < reach * reach:
+                        proj.active = other.active = False
+                        break
+
+    def start_stress(self, count, seed=0):
+        """Keep `count` projectiles in flight from both sides (benchmark mode).
+
+        Stress projectiles do 1 damage so a round still lasts until the timer
+        runs out. They come from a private RNG that save states do not capture,
+        so stress matches are not meant for replays or rollback.
+        """
+        self.stress_projectiles = count
+        self._stress_rng = random.Random(seed)
+        # room for the stress load plus normal fireballs
+        self.projectiles.reserve(count + PROJECTILE_CAPACITY)
+
+    def _spawn_stress(self):
+        rng = self._stress_rng
+        pool = self.projectiles
+        for _ in range(self.stress_projectiles - len(pool)):
+            owner = rng.random() < 0.5
+            direction = -1 if owner else 1
+            x = rng.uniform(0, WIDTH)
+            y = rng.uniform(40, GROUND_Y - 20)
+            pool.acquire().reset(x, y, direction, int(owner), damage=1)
+
+    def _resolve_combat(self, dt):
+        # simple combat: check attack rectangles with active windows
+        for attacker, defender in ((self.player, self.ai), (self.ai, self.player)):
+            if attacker.is_attacking:
+                # determine active portion of attack - wider window (60%) to catch extended animations
+                # Hits register during extension phase (frames 1-2 of 4-frame animation)
+                t = attacker.attack_timer
+                total = attacker.attack_duration if attacker.attack_duration > 0 else 0.001
+                active = (t < total * 0.80) and (t > total * 0.20)
+                if active:
+                    ar = attacker.attack_rect()
+                    if ar.colliderect(defender.rect) and defender.hit_cooldown <= 0:
+                        # apply damage and enhanced knockback
+                        kick = attacker.attack_type == 'kick'
+                        dmg = 15 if kick else 10
+                        defender.take_damage(dmg)
+
+                        # Add hit spark effect
+                        spark_x = (ar.centerx + defender.rect.centerx) // 2
+                        spark_y = (ar.centery + defender.rect.centery) // 2
+                        combo = attacker.combo_count
+                        spark = self.hit_sparks.acquire()
+                        if spark is not None:
+                            spark.reset(spark_x, spark_y, combo)
+                        self.on_hit(spark_x, spark_y, combo)
+
+                        # Screen shake based on combo
+                        self.screen_shake = min(8.0, 3.0 + combo * 1.5)
+
+                        # Update combo display
+                        if combo > 1:
+                            self.combo_display_timer = 1.5
+                            self.last_combo_count = combo
+                        # Enhanced knockback - AI gets pushed back much more by Player 1
+                        if attacker is self.player:  # Player 1 attacking AI
+                            kb_x = 500 if kick else 350
+                            momentum = 450 if kick else 350
+                            vy_knock = -280
+                        else:  # AI attacking Player 1 - normal knockback
+                            kb_x = 350 if kick else 250
+                            momentum = 300
+                            vy_knock = -220
+
+                        if attacker.rect.centerx < defender.rect.centerx:
+                            defender.x += kb_x * KNOCKBACK_DT * 15  # Visible pushback
+                            defender.vx = momentum  # Add momentum
+                        else:
+                            defender.x -= kb_x * KNOCKBACK_DT * 15
+                            defender.vx = -momentum
+                        defender.vy = vy_knock  # Pop-up
+                        defender.hit_cooldown = 0.5
+                        # scoring
+                        if attacker is self.player:
+                            self.score_p1 += dmg
+                        else:
+                            self.score_ai += dmg
+            # decrement hit cooldowns
+            if defender.hit_cooldown > 0:
+                defender.hit_cooldown -= dt
+                if defender.hit_cooldown < 0:
+                    defender.hit_cooldown = 0
+
+    def snapshot(self):
+        """Full simulation state as nested tuples; cheap enough to take every frame."""
+        return (self.frame, self.timer, self.score_p1, self.score_ai, self.game_over,
+                self.screen_shake, self.combo_display_timer, self.last_combo_count,
+                self.player.snapshot(), self.ai.snapshot(),
+                tuple([p.snapshot() for p in self.projectiles]),
+                tuple([s.snapshot() for s in self.hit_sparks]))
+
+    def restore(self, state):
+        (self.frame, self.timer, self.score_p1, self.score_ai, self.game_over,
+         self.screen_shake, self.combo_display_timer, self.last_combo_count,
+         player, ai, projectiles, sparks) = state
+        self.player.restore(player)
+        self.ai.restore(ai)
+        self._restore_pool(self.projectiles, projectiles)
+        self._restore_pool(self.hit_sparks, sparks)
+
+    @staticmethod
+    def _restore_pool(pool, states):
+        pool.clear()
+        pool.reserve(len(states))
+        for state in states:
+            pool.acquire().restore(state)
+
+    def save_state(self):
+        """Packed binary save state: SAVE_HEADER, both FIGHTER_STATEs, then
+        projectiles and sparks as little-endian double arrays."""
+        header = SAVE_HEADER.pack(
+            SAVE_MAGIC, SAVE_VERSION, self.frame, self.timer, self.screen_shake,
+            self.combo_display_timer, self.score_p1, self.score_ai, self.last_combo_count,
+            self.game_over, len(self.projectiles), len(self.hit_sparks))
+        values = array('d')
+        for p in self.projectiles:
+            values.extend(p.snapshot())
+        for spark in self.hit_sparks:
+            values.extend((spark.x, spark.y, spark.life, spark.combo))
+        return header + self.player.pack_state() + self.ai.pack_state() + values.tobytes()
+
+    def load_state(self, data):
+        """Restore a `save_state()` blob. Every record is decoded and checked
+        before anything is assigned, so on ValueError (not a save state,
+        truncated, or a field out of range) the match is left untouched."""
+        try:
+            header = SAVE_HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError('save state too short for its header')
+        magic, version, n_proj, n_sparks = header[0], header[1], header[-2], header[-1]
+        if magic != SAVE_MAGIC or version != SAVE_VERSION:
+            raise ValueError('not a save state (or unsupported version)')
+        offset = SAVE_HEADER.size
+        end = offset + 2 * FIGHTER_STATE.size + 8 * (PROJECTILE_FIELDS * n_proj + 4 * n_sparks)
+        if len(data) < end:
+            raise ValueError(f'save state truncated: {len(data)} bytes, expected {end}')
+        player = Fighter.decode_state(data, offset)
+        ai = Fighter.decode_state(data, offset + FIGHTER_STATE.size)
+        values = array('d')
+        values.frombytes(data[offset + 2 * FIGHTER_STATE.size:end])
+        n = PROJECTILE_FIELDS
+        projectiles = []
+        for i in range(0, n * n_proj, n):
+            x, y, direction, active, owner, damage = values[i:i + n]
+            if direction not in (-1, 1) or owner not in (0, 1) or not math.isfinite(damage):
+                raise ValueError(f'bad projectile state: direction {direction}, owner {owner}, damage {damage}')
+            projectiles.append((x, y, int(direction), bool(active), int(owner), int(damage)))
+        sparks = []
+        for i in range(n * n_proj, n * n_proj + 4 * n_sparks, 4):
+            x, y, life, combo = values[i:i + 4]
+            if not math.isfinite(combo):
+                raise ValueError(f'bad spark state: combo {combo}')
+            sparks.append((x, y, life, int(combo)))
+
+        (_, _, self.frame, self.timer, self.screen_shake, self.combo_display_timer, self.score_p1,
+         self.score_ai, self.last_combo_count, self.game_over, _, _) = header
+        self.player.apply_state(player)
+        self.ai.apply_state(ai)
+        self._restore_pool(self.projectiles, projectiles)
+        self._restore_pool(self.hit_sparks, sparks)
+
+    def checksum(self):
+        """CRC of the gameplay state, for spotting desyncs between peers"""
+        return zlib.crc32(self.save_state())
+
+    def reset_round(self):
+        # reset health, positions, timer, scores remain to show cumulative performance
+        self.player.health = 200
+        self.ai.health = 200
+        self.player.x = 150
+        self.player.y = GROUND_Y - self.player.HEIGHT
+        self.ai.x = WIDTH - 174
+        self.projectiles.clear()
+        self.ai.y = GROUND_Y - self.ai.HEIGHT
+        self.player.vx = 0
+        self.player.vy = 0
+        self.ai.vx = 0
+        self.ai.vy = 0
+        self.player.rect.x = int(self.player.x)
+        self.player.rect.y = int(self.player.y)
+        self.ai.rect.x = int(self.ai.x)
+        self.ai.rect.y = int(self.ai.y)
+        self.timer = 60.0
+        self.frame = 0
+        self.game_over = False
+        self.paused = False
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Two-player online play with GGPO-style rollback over UDP.
+
+Both peers run the full match. Local input is scheduled `input_delay` frames
+ahead and sent together with every frame the peer has not acknowledged yet.
+Missing remote input is predicted by repeating the last confirmed one. When the
+real input arrives and differs from the prediction, the match is restored to
+the snapshot taken before that frame and re-simulated up to the present, all
+inside one render frame.
+
+Side 0 plays the martial artist (player slot), side 1 the frog. Both peers use
+the normal keyboard bindings and must agree on `input_delay`.
+
+Usage:
+    python3 src/netplay.py --side 0 --port 7000 --peer 127.0.0.1:7001
+    python3 src/netplay.py --side 1 --port 7001 --peer 127.0.0.1:7000
+"""
+import argparse
+import asyncio
+import random
+import struct
+
+import pygame
+
+from headless import FIXED_DT, MASK_KEYS, idle_inputs, mask_from_keys
+
+MSG_INPUT = 1
+# type, ack (contiguous frames received from the peer), first frame, count
+_HEADER = struct.Struct('<BIIH')
+MAX_INPUTS_PER_PACKET = 256
+
+
+class RollbackSession:
+    """Drives one peer's copy of a two-human `Match` (see module docstring).
+
+    The match must have been created with a `p2_input_provider`; both input
+    providers are replaced by the session.
+    """
+    def __init__(self, match, local_side, send=None, input_delay=2, max_rollback=8, dt=FIXED_DT):
+        self.match = match
+        self.local_side = local_side
+        self.send = send
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.dt = dt
+        # per-frame control bitmasks; the first `input_delay` frames are empty on both peers
+        self.local = [0] * input_delay
+        self.remote = [0] * input_delay
+        self.remote_count = input_delay  # remote frames known contiguously from 0
+        self.peer_ack = input_delay  # local frames the peer has confirmed
+        self.predicted = {}
+        self.rollback_to = None
+        self._snapshots = [None] * (max_rollback + 2)
+        # stats
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.max_depth = 0
+        self.stalls = 0
+        match.input_provider = self._player_keys
+        match.p2_input_provider = self._p2_keys
+
+    def _player_keys(self, match):
+        return MASK_KEYS[self.input_for(0, match.frame - 1)]
+
+    def _p2_keys(self, match):
+        return MASK_KEYS[self.input_for(1, match.frame - 1)]
+
+    def input_for(self, side, frame):
+        if side == self.local_side:
+            return self.local[frame]
+        if frame < len(self.remote) and self.remote[frame] is not None:
+            return self.remote[frame]
+        # predict: repeat the last confirmed remote input
+        guess = self.remote[self.remote_count - 1] if self.remote_count else 0
+        self.predicted[frame] = guess
+        return guess
+
+    def receive(self, data):
+        kind, ack, start, count = _HEADER.unpack_from(data)
+        if kind != MSG_INPUT:
+            return
+        self.peer_ack = max(self.peer_ack, ack)
+        masks = data[_HEADER.size:_HEADER.size + count]
+        remote = self.remote
+        if len(remote) < start + count:
+            remote.extend([None] * (start + count - len(remote)))
+        for frame, mask in enumerate(masks, start):
+            if remote[frame] is not None:
+                continue
+            remote[frame] = mask
+            guess = self.predicted.pop(frame, None)
+            if guess is not None and guess != mask:
+                if self.rollback_to is None or frame < self.rollback_to:
+                    self.rollback_to = frame
+        while self.remote_count < len(remote) and remote[self.remote_count] is not None:
+            self.remote_count += 1
+
+    def flush(self):
+        """Send every local input the peer has not acknowledged (oldest first)."""
+        if self.send is None:
+            return
+        start = self.peer_ack
+        masks = bytes(self.local[start:start + MAX_INPUTS_PER_PACKET])
+        self.send(_HEADER.pack(MSG_INPUT, self.remote_count, start, len(masks)) + masks)
+
+    def advance(self, local_mask):
+        """Run one frame with `local_mask` as this peer's input.
+
+        Returns False without simulating when the peer is more than
+        `max_rollback` frames behind (the caller should keep rendering).
+        """
+        m = self.match
+        if m.game_over or m.frame - self.remote_count >= self.max_rollback:
+            self.stalls += not m.game_over
+            self.flush()
+            return False
+        self.local.append(local_mask)
+        self.flush()
+        self.settle()
+        self._snapshots[m.frame % len(self._snapshots)] = m.snapshot()
+        m.update(self.dt)
+        return True
+
+    def settle(self):
+        """Apply a pending rollback: restore the mispredicted frame and replay to the present."""
+        if self.rollback_to is None:
+            return
+        m = self.match
+        target, current = self.rollback_to, m.frame
+        self.rollback_to = None
+        if target >= current:
+            return
+        m.restore(self._snapshots[target % len(self._snapshots)])
+        m.resimulating = True
+        try:
+            while m.frame < current and not m.game_over:
+                self._snapshots[m.frame % len(self._snapshots)] = m.snapshot()
+                m.update(self.dt)
+        finally:
+            m.resimulating = False
+        self.rollbacks += 1
+        self.resimulated += current - target
+        self.max_depth = max(self.max_depth, current - target)
+
+
+class LossyLink:
+    """Datagram sender that can inject latency, jitter and packet loss for testing"""
+    def __init__(self, transport, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.transport = transport
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.dropped = 0
+
+    def send(self, data):
+        self.sent += 1
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._deliver, data)
+        else:
+            self._deliver(data)
+
+    def _deliver(self, data):
+        if not self.transport.is_closing():
+            self.transport.sendto(data)
+
+
+class _SessionProtocol(asyncio.DatagramProtocol):
+    def __init__(self, session):
+        self.session = session
+
+    def datagram_received(self, data, addr):
+        self.session.receive(data)
+
+    def error_received(self, exc):
+        # e.g. ICMP port unreachable while the peer is still starting up
+        pass
+
+
+async def connect(match, local_side, local_addr, peer_addr, latency=0.0, jitter=0.0, loss=0.0,
+                  seed=None, **session_kwargs):
+    """Bind a UDP endpoint and return `(session, link, transport)`."""
+    loop = asyncio.get_running_loop()
+    session = RollbackSession(match, local_side, **session_kwargs)
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _SessionProtocol(session), local_addr=local_addr, remote_addr=peer_addr)
+    link = LossyLink(transport, latency, jitter, loss, seed)
+    session.send = link.send
+    return session, link, transport
+
+
+async def run_session(session, local_input, frames=None, tick_rate=60, on_frame=None, linger=2.0):
+    """Tick a session in real time until game over, `frames` frames, or `match.running` goes False.
+
+    `local_input(match)` returns this peer's control bitmask for the frame.
+    Afterwards keeps exchanging inputs (up to `linger` seconds) so both peers
+    end on confirmed, identical state.
+    """
+    loop = asyncio.get_running_loop()
+    m = session.match
+    period = 1.0 / tick_rate
+    next_tick = loop.time()
+    while not m.game_over and getattr(m, 'running', True) and (frames is None or m.frame < frames):
+        session.advance(local_input(m))
+        if on_frame:
+            on_frame()
+        next_tick += period
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    deadline = loop.time() + linger
+    while loop.time() < deadline and (session.remote_count < m.frame or session.peer_ack < m.frame):
+        session.flush()
+        await asyncio.sleep(period)
+    session.settle()
+
+
+async def _play(game, args):
+    host, port = args.peer.rsplit(':', 1)
+    session, link, transport = await connect(
+        game, args.side, ('0.0.0.0', args.port), (host, int(port)),
+        latency=args.latency / 1000.0, loss=args.loss, input_delay=args.delay)
+
+    def local_input(match):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                game.running = False
+        return mask_from_keys(pygame.key.get_pressed())
+
+    try:
+        await run_session(session, local_input, on_frame=game.draw)
+    finally:
+        transport.close()
+    print(f'frames={game.frame} rollbacks={session.rollbacks} max_depth={session.max_depth} '
+          f'stalls={session.stalls} checksum={game.checksum():08x}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--side', type=int, choices=(0, 1), required=True, help='0 = martial artist, 1 = frog')
+    parser.add_argument('--port', type=int, required=True, help='local UDP port')
+    parser.add_argument('--peer', required=True, help='host:port of the other player')
+    parser.add_argument('--delay', type=int, default=2, help='input delay in frames (same on both peers)')
+    parser.add_argument('--latency', type=float, default=0.0, help='extra injected latency in ms')
+    parser.add_argument('--loss', type=float, default=0.0, help='injected packet loss (0..1)')
+    args = parser.parse_args()
+
+    from game import Game
+    pygame.init()
+    game = Game(input_provider=idle_inputs, p2_input_provider=idle_inputs)
+    try:
+        asyncio.run(_play(game, args))
+    finally:
+        pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""NumPy particle system for purely visual effects (dust, trails, debris).
+
+`ParticleSystem` keeps every live particle in preallocated NumPy arrays
+(position, velocity, gravity, life, lifetime, colour) packed at the front,
+so emitting, integrating, culling and drawing are array operations with no
+per-particle Python objects. Dead particles are compacted away after each
+update. `draw` blends the particles into a 32-bit target surface through a
+flat NumPy view of its pixel buffer, fading them out with their remaining
+life, and returns the TILE x TILE tiles it touched as Rects, so dirty-rect
+rendering only repaints where particles actually are.
+
+Particles never feed back into the match, so they are not part of save
+states or replays.
+
+Usage:
+    particles = ParticleSystem(capacity=16384)
+    particles.emit(40, x, y, speed=(60, 240), angle=(200, 340), life=(0.2, 0.5),
+                   color=(190, 170, 120), gravity=600)
+    particles.update(dt)
+    particles.draw(screen)
+"""
+import numpy as np
+import pygame
+
+TILE = 64  # granularity of the rects draw() reports
+# per-particle arrays: name -> (dtype, columns)
+_FIELDS = {
+    'pos': (np.float32, 2),
+    'vel': (np.float32, 2),
+    'gravity': (np.float32, 0),
+    'life': (np.float32, 0),
+    'max_life': (np.float32, 0),
+    'color': (np.float32, 3),
+}
+
+
+class ParticleSystem:
+    """Fixed-capacity particle arrays; live particles are [0, count)."""
+    def __init__(self, capacity=16384, size=2, seed=None):
+        self.capacity = capacity
+        self.size = size  # particles are size x size pixel squares
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        for name, (dtype, columns) in _FIELDS.items():
+            setattr(self, name, np.zeros((capacity, columns) if columns else capacity, dtype))
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, n, x, y, speed=(0.0, 100.0), angle=(0.0, 360.0), life=(0.3, 0.6),
+             color=(255, 255, 255), color_jitter=0.0, gravity=0.0, spread=0.0):
+        """Spawn up to `n` particles at (x, y); returns how many fit.
+
+        `x` and `y` may also be arrays of `n` start positions (one emit call
+        for many sources, e.g. every projectile's trail).
+
+        Speed (px/s), angle (degrees, 0 = right, 90 = down) and life (s) are
+        drawn uniformly from their (low, high) ranges; `spread` jitters the
+        start position and `color_jitter` scales each colour by up to that
+        fraction.
+        """
+        start = self.count
+        n = min(n, self.capacity - start)
+        if n <= 0:
+            return 0
+        stop = start + n
+        rng = self.rng
+        theta = np.radians(rng.uniform(angle[0], angle[1], n))
+        velocity = rng.uniform(speed[0], speed[1], n)
+        self.vel[start:stop, 0] = np.cos(theta) * velocity
+        self.vel[start:stop, 1] = np.sin(theta) * velocity
+        self.pos[start:stop, 0] = x if np.ndim(x) == 0 else x[:n]
+        self.pos[start:stop, 1] = y if np.ndim(y) == 0 else y[:n]
+        if spread:
+            self.pos[start:stop] += rng.uniform(-spread, spread, (n, 2))
+        self.gravity[start:stop] = gravity
+        self.life[start:stop] = rng.uniform(life[0], life[1], n)
+        self.max_life[start:stop] = self.life[start:stop]
+        self.color[start:stop] = color
+        if color_jitter:
+            self.color[start:stop] *= rng.uniform(1.0 - color_jitter, 1.0, (n, 1))
+        self.count = stop
+        return n
+
+    def update(self, dt):
+        """Integrate motion and drop particles whose life ran out."""
+        c = self.count
+        if not c:
+            return
+        vel = self.vel[:c]
+        vel[:, 1] += self.gravity[:c] * dt
+        self.pos[:c] += vel * dt
+        life = self.life[:c]
+        life -= dt
+        alive = life > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = len(keep)
+            for name in _FIELDS:
+                array = getattr(self, name)
+                array[:n] = array[keep]
+            self.count = n
+
+    def draw(self, surface):
+        """Blend live particles into a 32-bit `surface`; returns the tile Rects touched."""
+        c = self.count
+        if not c:
+            return []
+        width, height = surface.get_size()
+        size = self.size
+        xs = self.pos[:c, 0].astype(np.int32)
+        ys = self.pos[:c, 1].astype(np.int32)
+        # cull particles whose square is entirely off the surface
+        visible = (xs > -size) & (xs < width) & (ys > -size) & (ys < height)
+        if not visible.all():
+            xs, ys = xs[visible], ys[visible]
+            alpha = (self.life[:c] / self.max_life[:c])[visible]
+            color = self.color[:c][visible]
+        else:
+            alpha = self.life[:c] / self.max_life[:c]
+            color = self.color[:c]
+        if not len(xs):
+            return []
+        # blend against the pixel under the top-left corner and fill the whole
+        # square with the result, indexing the surface as flat 32-bit pixels
+        stride = surface.get_pitch() // 4
+        columns_at = [np.clip(xs + dx, 0, width - 1) for dx in range(size)]
+        rows_at = [np.clip(ys + dy, 0, height - 1) * stride for dy in range(size)]
+        rgb = 0
+        for mask in surface.get_masks()[:3]:
+            rgb |= mask
+        buffer = surface.get_buffer()  # the surface stays locked while this lives
+        pixels = np.frombuffer(buffer, np.uint32)
+        under = pixels[rows_at[0] + columns_at[0]]
+        packed = under & np.uint32(~rgb & 0xFFFFFFFF)
+        for channel, shift in enumerate(surface.get_shifts()[:3]):
+            value = (under >> shift) & 0xFF
+            packed |= (value + (color[:, channel] - value) * alpha).astype(np.uint32) << shift
+        for column in columns_at:
+            for row in rows_at:
+                pixels[row + column] = packed
+        del pixels, buffer
+        # a particle square can straddle tiles: mark the tiles of all four corners
+        tile_columns = (width + TILE - 1) // TILE
+        touched = np.zeros(tile_columns * ((height + TILE - 1) // TILE), np.bool_)
+        for row in rows_at[::size - 1 or 1]:
+            for column in columns_at[::size - 1 or 1]:
+                touched[row // (stride * TILE) * tile_columns + column // TILE] = True
+        rects = []
+        for tile in np.flatnonzero(touched).tolist():
+            row, column = divmod(tile, tile_columns)
+            rects.append(pygame.Rect(column * TILE, row * TILE, TILE, TILE).clip(0, 0, width, height))
+        return rects
@@ -0,0 +1,240 @@
+"""Runtime frame profiler with an on-screen overlay (toggle with F3).
+
+`FrameProfiler.attach(game)` wraps the hot spots in timing shims:
+- `Game.handle_events`;
+- `Game.update`, including the combat block;
+- `Match._resolve_combat`;
+- `Fighter.draw`;
+- the HUD layer (cached composite plus any rebuild);
+- `pygame.display.flip`/`update`.
+It also counts the Surfaces made per frame: `pygame.Surface(...)`,
+`pygame.transform` calls without a destination surface, and text renders
+(`TextCache` misses).
+
+A frame ends at each flip. Its row goes into a fixed ring buffer of the
+last `capacity` frames. The overlay shows p50/p95/p99 per phase, a
+sparkline of frame times and allocations per frame. It is redrawn every
+`refresh` frames and composited as a compositor layer in between.
+
+`detach()` restores every original, so a detached profiler costs nothing.
+
+Usage:
+    profiler = FrameProfiler()
+    profiler.attach(game)      # or press F3 in the game
+    ...
+    print(profiler.format_stats())
+    profiler.detach()
+"""
+import time
+
+import numpy as np
+import pygame
+
+from fighter import Fighter
+from text_cache import get_font
+
+PHASES = ('events', 'update', 'combat', 'fighters', 'hud', 'flip')
+FRAME = len(PHASES)  # column of the whole frame (flip to flip)
+ALLOCS = FRAME + 1  # column of the Surfaces made during the frame
+# pygame.transform functions that return a new Surface unless given a destination:
+# name -> index of the destination among the arguments after the source (None: never)
+_TRANSFORMS = {'scale': 1, 'smoothscale': 1, 'scale_by': 1, 'smoothscale_by': 1, 'scale2x': 0,
+               'flip': None, 'rotate': None, 'rotozoom': None}
+PANEL_SIZE = (300, 190)
+SPARK_HEIGHT = 40
+BUDGET_MS = 1000 / 60
+
+
+class FrameProfiler:
+    """Per-phase frame timings in a ring buffer (see module docstring)"""
+    def __init__(self, capacity=240, refresh=15):
+        self.capacity = capacity
+        self.refresh = refresh
+        self.frames = np.zeros((capacity, ALLOCS + 1))  # seconds per phase, frame, allocations
+        self.index = 0  # next row to write
+        self.filled = 0
+        self.current = [0.0] * len(PHASES)
+        self.allocs = 0
+        self.game = None
+        self.panel = pygame.Surface(PANEL_SIZE, pygame.SRCALPHA)
+        self._undo = []
+        self._frame_start = None
+        self._text_misses = 0
+        self._since_refresh = refresh
+
+    def _timed(self, phase, func):
+        column = PHASES.index(phase)
+        clock = time.perf_counter
+        current = self.current
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current[column] += clock() - start
+        return timed
+
+    def _patch(self, owner, name, value):
+        """Set owner.name to `value`, remembering how to put it back"""
+        if name in vars(owner):
+            original = vars(owner)[name]
+            self._undo.append(lambda: setattr(owner, name, original))
+        else:  # an instance attribute shadowing the class's method
+            self._undo.append(lambda: delattr(owner, name))
+        setattr(owner, name, value)
+
+    def attach(self, game):
+        """Start profiling `game` and show the overlay"""
+        if self.game is not None:
+            return
+        self.game = game
+        self._patch(game, 'handle_events', self._timed('events', game.handle_events))
+        self._patch(game, 'update', self._timed('update', game.update))
+        self._patch(game, '_resolve_combat', self._timed('combat', game._resolve_combat))
+        self._patch(Fighter, 'draw', self._timed('fighters', Fighter.draw))
+        layers = game.compositor.layers
+        for i, (name, draw) in enumerate(layers):
+            if name == 'hud':
+                layers[i] = (name, self._timed('hud', draw))
+                self._undo.append(lambda i=i, entry=(name, draw): layers.__setitem__(i, entry))
+        for name in ('flip', 'update'):
+            self._patch(pygame.display, name, self._end_frame_after(getattr(pygame.display, name)))
+        # Surfaces made through the pygame API during a frame
+        self._patch(pygame, 'Surface', self._counting_surface(pygame.Surface))
+        for name, dest in _TRANSFORMS.items():
+            func = getattr(pygame.transform, name, None)
+            if func is not None:
+                self._patch(pygame.transform, name, self._counting_transform(func, dest))
+        game.compositor.add('perf', self.draw)
+        self._text_misses = game.text.misses
+        self._frame_start = None
+        game._dirty_prev = game._frozen = None  # layers changed: next frame redraws fully
+
+    def detach(self):
+        """Stop profiling and restore everything `attach` wrapped"""
+        game = self.game
+        if game is None:
+            return
+        for undo in reversed(self._undo):
+            undo()
+        self._undo = []
+        game.compositor.remove('perf')
+        game._dirty_prev = game._frozen = None
+        self.game = None
+
+    def _end_frame_after(self, func):
+        flip = self._timed('flip', func)
+
+        def present(*args, **kwargs):
+            result = flip(*args, **kwargs)
+            self.end_frame()
+            return result
+        return present
+
+    def _counting_surface(self, surface_type):
+        profiler = self
+
+        class CountingSurface(surface_type):
+            """pygame.Surface that counts constructions while profiling"""
+            def __init__(self, *args, **kwargs):
+                surface_type.__init__(self, *args, **kwargs)
+                profiler.allocs += 1
+        return CountingSurface
+
+    def _counting_transform(self, func, dest):
+        def transform(surface, *args, **kwargs):
+            if dest is None or (len(args) <= dest and 'dest_surface' not in kwargs):
+                self.allocs += 1  # no destination given: the result is a new Surface
+            return func(surface, *args, **kwargs)
+        return transform
+
+    def end_frame(self):
+        """Close the current frame (called after each flip)"""
+        now = time.perf_counter()
+        row = self.frames[self.index]
+        row[:FRAME] = self.current
+        row[FRAME] = now - self._frame_start if self._frame_start is not None else sum(self.current)
+        misses = self.game.text.misses
+        row[ALLOCS] = self.allocs + misses - self._text_misses
+        self._text_misses = misses
+        self._frame_start = now
+        self.allocs = 0
+        for i in range(len(self.current)):
+            self.current[i] = 0.0
+        self.index = (self.index + 1) % self.capacity
+        self.filled = min(self.filled + 1, self.capacity)
+        self._since_refresh += 1
+        if self._since_refresh >= self.refresh:
+            self.game._frozen = None  # a paused/game-over screen is composed again to show the new panel
+
+    def history(self):
+        """Recorded rows, oldest first"""
+        if self.filled < self.capacity:
+            return self.frames[:self.filled]
+        return np.roll(self.frames, -self.index, axis=0)
+
+    def stats(self):
+        """{phase: (p50, p95, p99) ms} plus 'frame', and 'surfaces': (last, max) per frame"""
+        rows = self.history()
+        if not len(rows):
+            return {}
+        result = {}
+        for column, name in enumerate(PHASES + ('frame',)):
+            result[name] = tuple(np.percentile(rows[:, column], (50, 95, 99)) * 1000)
+        result['surfaces'] = (int(rows[-1, ALLOCS]), int(rows[:, ALLOCS].max()))
+        return result
+
+    def format_stats(self):
+        stats = self.stats()
+        lines = ['%-9s %8s %8s %8s' % ('phase', 'p50 ms', 'p95 ms', 'p99 ms')]
+        for name in PHASES + ('frame',):
+            if name in stats:
+                lines.append('%-9s %8.3f %8.3f %8.3f' % ((name,) + stats[name]))
+        if stats:
+            lines.append('surfaces/frame: last %d, max %d over %d frames' % (stats['surfaces'] + (self.filled,)))
+        return '\n'.join(lines)
+
+    def _rebuild_panel(self):
+        panel = self.panel
+        panel.fill((0, 0, 0, 170))
+        stats = self.stats()
+        if not stats:
+            return
+        font = get_font(18)
+        white, grey = (235, 235, 235), (160, 160, 160)
+        columns = (150, 210, 270)  # right edges of the p50/p95/p99 columns
+        panel.blit(font.render('ms', True, grey), (8, 6))
+        for right, label in zip(columns, ('p50', 'p95', 'p99')):
+            label = font.render(label, True, grey)
+            panel.blit(label, (right - label.get_width(), 6))
+        y = 22
+        for name in PHASES + ('frame',):
+            panel.blit(font.render(name, True, white), (8, y))
+            for right, value in zip(columns, stats[name]):
+                value = font.render('%.2f' % value, True, white)
+                panel.blit(value, (right - value.get_width(), y))
+            y += 14
+        last, most = stats['surfaces']
+        panel.blit(font.render(f'surfaces/frame: {last} (max {most})', True, white), (8, y + 2))
+        # sparkline of frame times, with the 60 FPS budget as a guide
+        top = PANEL_SIZE[1] - SPARK_HEIGHT - 6
+        width = PANEL_SIZE[0] - 16
+        times = self.history()[:, FRAME] * 1000
+        scale = SPARK_HEIGHT / max(times.max(), BUDGET_MS * 1.5)
+        guide = top + SPARK_HEIGHT - int(BUDGET_MS * scale)
+        pygame.draw.line(panel, (90, 160, 90), (8, guide), (8 + width, guide))
+        if len(times) > 1:
+            xs = 8 + np.arange(len(times)) * (width / (self.capacity - 1))
+            ys = top + SPARK_HEIGHT - times * scale
+            pygame.draw.lines(panel, (255, 200, 60), False, np.column_stack((xs, ys)).tolist())
+
+    def draw(self, target):
+        """Compositor layer: the overlay panel in the top-right corner"""
+        if self._since_refresh >= self.refresh:
+            self._since_refresh = 0
+            # the panel's own work is not part of the frame being measured
+            allocs, misses = self.allocs, self.game.text.misses
+            self._rebuild_panel()
+            self.allocs, self._text_misses = allocs, self._text_misses + self.game.text.misses - misses
+        return [target.blit(self.panel, (target.get_width() - PANEL_SIZE[0] - 8, 60))]
@@ -0,0 +1,227 @@
+"""Pipelined game loop: simulation thread plus rendering on the main thread.
+
+`PipelinedLoop(game).run()` is an alternative to `Game.run()`. A plain
+`Match` clone of the game steps at a fixed `game.tick_rate` on a worker
+thread. After each step it publishes an immutable frame (`Match.snapshot()`
+tuples) into a `FrameBuffer`. The main thread handles events, restores
+the newest frame into the `Game` and draws it. A slow draw therefore no
+longer delays simulation steps. pygame's blits and `display.flip` release
+the GIL, so both sides can run at the same time on separate cores.
+
+Rendering stays on the main thread because SDL wants window and event
+calls there. The simulation is what moves to the worker.
+
+Sounds and hit debris raised by the simulation come through a queue, so
+none are lost when frames are skipped. Pause and round resets go back to
+the simulation thread as commands. Frames are drawn as published, without
+interpolation; `--record` needs the serial loop.
+
+Usage:
+    game = Game()
+    PipelinedLoop(game, buffers=3).run()
+"""
+import queue
+import threading
+import time
+
+from match import Match
+
+
+class FrameBuffer:
+    """Hands the newest frame from one producer to one consumer.
+
+    Three slots (triple buffering): `publish` never waits, and a frame the
+    consumer has not taken yet is replaced by the newer one. Two slots
+    (double buffering): `publish` waits until the consumer has taken the
+    previous frame and released the one before it, so the producer stays at
+    most one frame ahead of what is drawn.
+    """
+    def __init__(self, slots=3):
+        if slots not in (2, 3):
+            raise ValueError('FrameBuffer needs 2 or 3 slots')
+        self.slots = [None] * slots
+        self._cond = threading.Condition()
+        self._ready = None  # newest published slot not taken yet
+        self._read = None  # slot the consumer is drawing from
+        self._free = list(range(slots))
+        self.closed = False
+        self.published = 0
+        self.taken = 0
+        self.dropped = 0  # frames replaced before they were taken
+
+    def publish(self, frame):
+        """Make `frame` the newest frame; False once the buffer is closed."""
+        with self._cond:
+            if self._ready is not None and len(self.slots) == 3:
+                self._free.append(self._ready)
+                self._ready = None
+                self.dropped += 1
+            while (self._ready is not None or not self._free) and not self.closed:
+                self._cond.wait()
+            if self.closed:
+                return False
+            slot = self._free.pop()
+            self.slots[slot] = frame
+            self._ready = slot
+            self.published += 1
+            self._cond.notify_all()
+            return True
+
+    def take(self):
+        """Newest frame not taken yet, or None; releases the previously taken one."""
+        with self._cond:
+            if self._ready is None:
+                return None
+            if self._read is not None:
+                self._free.append(self._read)
+            self._read, self._ready = self._ready, None
+            self.taken += 1
+            self._cond.notify_all()
+            return self.slots[self._read]
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class SimFrame:
+    """One published simulation step (treated as immutable)"""
+    __slots__ = ('state', 'generation', 'time')
+
+    def __init__(self, state, generation, time):
+        self.state = state  # Match.snapshot()
+        self.generation = generation  # bumped by round resets; older frames are stale
+        self.time = time  # perf_counter() when the step finished
+
+
+class _SimMatch(Match):
+    """Match on the simulation thread; hooks go to the render side via `events`"""
+    def __init__(self, game, events):
+        Match.__init__(self, game.input_provider, game.p2_input_provider)
+        self.events = events
+        self.generation = 0  # round resets so far (see PipelinedLoop.reset_round)
+        self.ai.is_ai = game.ai.is_ai
+        self.ai.controls = dict(game.ai.controls)
+        self.ai.policy = game.ai.policy
+        if game.stress_projectiles:
+            self.start_stress(game.stress_projectiles)
+        self.restore(game.snapshot())
+        self.paused = game.paused
+
+    def play_sfx(self, name):
+        self.events.put(('sfx', name))
+
+    def on_hit(self, x, y, combo):
+        self.events.put(('hit', x, y, combo))
+
+
+class PipelinedLoop:
+    """Runs `game` with the simulation on a worker thread (see module docstring)"""
+    def __init__(self, game, buffers=3):
+        self.game = game
+        self.buffer = FrameBuffer(buffers)
+        self.events = queue.SimpleQueue()  # ('sfx', name) / ('hit', x, y, combo)
+        self.commands = queue.SimpleQueue()  # callables run on the simulation thread
+        self.sim = _SimMatch(game, self.events)
+        self.generation = 0
+        self.shown = None  # SimFrame on screen
+        self.sim_ticks = 0
+        self.dropped_time = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        game.pipeline = self
+
+    def reset_round(self):
+        """Called by Game.reset_round: restart the round on the simulation side too."""
+        self.generation += 1
+        generation = self.generation
+
+        def reset(sim):
+            sim.reset_round()
+            sim.generation = generation
+        self.commands.put(reset)
+
+    def set_paused(self, paused):
+        def pause(sim):
+            sim.paused = paused
+        self.commands.put(pause)
+
+    def _simulate(self):
+        sim = self.sim
+        game = self.game
+        clock = time.perf_counter
+        next_tick = clock()
+        while not self._stop.is_set():
+            step = 1.0 / game.tick_rate
+            while True:
+                try:
+                    command = self.commands.get_nowait()
+                except queue.Empty:
+                    break
+                command(sim)
+            sim.update(step)
+            self.sim_ticks += 1
+            if not self.buffer.publish(SimFrame(sim.snapshot(), sim.generation, clock())):
+                break
+            next_tick += step
+            now = clock()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+            elif now - next_tick > game.max_steps * step:
+                # too far behind: drop the backlog rather than trying to catch up
+                self.dropped_time += now - next_tick
+                next_tick = now
+
+    def start(self):
+        self._thread = threading.Thread(target=self._simulate, name='simulation', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.buffer.close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def apply(self, frame):
+        """Show `frame` in the game: restore its state, deliver queued events, update effects."""
+        game = self.game
+        previous = self.shown
+        falling = (game.player.vy, game.ai.vy)
+        game.restore(frame.state)
+        self.shown = frame
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'sfx':
+                game.play_sfx(event[1])
+            else:
+                game.on_hit(*event[1:])
+        steps = frame.state[0] - previous.state[0] if previous else 1
+        if not (game.paused or game.game_over) and steps > 0:
+            game.update_effects(falling, steps / game.tick_rate)
+
+    def run(self):
+        """Render loop on the calling (main) thread until the window is closed."""
+        game = self.game
+        paused = game.paused
+        self.start()
+        try:
+            while game.running:
+                game.clock.tick(game.fps)
+                game.handle_events()
+                if game.paused != paused:
+                    paused = game.paused
+                    self.set_paused(paused)
+                frame = self.buffer.take()
+                if frame is not None and frame.generation == self.generation:
+                    self.apply(frame)
+                game.sim_ticks = self.sim_ticks
+                game.dropped_time = self.dropped_time
+                game.draw()
+        finally:
+            self.stop()
+            game.pipeline = None
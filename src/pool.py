@@ -0,0 +1,68 @@
+"""Fixed-capacity object pools with swap-remove.
+
+All objects are created up front. The live ones are `items[:count]`, so
+iteration is dense. `acquire` hands out the first free object and `release`
+moves the last live object into the freed slot, both in O(1). Releasing
+reorders the live objects, so loops that release while iterating should step
+over indices and re-check the same index after a release (see `sweep`).
+"""
+
+
+class Pool:
+    """Pool of reusable objects built by `factory()`; see module docstring"""
+    __slots__ = ('items', 'count', 'factory')
+
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.items = [factory() for _ in range(capacity)]
+        self.count = 0
+
+    @property
+    def capacity(self):
+        return len(self.items)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError('pool index out of range')
+        return self.items[index % self.count]
+
+    def __iter__(self):
+        items = self.items
+        for i in range(self.count):
+            yield items[i]
+
+    def reserve(self, capacity):
+        """Grow to at least `capacity` objects (allocates; call outside the frame loop)."""
+        while len(self.items) < capacity:
+            self.items.append(self.factory())
+
+    def acquire(self):
+        """Next free object (to be re-initialised by the caller), or None when full."""
+        if self.count == len(self.items):
+            return None
+        obj = self.items[self.count]
+        self.count += 1
+        return obj
+
+    def release(self, index):
+        """Free the live object at `index` by swapping the last live object into its slot."""
+        last = self.count - 1
+        items = self.items
+        items[index], items[last] = items[last], items[index]
+        self.count = last
+
+    def sweep(self, alive):
+        """Release every live object for which `alive(obj)` is false."""
+        items = self.items
+        i = 0
+        while i < self.count:
+            if alive(items[i]):
+                i += 1
+            else:
+                self.release(i)
+
+    def clear(self):
+        self.count = 0
@@ -0,0 +1,207 @@
+"""Compact input replays with periodic state keyframes.
+
+A replay stores one `CONTROL_BITS` byte per frame for each human side, the
+frame dt (a single value when the step is fixed), the RNG seed and a packed
+`Match.save_state()` every `keyframe_interval` frames. Seeking loads the
+nearest keyframe at or before the target and simulates at most
+`keyframe_interval - 1` frames, so it costs the same anywhere in the replay.
+
+File layout: REPLAY_HEADER, then a zlib-compressed body holding the p1 masks,
+optional p2 masks, optional per-frame dts (doubles) and the keyframe table
+(frame, length) followed by the keyframe blobs.
+"""
+import random
+import struct
+import zlib
+from array import array
+from pathlib import Path
+
+from headless import FIXED_DT, MASK_KEYS, NO_KEYS, idle_inputs, mask_from_keys
+from match import Match
+
+REPLAY_MAGIC = b'MFRP'
+REPLAY_VERSION = 1
+# magic, version, flags, frame count, keyframe interval, keyframe count, seed, fixed dt
+REPLAY_HEADER = struct.Struct('<4sHHIIIQd')
+_KEYFRAME_ENTRY = struct.Struct('<II')
+FLAG_TWO_PLAYER = 1
+FLAG_VARIABLE_DT = 2
+KEYFRAME_INTERVAL = 300  # 5 seconds at 60 fps
+
+
+class Replay:
+    """Recorded inputs for one round plus keyframes for seeking."""
+    def __init__(self, masks, p2_masks=None, dt=FIXED_DT, dts=None, seed=0,
+                 keyframes=None, keyframe_interval=KEYFRAME_INTERVAL):
+        self.masks = bytes(masks)
+        self.p2_masks = bytes(p2_masks) if p2_masks is not None else None
+        self.dt = dt
+        self.dts = dts  # per-frame dt, only when the step was not fixed
+        self.seed = seed
+        self.keyframes = keyframes or []
+        self.keyframe_interval = keyframe_interval
+
+    @property
+    def frame_count(self):
+        return len(self.masks)
+
+    def dt_at(self, frame):
+        return self.dts[frame] if self.dts is not None else self.dt
+
+    def to_bytes(self):
+        flags = (FLAG_TWO_PLAYER if self.p2_masks is not None else 0) | (FLAG_VARIABLE_DT if self.dts is not None else 0)
+        body = [self.masks]
+        if self.p2_masks is not None:
+            body.append(self.p2_masks)
+        if self.dts is not None:
+            body.append(array('d', self.dts).tobytes())
+        for i, blob in enumerate(self.keyframes):
+            body.append(_KEYFRAME_ENTRY.pack(i * self.keyframe_interval, len(blob)))
+        body.extend(self.keyframes)
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, flags, self.frame_count,
+                                    self.keyframe_interval, len(self.keyframes), self.seed, self.dt)
+        return header + zlib.compress(b''.join(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, flags, frames, interval, n_keys, seed, dt = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError('not a replay file (or unsupported version)')
+        body = zlib.decompress(data[REPLAY_HEADER.size:])
+        pos = frames
+        masks = body[:pos]
+        p2_masks = None
+        if flags & FLAG_TWO_PLAYER:
+            p2_masks = body[pos:pos + frames]
+            pos += frames
+        dts = None
+        if flags & FLAG_VARIABLE_DT:
+            dts = array('d')
+            dts.frombytes(body[pos:pos + 8 * frames])
+            pos += 8 * frames
+        lengths = []
+        for _ in range(n_keys):
+            lengths.append(_KEYFRAME_ENTRY.unpack_from(body, pos)[1])
+            pos += _KEYFRAME_ENTRY.size
+        keyframes = []
+        for length in lengths:
+            keyframes.append(body[pos:pos + length])
+            pos += length
+        return cls(masks, p2_masks, dt, dts, seed, keyframes, interval)
+
+    def save(self, path):
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def attach(self, match):
+        """Feed this replay's inputs to `match` (indexed by `match.frame`)."""
+        masks = self.masks
+        match.input_provider = lambda m: MASK_KEYS[masks[m.frame - 1]] if m.frame <= len(masks) else NO_KEYS
+        if self.p2_masks is not None:
+            p2 = self.p2_masks
+            match.p2_input_provider = lambda m: MASK_KEYS[p2[m.frame - 1]] if m.frame <= len(p2) else NO_KEYS
+
+    def create_match(self, cls=Match, **kwargs):
+        """A match of class `cls` at frame 0 of this replay with inputs attached."""
+        if self.p2_masks is not None:
+            kwargs.setdefault('p2_input_provider', idle_inputs)
+        match = cls(**kwargs)
+        self.attach(match)
+        random.seed(self.seed)
+        if self.keyframes:
+            match.load_state(self.keyframes[0])
+        return match
+
+    def seek(self, match, frame):
+        """Jump to `frame` via the nearest earlier keyframe."""
+        frame = max(0, min(frame, self.frame_count))
+        k = min(frame // self.keyframe_interval, len(self.keyframes) - 1)
+        match.load_state(self.keyframes[k])
+        while match.frame < frame and not match.game_over:
+            match.update(self.dt_at(match.frame))
+
+    def play(self, match, on_frame=None, until=None):
+        """Simulate from the match's current frame to the end (or `until`) as fast as possible."""
+        end = self.frame_count if until is None else min(until, self.frame_count)
+        while match.frame < end and not match.game_over:
+            match.update(self.dt_at(match.frame))
+            if on_frame and on_frame(match) is False:
+                break
+        return match
+
+
+class ReplayRecorder:
+    """Records a match's inputs: call `update(dt)` instead of `match.update(dt)`.
+
+    With `path`, `finish()` writes the file and `next_round()` starts a new
+    recording (`name-r2.mfr`, ...) after `reset_round`.
+    """
+    def __init__(self, match, seed=None, keyframe_interval=KEYFRAME_INTERVAL, path=None):
+        self.match = match
+        self.keyframe_interval = keyframe_interval
+        self.path = Path(path) if path else None
+        self.round = 1
+        self._inner = match.input_provider
+        self._inner_p2 = match.p2_input_provider
+        match.input_provider = self._record_p1
+        if match.p2_input_provider is not None:
+            match.p2_input_provider = self._record_p2
+        self._start(seed)
+
+    def _start(self, seed):
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        random.seed(self.seed)
+        self.masks = bytearray()
+        self.p2_masks = bytearray() if self._inner_p2 is not None else None
+        self.dts = array('d')
+        self.keyframes = []
+
+    def _record_p1(self, match):
+        mask = mask_from_keys(self._inner(match))
+        self.masks.append(mask)
+        return MASK_KEYS[mask]
+
+    def _record_p2(self, match):
+        mask = mask_from_keys(self._inner_p2(match), match.ai.controls)
+        self.p2_masks.append(mask)
+        return MASK_KEYS[mask]
+
+    def update(self, dt):
+        m = self.match
+        if m.frame == len(self.keyframes) * self.keyframe_interval and not m.game_over:
+            self.keyframes.append(m.save_state())
+        before = m.frame
+        m.update(dt)
+        if m.frame != before:
+            self.dts.append(dt)
+            # the player slot may be AI-driven and never ask for input
+            while len(self.masks) < m.frame:
+                self.masks.append(0)
+
+    def replay(self):
+        fixed = len(set(self.dts)) <= 1
+        dt = self.dts[0] if self.dts else FIXED_DT
+        return Replay(self.masks, self.p2_masks, dt, None if fixed else self.dts, self.seed,
+                      list(self.keyframes), self.keyframe_interval)
+
+    def _round_path(self):
+        if self.round == 1:
+            return self.path
+        return self.path.with_name(f'{self.path.stem}-r{self.round}{self.path.suffix}')
+
+    def finish(self):
+        """Write the current round to disk (when recording to a path) and return its Replay."""
+        replay = self.replay()
+        if self.path and replay.frame_count:
+            path = self._round_path()
+            replay.save(path)
+            print(f'Saved replay: {path} ({replay.frame_count} frames)')
+        return replay
+
+    def next_round(self):
+        self.finish()
+        self.round += 1
+        self._start(None)
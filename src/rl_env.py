@@ -0,0 +1,236 @@
+"""Gym-style reinforcement learning environments around `Match`.
+
+`FighterEnv` is one match with the agent as Player 1 against the frog AI:
+`reset()` returns an observation, `step(action)` returns
+`(observation, reward, done, info)`. An action is a `CONTROL_BITS` mask, i.e.
+any combination of the Player 1 controls (`ACTION_COUNT` discrete actions).
+Observations are float32 vectors of `OBS_SIZE` features built from both
+`Fighter`s, the round timer and the nearest projectile of each owner.
+
+`VectorEnv` runs `num_envs` environments spread over worker processes. The
+observation, action, reward and done arrays live in
+`multiprocessing.shared_memory` blocks that every process maps as NumPy
+arrays; the pipes to the workers only carry one-byte commands. Finished
+environments are reset automatically, so after a step `obs[i]` already is
+the first observation of the next episode when `dones[i]` is set.
+
+Usage:
+    with VectorEnv(16, workers=4) as env:
+        obs = env.reset()
+        obs, rewards, dones, _ = env.step(actions)
+"""
+import multiprocessing as mp
+import os
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from headless import FIXED_DT, MASK_KEYS, init_headless
+from match import CONTROL_BITS, GROUND_Y, WIDTH, Match
+
+ACTION_COUNT = 1 << len(CONTROL_BITS)
+FIGHTER_FEATURES = 13
+PROJECTILE_FEATURES = 3
+# both fighters, the timer, then the nearest projectile of each owner
+# (Player 1's own fireballs first, then the frog's)
+OBS_SIZE = 2 * FIGHTER_FEATURES + 1 + 2 * PROJECTILE_FEATURES
+
+
+def fighter_features(f, out, offset):
+    """Write FIGHTER_FEATURES roughly unit-scaled values for `f` into `out[offset:]`."""
+    out[offset] = f.rect.centerx / WIDTH
+    out[offset + 1] = (GROUND_Y - f.y - f.HEIGHT) / 300.0  # height above ground
+    out[offset + 2] = f.vx / 500.0
+    out[offset + 3] = f.vy / 500.0
+    out[offset + 4] = f.health / 300.0
+    out[offset + 5] = f.facing_left
+    out[offset + 6] = f.is_attacking
+    out[offset + 7] = f.attack_type == 'punch'
+    out[offset + 8] = f.attack_type == 'kick'
+    out[offset + 9] = f.attack_timer / f.attack_duration if f.is_attacking else 0.0
+    out[offset + 10] = f.hit_cooldown / 0.5
+    out[offset + 11] = f.fireball_cooldown / 0.8
+    out[offset + 12] = f.combo_count / 5.0
+
+
+def projectile_features(projectiles, owner, target, out, offset):
+    """Write PROJECTILE_FEATURES values for the projectile of `owner` nearest
+    to `target` (the fighter it can hit) into `out[offset:]`: present, signed
+    x gap to the target, and whether it is flying towards the target."""
+    cx = target.rect.centerx
+    nearest = None
+    for proj in projectiles:
+        if proj.owner == owner and (nearest is None or abs(cx - proj.x) < abs(cx - nearest.x)):
+            nearest = proj
+    if nearest is None:
+        out[offset:offset + PROJECTILE_FEATURES] = 0.0
+        return
+    gap = cx - nearest.x
+    out[offset] = 1.0
+    out[offset + 1] = gap / WIDTH
+    out[offset + 2] = 1.0 if gap * nearest.direction > 0 else -1.0
+
+
+class FighterEnv:
+    """Single match environment (see module docstring).
+
+    `frame_skip` repeats each action for that many frames. Reward is damage
+    dealt minus damage taken (per 100 HP), plus +1/-1 when the round ends.
+    """
+    observation_size = OBS_SIZE
+    action_count = ACTION_COUNT
+
+    def __init__(self, frame_skip=1, dt=FIXED_DT, max_frames=None):
+        self.frame_skip = frame_skip
+        self.dt = dt
+        self.max_frames = max_frames
+        self.action = 0
+        self.match = Match(input_provider=self._keys)
+        self._initial = self.match.snapshot()
+
+    def _keys(self, match):
+        return MASK_KEYS[self.action]
+
+    def observe(self, out=None):
+        if out is None:
+            out = np.empty(OBS_SIZE, np.float32)
+        m = self.match
+        fighter_features(m.player, out, 0)
+        fighter_features(m.ai, out, FIGHTER_FEATURES)
+        out[2 * FIGHTER_FEATURES] = m.timer / 60.0
+        offset = 2 * FIGHTER_FEATURES + 1
+        projectile_features(m.projectiles, 0, m.ai, out, offset)
+        projectile_features(m.projectiles, 1, m.player, out, offset + PROJECTILE_FEATURES)
+        return out
+
+    def reset(self, seed=None, out=None):
+        if seed is not None:
+            random.seed(seed)
+        self.match.restore(self._initial)
+        self.action = 0
+        return self.observe(out)
+
+    def step(self, action, out=None):
+        m = self.match
+        self.action = int(action)
+        dealt, taken = m.score_p1, m.score_ai
+        for _ in range(self.frame_skip):
+            m.update(self.dt)
+            if m.game_over:
+                break
+        reward = ((m.score_p1 - dealt) - (m.score_ai - taken)) / 100.0
+        done = m.game_over or (self.max_frames is not None and m.frame >= self.max_frames)
+        if m.game_over:
+            reward += 1.0 if m.player.health > m.ai.health else (-1.0 if m.ai.health > m.player.health else 0.0)
+        return self.observe(out), reward, done, {'frame': m.frame}
+
+
+_ARRAYS = (('obs', np.float32, OBS_SIZE), ('actions', np.uint8, 0),
+           ('rewards', np.float32, 0), ('dones', np.bool_, 0))
+
+
+def _views(blocks, num_envs):
+    return [np.ndarray((num_envs, width) if width else (num_envs,), dtype, buffer=block.buf)
+            for block, (_, dtype, width) in zip(blocks, _ARRAYS)]
+
+
+def _worker(conn, names, num_envs, start, stop, env_kwargs):
+    init_headless()
+    # attaching registers the names with the resource tracker shared with the
+    # parent, which already tracks them; the parent unlinks them in close()
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    obs, actions, rewards, dones = _views(blocks, num_envs)
+    envs = [FighterEnv(**env_kwargs) for _ in range(start, stop)]
+    try:
+        while True:
+            cmd = conn.recv_bytes()
+            if cmd == b'q':
+                break
+            for i, env in enumerate(envs, start):
+                if cmd == b's':
+                    _, rewards[i], done, _ = env.step(actions[i], obs[i])
+                    dones[i] = done
+                    if done:
+                        env.reset(out=obs[i])
+                else:
+                    env.reset(out=obs[i])
+                    rewards[i] = 0.0
+                    dones[i] = False
+            conn.send_bytes(b'k')
+    finally:
+        del obs, actions, rewards, dones
+        for block in blocks:
+            block.close()
+
+
+class VectorEnv:
+    """`num_envs` FighterEnvs over `workers` processes with shared-memory buffers.
+
+    `reset()` and `step()` return the shared arrays themselves; copy them if
+    you need to keep values across steps.
+    """
+    observation_size = OBS_SIZE
+    action_count = ACTION_COUNT
+
+    def __init__(self, num_envs, workers=None, **env_kwargs):
+        workers = min(workers or os.cpu_count() or 1, num_envs)
+        self.num_envs = num_envs
+        self._blocks = []
+        for _, dtype, width in _ARRAYS:
+            size = num_envs * max(width, 1) * np.dtype(dtype).itemsize
+            self._blocks.append(shared_memory.SharedMemory(create=True, size=size))
+        self.obs, self.actions, self.rewards, self.dones = _views(self._blocks, num_envs)
+        names = [block.name for block in self._blocks]
+        self._conns = []
+        self._procs = []
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=_worker, daemon=True,
+                              args=(child, names, num_envs, int(start), int(stop), env_kwargs))
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    @property
+    def workers(self):
+        return len(self._procs)
+
+    def _command(self, cmd):
+        for conn in self._conns:
+            conn.send_bytes(cmd)
+        for conn in self._conns:
+            conn.recv_bytes()
+
+    def reset(self):
+        self._command(b'r')
+        return self.obs
+
+    def step(self, actions):
+        self.actions[:] = actions
+        self._command(b's')
+        return self.obs, self.rewards, self.dones, {}
+
+    def close(self):
+        if not self._procs:
+            return
+        for conn in self._conns:
+            try:
+                conn.send_bytes(b'q')
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        self._procs = []
+        del self.obs, self.actions, self.rewards, self.dones
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,159 @@
+"""Lookahead opponent: Monte-Carlo search over cloned match simulations.
+
+`SearchAI` is an input provider for the frog slot. Every `hold_frames` frames
+it copies the match into a private scratch `Match` (`snapshot`/`restore`) and
+plays rollouts with the real `Fighter.update` and combat rules: the frog holds
+one candidate action for `hold_frames`, then falls back to its built-in
+`ai_update` until `horizon` frames have been simulated, while Player 1 follows
+a randomly sampled plan. Each sampled plan is played against every candidate
+action (common random numbers), and sampling stops before the time budget
+runs out. The action with the best average damage race is then held until
+the next decision.
+
+Usage:
+    ai = SearchAI(budget_ms=4.0)
+    match = Match(input_provider=..., p2_input_provider=ai)
+    ...
+    print(ai.nodes_per_second)
+"""
+import math
+import random
+import time
+
+from headless import FIXED_DT, MASK_KEYS
+from match import CONTROL_BITS, Match
+
+_L, _R = CONTROL_BITS['left'], CONTROL_BITS['right']
+_P, _K, _J = CONTROL_BITS['punch'], CONTROL_BITS['kick'], CONTROL_BITS['jump']
+# frog actions searched at the root (the frog has no fireball)
+ACTIONS = (0, _L, _R, _P, _K, _J, _L | _J, _R | _J)
+# random policy for Player 1 during rollouts
+OPPONENT_ACTIONS = (0, _L, _R, _P, _K, _J, CONTROL_BITS['fireball'])
+# copied to the scratch match when Player 1 is AI-driven
+_AI_PARAMS = ('is_ai', 'ai_speed', 'ai_attack_range', 'hop_interval')
+
+
+class SearchAI:
+    """Frog input provider with a per-frame search budget (see module docstring).
+
+    `max_rollouts` replaces the time budget with a fixed rollout count, which
+    makes decisions reproducible for a given seed.
+    """
+    def __init__(self, budget_ms=4.0, horizon=30, hold_frames=6, max_rollouts=None,
+                 distance_weight=0.001, seed=None, dt=FIXED_DT):
+        self.budget_ms = budget_ms
+        self.horizon = horizon
+        self.hold_frames = hold_frames
+        self.max_rollouts = max_rollouts
+        self.distance_weight = distance_weight
+        self.dt = dt
+        self.rng = random.Random(seed)
+        self.sim = None
+        self._p1_mask = 0
+        self._frog_mask = 0
+        self.action = 0
+        self._hold = 0
+        # stats
+        self.searches = 0
+        self.rollouts = 0
+        self.nodes = 0  # simulated frames
+        self.search_time = 0.0
+        self.max_search_ms = 0.0
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.search_time if self.search_time else 0.0
+
+    def _scratch(self, match):
+        if self.sim is None:
+            self.sim = Match(input_provider=lambda m: MASK_KEYS[self._p1_mask],
+                             p2_input_provider=lambda m: MASK_KEYS[self._frog_mask])
+        for name in _AI_PARAMS:
+            setattr(self.sim.player, name, getattr(match.player, name))
+            if name != 'is_ai':
+                setattr(self.sim.ai, name, getattr(match.ai, name))
+        return self.sim
+
+    def __call__(self, match):
+        if self._hold > 0:
+            self._hold -= 1
+        else:
+            self.action = self.search(match)
+            self._hold = self.hold_frames - 1
+        return MASK_KEYS[self.action]
+
+    def search(self, match):
+        """Best frog action (control bitmask) from the current state within the budget."""
+        values = self.evaluate(match)
+        best = max(range(len(ACTIONS)), key=lambda i: values[i] if values[i] is not None else -math.inf)
+        return ACTIONS[best]
+
+    def evaluate(self, match, actions=ACTIONS):
+        """Average rollout value for each candidate (None if the budget ran out first).
+
+        A candidate of None means handing the frog to `ai_update` straight away.
+        `match` is mid-update: the frog's input (or `ai_update`) is asked for
+        after Player 1 has already moved this frame, so rollouts start by
+        finishing that frame rather than stepping Player 1 again.
+        """
+        sim = self._scratch(match)
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000.0
+        root = match.snapshot()
+        rng = self.rng
+        segments = -(-self.horizon // self.hold_frames)
+        totals = [0.0] * len(actions)
+        visits = [0] * len(actions)
+        rollouts = nodes = 0
+        last, longest = start, 0.0
+        done = False
+        while not done:
+            # every action is scored against the same sampled Player 1 plan
+            plan = [rng.choice(OPPONENT_ACTIONS) for _ in range(segments)]
+            for i, action in enumerate(actions):
+                value, frames = self._rollout(sim, root, action, plan)
+                totals[i] += value
+                visits[i] += 1
+                rollouts += 1
+                nodes += frames
+                if self.max_rollouts is not None:
+                    done = rollouts >= self.max_rollouts
+                else:
+                    # stop when another rollout as slow as the slowest so far would overrun
+                    now = time.perf_counter()
+                    longest = max(longest, now - last)
+                    last = now
+                    done = now + longest > deadline
+                if done:
+                    break
+        elapsed = time.perf_counter() - start
+        self.searches += 1
+        self.rollouts += rollouts
+        self.nodes += nodes
+        self.search_time += elapsed
+        self.max_search_ms = max(self.max_search_ms, elapsed * 1000)
+        return [total / n if n else None for total, n in zip(totals, visits)]
+
+    def _rollout(self, sim, root, action, plan):
+        """Play one rollout from `root`; returns (value, simulated frames)."""
+        sim.restore(root)
+        frog, player = sim.ai, sim.player
+        frog_health, player_health = frog.health, player.health
+        self._frog_mask = action or 0
+        frog.is_ai = action is None
+        hold = self.hold_frames
+        self._p1_mask = plan[0]
+        # `root` was taken inside Match.update, after Player 1's half of the frame
+        sim.finish_frame(self.dt)
+        frames = 1
+        while frames < self.horizon and not sim.game_over:
+            if frames % hold == 0:
+                self._p1_mask = plan[frames // hold]
+                # after the root action the frog falls back to its built-in ai_update
+                frog.is_ai = True
+            sim.update(self.dt)
+            frames += 1
+        # damage race, scaled to roughly one hit; distance breaks ties toward closing in
+        value = ((player_health - player.health) - (frog_health - frog.health)) / 10.0
+        value -= abs(frog.rect.centerx - player.rect.centerx) * self.distance_weight
+        return value, frames
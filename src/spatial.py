@@ -0,0 +1,81 @@
+"""Uniform-grid spatial hash used as a collision broadphase.
+
+Items are bucketed by the grid cell holding their centre. With a cell size of
+at least the largest item diameter, two overlapping items always sit in the
+same or adjacent cells, so a neighbour query only has to look at 3x3 cells.
+
+Buckets are emptied in place rather than dropped, and queries fill one reused
+result list, so rebuilding the hash every frame does not allocate once the
+cells in use have been seen.
+"""
+
+
+class SpatialHash:
+    """Buckets integer ids (e.g. list indices) by position; rebuilt every frame"""
+    __slots__ = ('cell_size', 'cells', 'size', '_found')
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.size = 0
+        self._found = []
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        if self.size:
+            for bucket in self.cells.values():
+                bucket.clear()
+            self.size = 0
+
+    def insert(self, item, x, y):
+        size = self.cell_size
+        key = (int(x // size), int(y // size))
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+        self.size += 1
+
+    def neighbors(self, x, y):
+        """Items in the cell containing (x, y) and the eight cells around it.
+
+        Returns a list that is reused by the next query.
+        """
+        size = self.cell_size
+        cx, cy = int(x // size), int(y // size)
+        get = self.cells.get
+        found = self._found
+        found.clear()
+        for key in ((cx - 1, cy - 1), (cx, cy - 1), (cx + 1, cy - 1),
+                    (cx - 1, cy), (cx, cy), (cx + 1, cy),
+                    (cx - 1, cy + 1), (cx, cy + 1), (cx + 1, cy + 1)):
+            bucket = get(key)
+            if bucket:
+                found.extend(bucket)
+        return found
+
+    def query_rect(self, left, top, right, bottom, margin=0):
+        """Sorted ids of items whose centre may lie within `margin` of the rect (reused list)."""
+        size = self.cell_size
+        x0, x1 = int((left - margin) // size), int((right + margin) // size)
+        y0, y1 = int((top - margin) // size), int((bottom + margin) // size)
+        cells = self.cells
+        found = self._found
+        found.clear()
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            # fewer known cells than cells under the rect: scan the known ones
+            for (cx, cy), bucket in cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    found.extend(bucket)
+        else:
+            get = cells.get
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    bucket = get((cx, cy))
+                    if bucket:
+                        found.extend(bucket)
+        found.sort()
+        return found
@@ -0,0 +1,58 @@
+"""Font registry and rendered-text cache for the HUD and overlays.
+
+`get_font(size)` returns one shared `pygame.font.Font` per size instead of
+loading the font again for every `Font(None, size)` call. `TextCache`
+keeps rendered text surfaces keyed by (size, text, color) with LRU
+eviction, so static strings are rendered once and changing ones (timer,
+score, combo count) only when their text changes.
+
+Usage:
+    text = TextCache()
+    surf = text.render(36, f"ROUND 1 - {int(timer)}s", (255, 255, 0))
+"""
+from collections import OrderedDict
+
+import pygame
+
+# fonts keyed by (name, size); name None is pygame's default font
+_FONTS = {}
+
+
+def get_font(size, name=None):
+    """Shared Font for `size` (loaded on first use)."""
+    key = (name, size)
+    font = _FONTS.get(key)
+    if font is None:
+        font = _FONTS[key] = pygame.font.Font(name, size)
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces (capacity 0 disables caching).
+
+    Returned surfaces are shared: copy one before changing its alpha or
+    pixels.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, size, text, color, antialias=True):
+        key = (size, text, color, antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = get_font(size).render(text, antialias, color)
+        if self.capacity:
+            self.surfaces[key] = surf
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
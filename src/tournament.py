@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""AI tournament: fan headless matches out over a process pool and rank entrants.
+
+Every AI profile plays the frog slot against every scripted player policy and
+every other AI profile (which then drives the player slot through its own
+`ai_update`). Each match gets its own seed, so a tournament is reproducible
+regardless of worker count or completion order.
+
+Usage:
+    python3 src/tournament.py --rounds 4 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from headless import HeadlessRunner, KeyState, NO_KEYS, idle_inputs, init_headless, random_inputs
+from match import Match
+
+# ai_update tuning; every profile is applied in full so it behaves the same in either slot
+DEFAULT_PROFILE = {'ai_speed': 180, 'ai_attack_range': 50, 'hop_interval': 0.55}
+
+AI_PROFILES = {
+    'frog': {},
+    'frog_fast': {'ai_speed': 240},
+    'frog_slow': {'ai_speed': 120},
+    'frog_hoppy': {'hop_interval': 0.3},
+    'frog_grounded': {'hop_interval': 0.0},
+    'frog_long_reach': {'ai_attack_range': 120},
+    'frog_close_reach': {'ai_attack_range': 20},
+}
+
+
+def zoner_inputs(seed):
+    """Stays put and throws fireballs at the frog, jumping when it gets close."""
+    rng = random.Random(seed)
+
+    def provider(match):
+        p, ai = match.player, match.ai
+        toward = match.player.controls['right'] if ai.rect.centerx > p.rect.centerx else match.player.controls['left']
+        pressed = [match.player.controls['fireball']]
+        if p.facing_left != (ai.rect.centerx < p.rect.centerx):
+            pressed.append(toward)
+        if abs(ai.rect.centerx - p.rect.centerx) < 200 and rng.random() < 0.2:
+            pressed.append(match.player.controls['jump'])
+        return KeyState(pressed)
+
+    return provider
+
+
+def rushdown_inputs(seed):
+    """Walks in and alternates punches and kicks once in range."""
+    rng = random.Random(seed)
+
+    def provider(match):
+        p, ai = match.player, match.ai
+        controls = p.controls
+        gap = ai.rect.centerx - p.rect.centerx
+        if abs(gap) > 220:
+            return KeyState([controls['right'] if gap > 0 else controls['left']])
+        if rng.random() < 0.5:
+            return NO_KEYS
+        return KeyState([controls['punch'] if rng.random() < 0.6 else controls['kick']])
+
+    return provider
+
+
+SCRIPTED_OPPONENTS = {
+    'idle': lambda seed: idle_inputs,
+    'masher': random_inputs,
+    'zoner': zoner_inputs,
+    'rushdown': rushdown_inputs,
+}
+
+
+def apply_profile(fighter, profile):
+    for name, value in dict(DEFAULT_PROFILE, **profile).items():
+        setattr(fighter, name, value)
+
+
+def schedule(rounds=1, seed=0, profiles=None, scripted=None):
+    """List of match specs `(index, p1_name, ai_name, seed)` for a full round robin."""
+    profiles = AI_PROFILES if profiles is None else profiles
+    scripted = SCRIPTED_OPPONENTS if scripted is None else scripted
+    specs = []
+    for _ in range(rounds):
+        for ai_name in profiles:
+            for p1_name in list(scripted) + list(profiles):
+                if p1_name == ai_name:
+                    continue
+                index = len(specs)
+                specs.append((index, p1_name, ai_name, seed * 1000003 + index))
+    return specs
+
+
+def play_match(spec, max_frames=None):
+    index, p1_name, ai_name, seed = spec
+    random.seed(seed)
+    if p1_name in SCRIPTED_OPPONENTS:
+        match = Match(input_provider=SCRIPTED_OPPONENTS[p1_name](seed))
+    else:
+        match = Match(input_provider=idle_inputs)
+        match.player.is_ai = True
+        apply_profile(match.player, AI_PROFILES[p1_name])
+    apply_profile(match.ai, AI_PROFILES[ai_name])
+    result = HeadlessRunner(match=match).run(max_frames)
+    result.update(index=index, p1=p1_name, ai=ai_name, seed=seed)
+    return result
+
+
+def _play_chunk(specs):
+    return [play_match(spec) for spec in specs]
+
+
+def run_tournament(specs, workers=None, chunksize=4):
+    """Yield match results as worker processes finish them (completion order)."""
+    workers = workers or os.cpu_count() or 1
+    chunks = [specs[i:i + chunksize] for i in range(0, len(specs), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_headless) as pool:
+        futures = [pool.submit(_play_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                yield result
+
+
+def standings(results, k=24, initial=1500.0):
+    """Per-entrant record, average damage dealt/taken and Elo rating."""
+    table = {}
+    ratings = {}
+
+    def row(name):
+        if name not in table:
+            table[name] = {'played': 0, 'wins': 0, 'losses': 0, 'draws': 0, 'dealt': 0, 'taken': 0}
+            ratings[name] = initial
+        return table[name]
+
+    # Elo is order dependent: replay in schedule order, not completion order
+    for r in sorted(results, key=lambda r: r['index']):
+        p1, ai = row(r['p1']), row(r['ai'])
+        for entry, dealt, taken in ((p1, r['score_p1'], r['score_ai']), (ai, r['score_ai'], r['score_p1'])):
+            entry['played'] += 1
+            entry['dealt'] += dealt
+            entry['taken'] += taken
+        score = {'p1': 1.0, 'ai': 0.0, 'draw': 0.5}[r['winner']]
+        if score == 1.0:
+            p1['wins'] += 1
+            ai['losses'] += 1
+        elif score == 0.0:
+            ai['wins'] += 1
+            p1['losses'] += 1
+        else:
+            p1['draws'] += 1
+            ai['draws'] += 1
+        expected = 1.0 / (1.0 + 10 ** ((ratings[r['ai']] - ratings[r['p1']]) / 400.0))
+        ratings[r['p1']] += k * (score - expected)
+        ratings[r['ai']] -= k * (score - expected)
+
+    for name, entry in table.items():
+        played = entry['played'] or 1
+        entry['win_rate'] = (entry['wins'] + 0.5 * entry['draws']) / played
+        entry['avg_dealt'] = entry['dealt'] / played
+        entry['avg_taken'] = entry['taken'] / played
+        entry['elo'] = ratings[name]
+    return table
+
+
+def win_rate_matrix(results):
+    """{(row, col): win rate of row against col} over all meetings in either slot."""
+    tally = {}
+    for r in results:
+        score = {'p1': 1.0, 'ai': 0.0, 'draw': 0.5}[r['winner']]
+        for a, b, s in ((r['p1'], r['ai'], score), (r['ai'], r['p1'], 1.0 - score)):
+            total, n = tally.get((a, b), (0.0, 0))
+            tally[(a, b)] = (total + s, n + 1)
+    return {pair: total / n for pair, (total, n) in tally.items()}
+
+
+def format_standings(table):
+    lines = ['%-18s %6s %5s %5s %5s %8s %9s %9s %7s' % (
+        'entrant', 'played', 'win', 'loss', 'draw', 'win%', 'avg dmg', 'avg taken', 'elo')]
+    for name, e in sorted(table.items(), key=lambda item: -item[1]['elo']):
+        lines.append('%-18s %6d %5d %5d %5d %7.1f%% %9.1f %9.1f %7.0f' % (
+            name, e['played'], e['wins'], e['losses'], e['draws'], e['win_rate'] * 100,
+            e['avg_dealt'], e['avg_taken'], e['elo']))
+    return '\n'.join(lines)
+
+
+def format_matrix(matrix):
+    names = sorted({a for a, _ in matrix})
+    width = max(len(n) for n in names) + 1
+    lines = [' ' * width + ''.join('%9s' % n[:8] for n in names)]
+    for a in names:
+        cells = ''.join('%9s' % ('%.0f%%' % (matrix[(a, b)] * 100) if (a, b) in matrix else '-') for b in names)
+        lines.append(a.ljust(width) + cells)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='defaults to all cores')
+    parser.add_argument('--chunksize', type=int, default=4, help='matches per worker task')
+    args = parser.parse_args()
+
+    specs = schedule(args.rounds, args.seed)
+    results = []
+    start = time.perf_counter()
+    step = max(1, len(specs) // 10)
+    for result in run_tournament(specs, args.workers, args.chunksize):
+        results.append(result)
+        if len(results) % step == 0 or len(results) == len(specs):
+            elapsed = time.perf_counter() - start
+            print(f'  {len(results)}/{len(specs)} matches ({len(results) / elapsed:.1f} matches/s)', file=sys.stderr)
+
+    print(format_standings(standings(results)))
+    print()
+    print('win rate (row vs column)')
+    print(format_matrix(win_rate_matrix(results)))
+
+
+if __name__ == '__main__':
+    main()
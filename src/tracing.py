@@ -0,0 +1,210 @@
+"""Record spans in Chrome trace-event format (chrome://tracing, Perfetto).
+
+`Tracer(path)` wraps functions in timing shims, like `perf_overlay`.
+Nothing is recorded or slowed down until it is installed, and `close()`
+puts every original back.
+- `install()` wraps code that runs before or outside any one game:
+  - `Fighter.update`, `Fighter.ai_update` and `Fighter._load_sprite`;
+  - `Game._ensure_audio_assets`;
+  - sprite draw-frame and effect image generation.
+  Install before creating the Game to see its start-up.
+- `watch(game)` wraps the phases of `Game.run`: tick (waiting on the frame
+  cap), events, advance (with one update span per simulation step) and
+  draw. It also adds a `frame` span around each loop iteration. Frame and
+  update spans carry the frame number and entity counts (projectiles,
+  sparks, particles). The counts also go out as counter events, so spikes
+  line up with the gameplay that caused them.
+
+A span is a tuple appended to a deque; it is not formatted when it is
+recorded. A writer thread drains the deque every `flush_interval`
+seconds and streams JSON to the file. Memory stays flat on long sessions,
+and the game thread never waits on the disk. Spans are recorded from any
+thread (e.g. the pipelined simulation) under the thread's own track.
+
+Usage:
+    tracer = Tracer('trace.json')
+    tracer.install()
+    game = Game()
+    tracer.watch(game)
+    game.run()
+    tracer.close()
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import fighter
+import match
+from fighter import Fighter
+from game import Game
+
+
+class Tracer:
+    """Buffered trace-event recorder (see module docstring)"""
+    def __init__(self, path, flush_interval=0.25):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.events = deque()  # (phase, name, thread id, start ns, duration ns, args)
+        self._start = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._undo = []
+        self._installed = False
+        self._frame_start = None
+        self._threads = {}  # thread id -> name, for the track labels
+        self._stop = threading.Event()
+        self._file = open(self.path, 'w')
+        self._file.write('[\n')
+        self._file.write(self._format(('M', 'process_name', 0, self._start, 0, {'name': 'Mini Fighter'})))
+        self.written = 1
+        self._writer = threading.Thread(target=self._write_loop, name='trace writer', daemon=True)
+        self._writer.start()
+
+    def record(self, name, start, end, args=None):
+        """Add a span that ran from `start` to `end` (perf_counter_ns)"""
+        self.events.append(('X', name, threading.get_ident(), start, end - start, args))
+
+    def count(self, name, values):
+        """Add a counter event: {series: value} at the current time"""
+        self.events.append(('C', name, threading.get_ident(), time.perf_counter_ns(), 0, values))
+
+    @contextmanager
+    def region(self, name, **args):
+        """Span around a `with` block, for one-off work"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter_ns(), args or None)
+
+    def span(self, name, func, args=None):
+        """`func` wrapped in a span; `args()` is called after it returns for the span's args"""
+        clock = time.perf_counter_ns
+        append = self.events.append
+        get_ident = threading.get_ident
+
+        def traced(*a, **kw):
+            start = clock()
+            try:
+                return func(*a, **kw)
+            finally:
+                append(('X', name, get_ident(), start, clock() - start, args() if args else None))
+        return traced
+
+    def _patch(self, owner, name, value):
+        """Set owner.name to `value`, remembering how to put it back"""
+        if name in vars(owner):
+            original = vars(owner)[name]
+            self._undo.append(lambda: setattr(owner, name, original))
+        else:  # an instance attribute shadowing the class's method
+            self._undo.append(lambda: delattr(owner, name))
+        setattr(owner, name, value)
+
+    def install(self):
+        """Trace fighters, sprite loading and asset generation in every game"""
+        if self._installed:
+            return
+        self._installed = True
+        self._patch(Fighter, 'update', self.span('Fighter.update', Fighter.update))
+        self._patch(Fighter, 'ai_update', self.span('Fighter.ai_update', Fighter.ai_update))
+        self._patch(Fighter, '_load_sprite', self.span('Fighter._load_sprite', Fighter._load_sprite))
+        self._patch(Game, '_ensure_audio_assets', self.span('Game._ensure_audio_assets', Game._ensure_audio_assets))
+        self._patch(fighter, '_draw_frames', self.span('build sprite draw frames', fighter._draw_frames))
+        self._patch(match, '_effect_image', self.span('build effect image', match._effect_image))
+
+    def watch(self, game):
+        """Trace the phases of `game`'s run loop"""
+        def counts():
+            return {'frame': game.frame, 'projectiles': len(game.projectiles),
+                    'sparks': len(game.hit_sparks), 'particles': len(game.particles)}
+
+        clock = game.clock
+        tick = self.span('tick', clock.tick)
+        tracer = self
+
+        class TracedClock:
+            """game.clock with tick() traced; it also starts a frame"""
+            def tick(self, *args):
+                tracer._frame_start = time.perf_counter_ns()
+                return tick(*args)
+
+            def __getattr__(self, name):
+                return getattr(clock, name)
+
+        self._patch(game, 'clock', TracedClock())
+        self._patch(game, 'handle_events', self.span('events', game.handle_events))
+        self._patch(game, 'advance', self.span('advance', game.advance))
+        self.watch_update(game)
+        draw = self.span('draw', game.draw)
+
+        def traced_draw(*args, **kwargs):
+            start = self._frame_start or time.perf_counter_ns()
+            result = draw(*args, **kwargs)
+            values = counts()
+            self.record('frame', start, time.perf_counter_ns(), values)
+            self.count('entities', values)
+            self._frame_start = None
+            return result
+        self._patch(game, 'draw', traced_draw)
+
+    def watch_update(self, sim):
+        """Trace each simulation step of `sim` (a Match), with its frame number and counts"""
+        self._patch(sim, 'update', self.span('update', sim.update, lambda: {
+            'frame': sim.frame, 'projectiles': len(sim.projectiles), 'sparks': len(sim.hit_sparks)}))
+
+    def _format(self, event):
+        phase, name, tid, start, duration, args = event
+        text = '{"name": %s, "ph": "%s", "ts": %.3f, "pid": %d, "tid": %d' % (
+            json.dumps(name), phase, (start - self._start) / 1000, self._pid, tid)
+        if phase == 'X':
+            text += ', "dur": %.3f' % (duration / 1000)
+        if args:
+            text += ', "args": ' + json.dumps(args)
+        return text + '}'
+
+    def _drain(self):
+        events = self.events
+        lines = []
+        while events:
+            event = events.popleft()
+            if event[2] not in self._threads:
+                lines.append(self._thread_name(event[2]))
+            lines.append(self._format(event))
+        if not lines:
+            return
+        self._file.write(',\n')
+        self._file.write(',\n'.join(lines))
+        self.written += len(lines)
+
+    def _write_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def _thread_name(self, tid):
+        """Metadata event labelling the track of thread `tid` (looked up while it still runs)"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self._threads[tid] = names.get(tid, 'thread %d' % tid)
+        return self._format(('M', 'thread_name', tid, self._start, 0, {'name': self._threads[tid]}))
+
+    def close(self):
+        """Restore everything wrapped and finish the file"""
+        if self._file is None:
+            return
+        for undo in reversed(self._undo):
+            undo()
+        self._undo = []
+        self._installed = False
+        self._stop.set()
+        self._writer.join()
+        self._drain()
+        self._file.write('\n]\n')
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()